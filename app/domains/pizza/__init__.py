@@ -3,72 +3,170 @@ Pizza Domain - 领域模块导出
 
 导出 Pizza Domain 的公共 API，供 Worker 注册使用。
 - WORKFLOW_CLASSES: Workflow类列表（可以为空，workflow可以跨domain）
-- activities: Activity函数列表
 - TASK_QUEUE: 任务队列名称
+- ACTIVITY_MANIFEST: 静态 Activity 清单（activity 名称 -> Gateway 方法名）
+- create_activities(): Activity 工厂，Worker 构建时才组装依赖
+- activities: 兼容旧约定的 Activity函数列表（首次访问时调用 create_activities）
 
 设计理念：
 - Domain专注于提供activities（业务能力）
 - Workflow是独立的业务流程编排，可能跨多个domain
 - 如果某个workflow恰好只使用一个domain的activities，可以在这里声明关联
 - 但workflow的管理应该独立于domain
+- 导入本模块不做任何组装：Gateway、UseCases、Infrastructure 只在 Worker 真正需要时创建，
+  Worker 冷启动时间不随 domain 数量线性增长
 """
 
-from app.domains.pizza.gateway import PizzaActivitiesImpl
+import os
+
+from app.domains.pizza.sdk.contracts import (
+    ACTIVITY_CALCULATE_BILL,
+    ACTIVITY_CHARGE_CREDIT_CARD,
+    ACTIVITY_PROCESS_DELIVERY,
+)
     
 # Worker 注册所需的导出（约定）
 # WORKFLOW_CLASSES 留空，由 worker 根据 domain 名称自动查找
 WORKFLOW_CLASSES = []  # Worker will dynamically import from app.workflows.pizza_workflow
 
-import inspect
+TASK_QUEUE = "pizza-task-queue"
+
+# 静态 Activity 清单：替代对 Gateway 实例的反射扫描
+# 新增 activity 时在这里登记（名称常量 -> PizzaActivitiesImpl 的方法名）
+ACTIVITY_MANIFEST = {
+    ACTIVITY_CALCULATE_BILL: "calculate_bill",
+    ACTIVITY_CHARGE_CREDIT_CARD: "charge_credit_card",
+    ACTIVITY_PROCESS_DELIVERY: "process_delivery",
+}
+
 
-# 实例化 Gateway
 # ============================================================================
 # Composition Root (依赖注入组装)
 # ============================================================================
-import os
-from app.domains.pizza.usecases import (
-    CalculateBillUseCase,
-    ProcessPaymentUseCase,
-    ArrangeDeliveryUseCase,
-)
-from app.domains.pizza.infrastructure.payment.mock_payment_gateway import MockPaymentGateway
-from app.domains.pizza.infrastructure.delivery.mock_delivery_service import MockDeliveryService
-
-# 1. 识别环境
-ENV = os.getenv("ENV", "DEV")
-
-# 2. 实例化 Infrastructure Implementations
-if ENV == "PROD":
-    # PROD 环境下使用真实的实现 (示例，目前留空 placeholders)
-    # from app.domains.pizza.infrastructure.payment.stripe_gateway import StripePaymentGateway
-    # from app.domains.pizza.infrastructure.delivery.uber_delivery import UberDeliveryService
-    # payment_gateway = StripePaymentGateway(...)
-    # delivery_service = UberDeliveryService(...)
-    # 目前Fallback到Mock避免运行错误
-    print(f"[PizzaDomain] Initializing in PROD mode (using Mock for demo)")
-    payment_gateway = MockPaymentGateway()
-    delivery_service = MockDeliveryService()
-else:
-    print(f"[PizzaDomain] Initializing in {ENV} mode (using Mocks)")
-    payment_gateway = MockPaymentGateway()
-    delivery_service = MockDeliveryService()
-
-# 3. 实例化 UseCases (注入 Infrastructure)
-calculate_bill_usecase = CalculateBillUseCase()
-payment_usecase = ProcessPaymentUseCase(payment_gateway)
-delivery_usecase = ArrangeDeliveryUseCase(delivery_service)
-
-# 4. 实例化 Gateway (注入 UseCases)
-_impl = PizzaActivitiesImpl(
-    calculate_bill_usecase=calculate_bill_usecase,
-    payment_usecase=payment_usecase,
-    delivery_usecase=delivery_usecase,
-)
+def create_activities() -> list:
+    """组装 Pizza Domain 的依赖并返回 ACTIVITY_MANIFEST 中登记的 activity 方法"""
+    from app.domains.pizza.gateway import PizzaActivitiesImpl
+    from app.domains.pizza.pricing import DEFAULT_PRICE_TABLE, PriceTable, PricingEngine
+    from app.domains.pizza.usecases import (
+        CalculateBillUseCase,
+        ProcessPaymentUseCase,
+        ArrangeDeliveryUseCase,
+    )
+    from app.domains.pizza.infrastructure.payment.mock_payment_gateway import MockPaymentGateway
+    from app.domains.pizza.infrastructure.delivery.mock_delivery_service import MockDeliveryService
 
-# 自动发现所有带有 @activity.defn 装饰器的方法 (Reflection)
-# 避免手动维护 activities 列表
-activities = [
-    method for _, method in inspect.getmembers(_impl, predicate=inspect.ismethod)
-    if hasattr(method, "__temporal_activity_definition")
-]
-TASK_QUEUE = "pizza-task-queue"
+    # 1. 识别环境
+    env = os.getenv("ENV", "DEV")
+
+    # 2. 实例化 Infrastructure Implementations
+    if env == "PROD":
+        # 外部支付/配送 HTTP API，共享进程内的 keep-alive 连接池（app.infrastructure.http）
+        from app.domains.pizza.infrastructure.payment.http_payment_gateway import HttpPaymentGateway
+        from app.domains.pizza.infrastructure.delivery.http_delivery_service import HttpDeliveryService
+        print(f"[PizzaDomain] Initializing in PROD mode (HTTP providers)")
+        payment_gateway = HttpPaymentGateway(
+            base_url=os.environ["PAYMENT_API_URL"],
+            api_key=os.getenv("PAYMENT_API_KEY"),
+            timeout_seconds=float(os.getenv("PAYMENT_TIMEOUT_SECONDS", "5")),
+        )
+        delivery_service = HttpDeliveryService(
+            base_url=os.environ["DELIVERY_API_URL"],
+            api_key=os.getenv("DELIVERY_API_KEY"),
+            timeout_seconds=float(os.getenv("DELIVERY_TIMEOUT_SECONDS", "5")),
+        )
+    else:
+        print(f"[PizzaDomain] Initializing in {env} mode (using Mocks)")
+        payment_gateway = MockPaymentGateway()
+        delivery_service = MockDeliveryService()
+
+    # 外部调用的熔断器 + 舱壁（PROVIDER_GUARD=false 关闭），包在批处理里面，保护实际发出的请求
+    if os.getenv("PROVIDER_GUARD", "true").lower() in ("1", "true", "yes"):
+        from app.infrastructure.resilience import ProviderGuard
+        from app.infrastructure.workflows.config import config
+        from app.domains.pizza.infrastructure.payment.resilient_payment_gateway import ResilientPaymentGateway
+        from app.domains.pizza.infrastructure.delivery.resilient_delivery_service import ResilientDeliveryService
+        # 舱壁默认与本队列的 activity 槽位一样大：正常负载下不拒绝，provider 变慢时由熔断器兜底
+        slots = config.worker_tuning.for_queue(TASK_QUEUE).activity_slots()
+        payment_gateway = ResilientPaymentGateway(payment_gateway, ProviderGuard.from_env("payment", slots))
+        delivery_service = ResilientDeliveryService(delivery_service, ProviderGuard.from_env("delivery", slots))
+
+    # 外部服务的全局 QPS 配额（<PROVIDER>_RATE_LIMIT_RPS 设置时启用，RATE_LIMIT_BACKEND 决定跨进程共享方式）
+    # 包在熔断器外面：排队等待令牌不计入 provider 延迟；包在 hedge / 批处理里面：实际发出的每个请求都消耗令牌
+    from app.infrastructure.resilience import RateLimiter
+    payment_limiter = RateLimiter.from_env("payment")
+    if payment_limiter is not None:
+        from app.domains.pizza.infrastructure.payment.rate_limited_payment_gateway import RateLimitedPaymentGateway
+        payment_gateway = RateLimitedPaymentGateway(payment_gateway, payment_limiter)
+    delivery_limiter = RateLimiter.from_env("delivery")
+    if delivery_limiter is not None:
+        from app.domains.pizza.infrastructure.delivery.rate_limited_delivery_service import RateLimitedDeliveryService
+        delivery_service = RateLimitedDeliveryService(delivery_service, delivery_limiter)
+
+    # 派单超过自适应延迟未返回时发出幂等的重复请求，削减尾延迟（DELIVERY_HEDGE=true 开启）
+    if os.getenv("DELIVERY_HEDGE", "false").lower() in ("1", "true", "yes"):
+        from app.infrastructure.resilience import Hedger
+        from app.domains.pizza.infrastructure.delivery.hedging_delivery_service import HedgingDeliveryService
+        delivery_service = HedgingDeliveryService(
+            delivery_service,
+            Hedger(
+                "delivery",
+                percentile=float(os.getenv("DELIVERY_HEDGE_PERCENTILE", "95")),
+                min_delay_ms=float(os.getenv("DELIVERY_HEDGE_MIN_DELAY_MS", "10")),
+                max_delay_ms=float(os.getenv("DELIVERY_HEDGE_MAX_DELAY_MS", "2000")),
+                initial_delay_ms=float(os.getenv("DELIVERY_HEDGE_INITIAL_DELAY_MS", "500")),
+                max_hedge_ratio=float(os.getenv("DELIVERY_HEDGE_MAX_RATIO", "0.1")),
+            ),
+        )
+
+    # 同一进程内并发的扣款合并为一次批量调用（PAYMENT_BATCH_MAX_SIZE > 1 时启用）
+    batch_size = int(os.getenv("PAYMENT_BATCH_MAX_SIZE", "1"))
+    if batch_size > 1:
+        from app.domains.pizza.infrastructure.payment.batching_payment_gateway import BatchingPaymentGateway
+        payment_gateway = BatchingPaymentGateway(
+            payment_gateway,
+            max_batch_size=batch_size,
+            max_wait_ms=float(os.getenv("PAYMENT_BATCH_MAX_WAIT_MS", "20")),
+        )
+
+    # 3. 实例化 UseCases (注入 Infrastructure)
+    # 价目表是数据：PRICE_TABLE_FILE 指向 PriceTable JSON，未设置时使用默认价目表
+    price_table_file = os.getenv("PRICE_TABLE_FILE")
+    if price_table_file:
+        with open(price_table_file, "r", encoding="utf-8") as f:
+            price_table = PriceTable.model_validate_json(f.read())
+        print(f"[PizzaDomain] Loaded price table from {price_table_file}")
+    else:
+        price_table = DEFAULT_PRICE_TABLE
+    calculate_bill_usecase = CalculateBillUseCase(PricingEngine(price_table))
+    # 相同计价内容的订单复用账单（BILL_CACHE_SIZE=0 关闭）
+    bill_cache_size = int(os.getenv("BILL_CACHE_SIZE", "10000"))
+    if bill_cache_size > 0:
+        from app.domains.pizza.infrastructure.cache.bill_cache import CachedCalculateBillUseCase
+        calculate_bill_usecase = CachedCalculateBillUseCase(calculate_bill_usecase, max_entries=bill_cache_size)
+    payment_usecase = ProcessPaymentUseCase(payment_gateway)
+    delivery_usecase = ArrangeDeliveryUseCase(delivery_service)
+
+    # 4. 实例化 Gateway (注入 UseCases，以及运行同步纯计算 usecase 的 worker 执行器)
+    from app.infrastructure.workflows.executors import CPU_BOUND, offloader
+    impl = PizzaActivitiesImpl(
+        calculate_bill_usecase=calculate_bill_usecase,
+        payment_usecase=payment_usecase,
+        delivery_usecase=delivery_usecase,
+        offload_cpu=offloader(CPU_BOUND),
+    )
+
+    # 按静态清单取出 activity 方法（不做反射扫描）
+    return [getattr(impl, method_name) for method_name in ACTIVITY_MANIFEST.values()]
+
+
+_activities = None
+
+
+def __getattr__(name):
+    # 兼容旧约定：module.activities 在首次访问时才组装
+    global _activities
+    if name == "activities":
+        if _activities is None:
+            _activities = create_activities()
+        return _activities
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
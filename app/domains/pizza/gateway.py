@@ -9,8 +9,11 @@ Pizza Domain Gateway - Activity定义层
 - 使用 @activity.defn(name=CONSTANT) 显式指定名称
 """
 
-from temporalio import activity
+import asyncio
+from typing import Any, Awaitable, Callable, Optional
 
+from temporalio import activity
+from temporalio.exceptions import ApplicationError
 
 from app.domains.pizza.sdk import (
     # Activity Interface
@@ -25,6 +28,7 @@ from app.domains.pizza.sdk import (
 )
 
 # 导入 Usecases
+from app.domains.pizza.pricing import UnknownPriceError
 from app.domains.pizza.usecases import (
     CalculateBillUseCase,
     ProcessPaymentUseCase,
@@ -36,6 +40,10 @@ from app.domains.pizza.infrastructure.payment.mock_payment_gateway import MockPa
 from app.domains.pizza.infrastructure.delivery.mock_delivery_service import MockDeliveryService
 
 
+# 把同步调用移出事件循环的函数：offload(fn, *args) -> fn(*args) 的结果
+Offload = Callable[..., Awaitable[Any]]
+
+
 # ============================================================================
 # Activity 实现 (Class-based Gateway)
 # ============================================================================
@@ -51,22 +59,31 @@ class PizzaActivitiesImpl(PizzaActivities):
         calculate_bill_usecase: CalculateBillUseCase,
         payment_usecase: ProcessPaymentUseCase,
         delivery_usecase: ArrangeDeliveryUseCase,
+        offload_cpu: Optional[Offload] = None,
     ):
         """
         Args:
             calculate_bill_usecase: 计算账单 UseCase (依赖注入)
             payment_usecase: 支付 UseCase (依赖注入)
             delivery_usecase: 配送 UseCase (依赖注入)
+            offload_cpu: 运行同步纯计算 usecase 的函数 (依赖注入，Worker 的执行器)；
+                未提供时使用 asyncio.to_thread
         """
         self.calculate_bill_usecase = calculate_bill_usecase
         self.payment_usecase = payment_usecase
         self.delivery_usecase = delivery_usecase
+        self.offload_cpu = offload_cpu or asyncio.to_thread
 
     @activity.defn(name=ACTIVITY_CALCULATE_BILL)
     async def calculate_bill(self, order: PizzaOrder) -> Bill:
         """计算订单账单"""
         activity.logger.info(f"Calculating bill for order {order.order_id}")
-        return self.calculate_bill_usecase.execute(order)
+        # 同步的纯计算交给 worker 的执行器运行，避免阻塞事件循环（账单缓存在事件循环上查找，只有未命中才提交）
+        try:
+            return await self.calculate_bill_usecase.execute_offloaded(order, self.offload_cpu)
+        except UnknownPriceError as e:
+            # 价目表缺少该商品是数据问题，重试不会成功
+            raise ApplicationError(str(e), type="UnknownPriceError", non_retryable=True) from e
 
     @activity.defn(name=ACTIVITY_CHARGE_CREDIT_CARD)
     async def charge_credit_card(self, bill: Bill) -> bool:
@@ -5,4 +5,5 @@ Pizza Domain Infrastructure
 - db/: 数据库相关实现
 - payment/: 支付网关实现  
 - delivery/: 配送服务实现
+- cache/: 计算结果缓存
 """
@@ -0,0 +1,127 @@
+"""
+Bill Cache - 账单计算结果的内容哈希 LRU 缓存
+
+Temporal 的重试与重放、重复提交的订单、批量订单重跑都会对相同内容的订单重新计算账单。
+CachedCalculateBillUseCase 包装 CalculateBillUseCase（接口相同，由 composition root 注入）：
+
+- key：价目表版本 + 计价相关字段（items 的 flavor/size/quantity，is_vip）的规范化哈希，
+  与 order_id、客户、地址无关；items 排序后参与哈希，条目顺序不同的相同订单共享结果
+- 价目表变化（price_table_version 改变）后旧条目不再命中，随 LRU 淘汰
+- 命中时按当前 order_id 返回账单副本
+- 指标：app_bill_cache_lookups{result=hit|miss}，通过 Temporal Runtime 的 metric meter 上报
+
+Gateway 通过 execute_offloaded 调用：缓存查找与写入在事件循环上完成（只是一次哈希和字典操作），
+只有未命中的订单交给执行器计算。这样在进程池（CPU_BOUND + ACTIVITY_PROCESS_POOL_SIZE）下
+缓存与命中指标依然生效；子进程只收到被包装的 usecase。线程池中也可能调用 execute，缓存读写加锁。
+"""
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, List, Optional, Tuple
+
+from temporalio.common import MetricCounter
+from temporalio.runtime import Runtime
+
+from app.domains.pizza.sdk.contracts import Bill, PizzaOrder
+from app.domains.pizza.usecases import CalculateBillUseCase
+
+
+def pricing_key(order: PizzaOrder, price_table_version: str) -> str:
+    """订单计价相关字段的规范化哈希"""
+    canonical = {
+        "version": price_table_version,
+        "items": sorted((item.flavor, item.size, item.quantity) for item in order.items),
+        "vip": order.is_vip,
+    }
+    return hashlib.sha256(json.dumps(canonical, separators=(",", ":")).encode("utf-8")).hexdigest()
+
+
+class CachedCalculateBillUseCase:
+    """CalculateBillUseCase 的 LRU 缓存装饰器"""
+
+    def __init__(self, inner: CalculateBillUseCase, max_entries: int = 10000):
+        """
+        Args:
+            inner: 被包装的计算账单 UseCase
+            max_entries: 最多缓存的账单数，超过后淘汰最久未使用的条目
+        """
+        self.inner = inner
+        self.max_entries = max_entries
+        self.price_table_version = inner.price_table_version
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters: Optional[Tuple[MetricCounter, MetricCounter]] = None
+
+    def execute(self, order: PizzaOrder) -> Bill:
+        key = pricing_key(order, self.price_table_version)
+        bill = self._lookup(key, order)
+        if bill is None:
+            bill = self.inner.execute(order)
+            self._store(key, bill)
+        return bill
+
+    async def execute_offloaded(self, order: PizzaOrder, offload: Callable[..., Awaitable[Any]]) -> Bill:
+        """在当前线程查缓存，只把未命中的订单交给 offload（如进程池）计算"""
+        key = pricing_key(order, self.price_table_version)
+        bill = self._lookup(key, order)
+        if bill is None:
+            bill = await offload(self.inner.execute, order)
+            self._store(key, bill)
+        return bill
+
+    def execute_many(self, orders: List[PizzaOrder]) -> List[Bill]:
+        # 批量路径已经是一次性向量化计算，直接交给被包装的 usecase
+        return self.inner.execute_many(orders)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
+
+    def __reduce__(self):
+        # 兜底：直接把 execute 提交到进程池时只传递被包装的 usecase，不复制缓存内容（也不经过缓存，
+        # 正常路径是 execute_offloaded）
+        return (_unwrap, (self.inner,))
+
+    def _lookup(self, key: str, order: PizzaOrder) -> Optional[Bill]:
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is None:
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        self._record(hit=True)
+        total_amount, currency = cached
+        return Bill(order_id=order.order_id, total_amount=total_amount, currency=currency)
+
+    def _store(self, key: str, bill: Bill) -> None:
+        with self._lock:
+            self.misses += 1
+            self._entries[key] = (bill.total_amount, bill.currency)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        self._record(hit=False)
+
+    def _record(self, hit: bool) -> None:
+        if self._counters is None:
+            counter = Runtime.default().metric_meter.create_counter(
+                "app_bill_cache_lookups", "Bill calculation cache lookups by result"
+            )
+            self._counters = (
+                counter.with_additional_attributes({"result": "hit"}),
+                counter.with_additional_attributes({"result": "miss"}),
+            )
+        self._counters[0 if hit else 1].add(1)
+
+
+def _unwrap(inner: CalculateBillUseCase) -> CalculateBillUseCase:
+    return inner
@@ -0,0 +1,35 @@
+"""
+Hedging Delivery Service - 配送派单的 hedged request
+
+派单接口的 p99 是 p50 的数倍，直接决定 PizzaOrderWorkflow 的完成时间。
+包装任意 IDeliveryService：schedule_delivery 超过自适应的 hedge 延迟（自身延迟直方图的分位数）
+仍未返回时再发出一次相同的请求，取先成功的结果并取消另一个（app.infrastructure.resilience.Hedger）。
+
+重复请求依赖被包装实现的幂等性：HttpDeliveryService 按 order_id 发送 Idempotency-Key，
+两次请求的 key 相同，配送平台只会派一单。track_delivery 不做 hedge。
+
+与 ResilientDeliveryService 组合时包在它外面：每次尝试都经过舱壁，被取消的请求不计为失败。
+"""
+
+from app.domains.pizza.services import IDeliveryService
+from app.domains.pizza.sdk.contracts import PizzaOrder
+from app.infrastructure.resilience import Hedger
+
+
+class HedgingDeliveryService(IDeliveryService):
+    """对 schedule_delivery 做 hedged request 的配送服务装饰器"""
+
+    def __init__(self, inner: IDeliveryService, hedger: Hedger):
+        """
+        Args:
+            inner: 被包装的配送服务（schedule_delivery 必须幂等）
+            hedger: 维护延迟直方图与 hedge 预算
+        """
+        self.inner = inner
+        self.hedger = hedger
+
+    async def schedule_delivery(self, order: PizzaOrder) -> str:
+        return await self.hedger.call(self.inner.schedule_delivery, order)
+
+    async def track_delivery(self, order_id: str) -> dict:
+        return await self.inner.track_delivery(order_id)
@@ -0,0 +1,58 @@
+"""
+HTTP Delivery Service - 基于共享连接池的配送服务适配器
+
+实现 IDeliveryService，调用外部配送平台的 HTTP API（scripts/stub_provider.py 提供本地桩服务）：
+
+  POST /v1/deliveries             {"order_id", "customer_name", "address": {...}} -> {"delivery_id", "address"}
+  GET  /v1/deliveries/<order_id>  -> {"order_id", "status", "eta", ...}
+
+- 所有请求走进程内共享的 keep-alive 连接池（app.infrastructure.http），每次调用单独设置超时
+- 创建配送带 Idempotency-Key（按 order_id），activity 重试不会重复派单
+- 超时、连接错误、408/429/5xx 抛出异常由 activity 重试；其他 4xx 抛出 non-retryable 错误
+"""
+
+from typing import Optional
+
+from app.domains.pizza.services import IDeliveryService
+from app.domains.pizza.sdk.contracts import PizzaOrder
+from app.infrastructure.http import get_http_client, raise_for_provider_status
+
+
+class HttpDeliveryService(IDeliveryService):
+    """调用外部配送 HTTP API 的配送服务"""
+
+    def __init__(self, base_url: str, api_key: Optional[str] = None, timeout_seconds: float = 5.0):
+        """
+        Args:
+            base_url: 配送平台地址，例如 https://delivery.example.com
+            api_key: Bearer token，未设置时不带 Authorization 头
+            timeout_seconds: 单次调用的超时（连接、读写、等待连接池）
+        """
+        self.base_url = base_url.rstrip("/")
+        self.timeout_seconds = timeout_seconds
+        self._headers = {"Authorization": f"Bearer {api_key}"} if api_key else {}
+
+    async def schedule_delivery(self, order: PizzaOrder) -> str:
+        address = order.delivery_address
+        response = await get_http_client().post(
+            f"{self.base_url}/v1/deliveries",
+            json={
+                "order_id": order.order_id,
+                "customer_name": order.customer_name,
+                "address": address.model_dump(),
+            },
+            headers={**self._headers, "Idempotency-Key": f"delivery-{order.order_id}"},
+            timeout=self.timeout_seconds,
+        )
+        raise_for_provider_status(response)
+        # 平台返回规范化后的地址；没有返回时使用订单地址
+        return response.json().get("address") or f"{address.street}, {address.city}, {address.zip_code}"
+
+    async def track_delivery(self, order_id: str) -> dict:
+        response = await get_http_client().get(
+            f"{self.base_url}/v1/deliveries/{order_id}",
+            headers=self._headers,
+            timeout=self.timeout_seconds,
+        )
+        raise_for_provider_status(response)
+        return response.json()
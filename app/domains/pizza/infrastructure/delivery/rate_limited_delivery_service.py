@@ -0,0 +1,31 @@
+"""
+Rate Limited Delivery Service - 配送调用的全局限流
+
+包装任意 IDeliveryService：每次 schedule_delivery / track_delivery 发出前向 RateLimiter
+（app.infrastructure.resilience）预约一个令牌，所有 worker 进程共享配送平台的 QPS 配额。
+
+与 HedgingDeliveryService 组合时包在它里面：hedge 发出的重复请求同样消耗配额。
+"""
+
+from app.domains.pizza.services import IDeliveryService
+from app.domains.pizza.sdk.contracts import PizzaOrder
+from app.infrastructure.resilience import RateLimiter
+
+
+class RateLimitedDeliveryService(IDeliveryService):
+    """经过 RateLimiter 调用的配送服务装饰器"""
+
+    def __init__(self, inner: IDeliveryService, limiter: RateLimiter):
+        """
+        Args:
+            inner: 被包装的配送服务
+            limiter: 配送平台的配额
+        """
+        self.inner = inner
+        self.limiter = limiter
+
+    async def schedule_delivery(self, order: PizzaOrder) -> str:
+        return await self.limiter.call(self.inner.schedule_delivery, order)
+
+    async def track_delivery(self, order_id: str) -> dict:
+        return await self.limiter.call(self.inner.track_delivery, order_id)
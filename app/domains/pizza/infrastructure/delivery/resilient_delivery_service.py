@@ -0,0 +1,29 @@
+"""
+Resilient Delivery Service - 配送调用的熔断 + 舱壁
+
+包装任意 IDeliveryService：每次 schedule_delivery / track_delivery 都经过同一个 ProviderGuard
+（app.infrastructure.resilience），配送平台变慢或出错时快速失败，不再占满 activity 槽位。
+"""
+
+from app.domains.pizza.services import IDeliveryService
+from app.domains.pizza.sdk.contracts import PizzaOrder
+from app.infrastructure.resilience import ProviderGuard
+
+
+class ResilientDeliveryService(IDeliveryService):
+    """经过 ProviderGuard 调用的配送服务装饰器"""
+
+    def __init__(self, inner: IDeliveryService, guard: ProviderGuard):
+        """
+        Args:
+            inner: 被包装的配送服务
+            guard: 该配送平台的熔断器 + 舱壁
+        """
+        self.inner = inner
+        self.guard = guard
+
+    async def schedule_delivery(self, order: PizzaOrder) -> str:
+        return await self.guard.call(self.inner.schedule_delivery, order)
+
+    async def track_delivery(self, order_id: str) -> dict:
+        return await self.guard.call(self.inner.track_delivery, order_id)
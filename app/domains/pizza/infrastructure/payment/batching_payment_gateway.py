@@ -0,0 +1,77 @@
+"""
+Batching Payment Gateway - 支付调用微批处理
+
+包装任意 IPaymentGateway：同一 worker 进程内并发到达的 charge 调用在一个小窗口内
+合并为一次 charge_many 调用，结果按顺序分发回各个等待的调用方。
+
+- 窗口在第一笔扣款到达时开启，达到 max_batch_size 或等待 max_wait_ms 后提交
+- 批量调用抛出异常时，整批调用方都收到该异常（activity 按重试策略重试）
+- 调用方在等待期间被取消时，该笔扣款仍会随批次提交（与单笔调用已发出请求的语义一致）
+"""
+
+import asyncio
+from typing import List, Optional, Set, Tuple
+
+from app.domains.pizza.services import IPaymentGateway
+from app.domains.pizza.sdk.contracts import Bill
+
+
+class BatchingPaymentGateway(IPaymentGateway):
+    """把并发的 charge 调用合并为 charge_many 的支付网关装饰器"""
+
+    def __init__(self, inner: IPaymentGateway, max_batch_size: int = 50, max_wait_ms: float = 20.0):
+        """
+        Args:
+            inner: 被包装的支付网关（应实现批量 charge_many）
+            max_batch_size: 单批最多合并的扣款数
+            max_wait_ms: 第一笔扣款到达后最多等待的时间
+        """
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be >= 1")
+        self.inner = inner
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self._pending: List[Tuple[Bill, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        # 持有已提交批次的任务引用，避免被垃圾回收
+        self._inflight: Set[asyncio.Task] = set()
+
+    async def charge(self, bill: Bill) -> bool:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((bill, future))
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait, self._flush)
+        return await future
+
+    async def charge_many(self, bills: List[Bill]) -> List[bool]:
+        return await self.inner.charge_many(bills)
+
+    async def refund(self, order_id: str, amount: float) -> bool:
+        return await self.inner.refund(order_id, amount)
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.get_running_loop().create_task(self._submit(batch))
+            self._inflight.add(task)
+            task.add_done_callback(self._inflight.discard)
+
+    async def _submit(self, batch: List[Tuple[Bill, asyncio.Future]]) -> None:
+        try:
+            results = await self.inner.charge_many([bill for bill, _ in batch])
+            if len(results) != len(batch):
+                raise RuntimeError(f"charge_many returned {len(results)} results for {len(batch)} bills")
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
@@ -0,0 +1,84 @@
+"""
+HTTP Payment Gateway - 基于共享连接池的支付服务适配器
+
+实现 IPaymentGateway，调用外部支付服务的 HTTP API（scripts/stub_provider.py 提供本地桩服务）：
+
+  POST /v1/charges        {"order_id", "amount", "currency"}  -> {"status": "succeeded" | "declined"}
+  POST /v1/charges/batch  {"charges": [{..., "idempotency_key"}]} -> {"results": [{"order_id", "status"}]}
+  POST /v1/refunds        {"order_id", "amount"}              -> {"status": "succeeded" | "declined"}
+
+- 所有请求走进程内共享的 keep-alive 连接池（app.infrastructure.http），每次调用单独设置超时
+- 扣款/退款带 Idempotency-Key（按 order_id），activity 重试不会重复扣款；批量扣款的每一项
+  带自己的 idempotency_key（与单笔扣款相同），重试时订单落到不同的批次也不会重复扣款
+- 402 视为拒付（返回 False）；超时、连接错误、408/429/5xx 抛出异常由 activity 重试；
+  其他 4xx 抛出 non-retryable 错误
+"""
+
+from typing import List, Optional
+
+from app.domains.pizza.services import IPaymentGateway
+from app.domains.pizza.sdk.contracts import Bill
+from app.infrastructure.http import get_http_client, raise_for_provider_status
+
+
+class HttpPaymentGateway(IPaymentGateway):
+    """调用外部支付 HTTP API 的支付网关"""
+
+    def __init__(self, base_url: str, api_key: Optional[str] = None, timeout_seconds: float = 5.0):
+        """
+        Args:
+            base_url: 支付服务地址，例如 https://payments.example.com
+            api_key: Bearer token，未设置时不带 Authorization 头
+            timeout_seconds: 单次调用的超时（连接、读写、等待连接池）
+        """
+        self.base_url = base_url.rstrip("/")
+        self.timeout_seconds = timeout_seconds
+        self._headers = {"Authorization": f"Bearer {api_key}"} if api_key else {}
+
+    async def charge(self, bill: Bill) -> bool:
+        response = await self._post(
+            "/v1/charges",
+            {"order_id": bill.order_id, "amount": bill.total_amount, "currency": bill.currency},
+            idempotency_key=f"charge-{bill.order_id}",
+        )
+        return response.status_code != 402 and response.json()["status"] == "succeeded"
+
+    async def charge_many(self, bills: List[Bill]) -> List[bool]:
+        """一次请求完成整批扣款（BatchingPaymentGateway 合并后的批次）"""
+        # 批次的组成每次都可能不同，幂等键按订单逐项携带，而不是整批一个 Idempotency-Key
+        response = await self._post(
+            "/v1/charges/batch",
+            {
+                "charges": [
+                    {
+                        "order_id": bill.order_id,
+                        "amount": bill.total_amount,
+                        "currency": bill.currency,
+                        "idempotency_key": f"charge-{bill.order_id}",
+                    }
+                    for bill in bills
+                ]
+            },
+        )
+        status_by_order = {result["order_id"]: result["status"] for result in response.json()["results"]}
+        return [status_by_order.get(bill.order_id) == "succeeded" for bill in bills]
+
+    async def refund(self, order_id: str, amount: float) -> bool:
+        response = await self._post(
+            "/v1/refunds",
+            {"order_id": order_id, "amount": amount},
+            idempotency_key=f"refund-{order_id}",
+        )
+        return response.status_code != 402 and response.json()["status"] == "succeeded"
+
+    async def _post(self, path: str, payload: dict, idempotency_key: Optional[str] = None):
+        headers = {**self._headers, "Idempotency-Key": idempotency_key} if idempotency_key else self._headers
+        response = await get_http_client().post(
+            self.base_url + path,
+            json=payload,
+            headers=headers,
+            timeout=self.timeout_seconds,
+        )
+        if response.status_code != 402:
+            raise_for_provider_status(response)
+        return response
@@ -6,6 +6,8 @@ Mock Payment Gateway Implementation - 支付网关模拟实现
 """
 
 import asyncio
+from typing import List
+
 from app.domains.pizza.services import IPaymentGateway
 from app.domains.pizza.sdk.contracts import Bill
 
@@ -33,6 +35,15 @@ class MockPaymentGateway(IPaymentGateway):
         # return response.status == "succeeded"
         
         return True  # 模拟成功
+
+    async def charge_many(self, bills: List[Bill]) -> List[bool]:
+        """模拟批量扣款：整批只有一次网络往返"""
+        await asyncio.sleep(0.1)
+        
+        total = sum(bill.total_amount for bill in bills)
+        print(f"[MockPayment] Charging {len(bills)} bills (${total}) in one batch")
+        
+        return [True] * len(bills)
     
     async def refund(self, order_id: str, amount: float) -> bool:
         """模拟退款操作"""
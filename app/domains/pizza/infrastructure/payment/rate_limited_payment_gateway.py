@@ -0,0 +1,37 @@
+"""
+Rate Limited Payment Gateway - 支付调用的全局限流
+
+包装任意 IPaymentGateway：每次 charge / charge_many / refund 发出前向 RateLimiter
+（app.infrastructure.resilience）预约一个令牌。后端为 socket 或 postgres 时，
+所有 worker 进程与主机共享支付服务的全局 QPS 配额，不再一起超额后集中重试。
+
+每次调用消耗一个令牌：与 BatchingPaymentGateway 组合时包在它里面，一次批量请求只算一次。
+"""
+
+from typing import List
+
+from app.domains.pizza.services import IPaymentGateway
+from app.domains.pizza.sdk.contracts import Bill
+from app.infrastructure.resilience import RateLimiter
+
+
+class RateLimitedPaymentGateway(IPaymentGateway):
+    """经过 RateLimiter 调用的支付网关装饰器"""
+
+    def __init__(self, inner: IPaymentGateway, limiter: RateLimiter):
+        """
+        Args:
+            inner: 被包装的支付网关
+            limiter: 支付服务的配额
+        """
+        self.inner = inner
+        self.limiter = limiter
+
+    async def charge(self, bill: Bill) -> bool:
+        return await self.limiter.call(self.inner.charge, bill)
+
+    async def charge_many(self, bills: List[Bill]) -> List[bool]:
+        return await self.limiter.call(self.inner.charge_many, bills)
+
+    async def refund(self, order_id: str, amount: float) -> bool:
+        return await self.limiter.call(self.inner.refund, order_id, amount)
@@ -0,0 +1,37 @@
+"""
+Resilient Payment Gateway - 支付调用的熔断 + 舱壁
+
+包装任意 IPaymentGateway：每次 charge / charge_many / refund 都经过同一个 ProviderGuard
+（app.infrastructure.resilience），支付服务变慢或出错时快速失败，不再占满 activity 槽位。
+拒付（返回 False）是正常业务结果，不计为失败。
+
+与 BatchingPaymentGateway 组合时包在它里面：熔断器保护的是实际发出的批量请求。
+"""
+
+from typing import List
+
+from app.domains.pizza.services import IPaymentGateway
+from app.domains.pizza.sdk.contracts import Bill
+from app.infrastructure.resilience import ProviderGuard
+
+
+class ResilientPaymentGateway(IPaymentGateway):
+    """经过 ProviderGuard 调用的支付网关装饰器"""
+
+    def __init__(self, inner: IPaymentGateway, guard: ProviderGuard):
+        """
+        Args:
+            inner: 被包装的支付网关
+            guard: 该支付服务的熔断器 + 舱壁
+        """
+        self.inner = inner
+        self.guard = guard
+
+    async def charge(self, bill: Bill) -> bool:
+        return await self.guard.call(self.inner.charge, bill)
+
+    async def charge_many(self, bills: List[Bill]) -> List[bool]:
+        return await self.guard.call(self.inner.charge_many, bills)
+
+    async def refund(self, order_id: str, amount: float) -> bool:
+        return await self.guard.call(self.inner.refund, order_id, amount)
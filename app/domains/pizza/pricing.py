@@ -0,0 +1,163 @@
+"""
+Pizza Pricing Engine - 表驱动的计价引擎
+
+价格与折扣都是数据（PriceTable），不写在代码分支里：
+- sizes: 尺寸基础价（适用于所有口味）
+- flavor_prices: 按 (flavor, size) 覆盖的价格
+- discounts: 折扣规则，订单满足规则的全部条件时总价乘以 multiplier（按顺序叠加）
+
+未在价目表中的 (flavor, size) 抛出 UnknownPriceError，不再静默按 L 计价。
+
+PricingEngine.price_many(orders) 一次性计算整批订单的总价（批量订单、报表重算）：
+价目表与折扣规则在构造时预编译为查找表/元组，批内只做字典查找和浮点累加。
+单个订单的 price(order) 是单独的直接路径（activity 每次调用只算一个订单，不付批处理的准备开销），
+使用同一份预编译数据，两者结果完全一致。
+
+实测（scripts/bench_pricing，5k/50k 订单，交替运行取最快）：price 逐单调用约为原硬编码 if/else
+循环的 0.90-0.94x（价格改为查表的代价），price_many 约 0.95-1.07x，与原循环基本持平。
+
+没有使用 NumPy：订单是 Pydantic 对象，逐条目取字段的开销占主导，NumPy 的字符串查表与
+数组构造反而比单遍循环慢（见 scripts/bench_pricing.py）。
+"""
+
+import hashlib
+from typing import Dict, List, Sequence, Tuple, Union
+
+from pydantic import BaseModel, ConfigDict, Field
+
+from app.domains.pizza.sdk.contracts import Bill, PizzaOrder
+
+
+class UnknownPriceError(ValueError):
+    """价目表中没有该 (flavor, size) 的价格"""
+
+
+class DiscountRule(BaseModel):
+    """折扣规则：订单满足全部条件时总价乘以 multiplier"""
+    model_config = ConfigDict(frozen=True)
+
+    name: str
+    multiplier: float = Field(gt=0, le=1)
+    vip_only: bool = False
+    min_quantity: int = Field(default=0, ge=0, description="订单披萨总数下限")
+
+
+class PriceTable(BaseModel):
+    """价目表（可从 JSON 加载）"""
+    model_config = ConfigDict(frozen=True)
+
+    currency: str = "USD"
+    sizes: Dict[str, float]
+    flavor_prices: Dict[str, Dict[str, float]] = {}
+    discounts: List[DiscountRule] = []
+
+    def version(self) -> str:
+        """价目表版本（内容哈希），价目表变化时依赖它的账单缓存自动失效"""
+        return hashlib.sha256(self.model_dump_json().encode("utf-8")).hexdigest()[:16]
+
+
+DEFAULT_PRICE_TABLE = PriceTable(
+    sizes={"S": 10.0, "M": 15.0, "L": 20.0},
+    discounts=[DiscountRule(name="vip", multiplier=0.8, vip_only=True)],
+)
+
+
+class PricingEngine:
+    """按 PriceTable 计算订单总价"""
+
+    def __init__(self, table: PriceTable = DEFAULT_PRICE_TABLE):
+        self.table = table
+        self.version = table.version()
+        # 没有按口味覆盖的价格时只按尺寸查表，省去每个条目构造 (flavor, size) key
+        self._by_flavor = bool(table.flavor_prices)
+        self._prices: Dict[Union[str, Tuple[str, str]], float] = (
+            {
+                (flavor, size): price
+                for flavor, by_size in table.flavor_prices.items()
+                for size, price in by_size.items()
+            }
+            if self._by_flavor
+            else dict(table.sizes)
+        )
+        self._discounts = [(rule.multiplier, rule.vip_only, rule.min_quantity) for rule in table.discounts]
+        self._needs_quantity = any(rule.min_quantity > 0 for rule in table.discounts)
+        # 没有数量条件时，折扣只取决于 is_vip：预先按顺序挑出两种订单各自适用的倍率
+        self._multipliers_by_vip = {
+            is_vip: tuple(rule.multiplier for rule in table.discounts if is_vip or not rule.vip_only)
+            for is_vip in (False, True)
+        }
+
+    def unit_price(self, flavor: str, size: str) -> float:
+        price = self.table.flavor_prices.get(flavor, {}).get(size)
+        if price is None:
+            price = self.table.sizes.get(size)
+        if price is None:
+            raise UnknownPriceError(f"No price for flavor '{flavor}' size '{size}'")
+        return price
+
+    def price(self, order: PizzaOrder) -> float:
+        """单个订单的总价（activity 的热路径：不经过 price_many 的批处理准备，与其结果一致）"""
+        get = self._prices.get
+        total = 0.0
+        if self._by_flavor:
+            for item in order.items:
+                price = get((item.flavor, item.size))
+                if price is None:
+                    price = self._cache_unit_price(item.flavor, item.size)
+                total += price * item.quantity
+        else:
+            for item in order.items:
+                price = get(item.size)
+                if price is None:
+                    price = self._cache_unit_price(item.flavor, item.size)
+                total += price * item.quantity
+        if self._needs_quantity:
+            quantity = sum(item.quantity for item in order.items)
+            for multiplier, vip_only, min_quantity in self._discounts:
+                if (order.is_vip or not vip_only) and quantity >= min_quantity:
+                    total *= multiplier
+        else:
+            for multiplier in self._multipliers_by_vip[order.is_vip]:
+                total *= multiplier
+        return total
+
+    def _cache_unit_price(self, flavor: str, size: str) -> float:
+        """首次遇到的 (flavor, size) 回退到尺寸基础价并缓存，未知则报错"""
+        price = self._prices[(flavor, size) if self._by_flavor else size] = self.unit_price(flavor, size)
+        return price
+
+    def price_many(self, orders: Sequence[PizzaOrder]) -> List[float]:
+        """一次性计算整批订单的总价（与 orders 顺序一致）"""
+        prices = self._prices
+        by_flavor = self._by_flavor
+        discounts = self._discounts
+        needs_quantity = self._needs_quantity
+        totals = []
+        append = totals.append
+        for order in orders:
+            total = 0.0
+            quantity = 0
+            for item in order.items:
+                key = (item.flavor, item.size) if by_flavor else item.size
+                price = prices.get(key)
+                if price is None:
+                    # 首次遇到的 (flavor, size) 回退到尺寸基础价并缓存，未知则报错
+                    price = prices[key] = self.unit_price(item.flavor, item.size)
+                total += price * item.quantity
+                if needs_quantity:
+                    quantity += item.quantity
+            for multiplier, vip_only, min_quantity in discounts:
+                if (order.is_vip or not vip_only) and quantity >= min_quantity:
+                    total *= multiplier
+            append(total)
+        return totals
+
+    def bill(self, order: PizzaOrder) -> Bill:
+        return Bill(order_id=order.order_id, total_amount=self.price(order), currency=self.table.currency)
+
+    def bill_many(self, orders: Sequence[PizzaOrder]) -> List[Bill]:
+        return [
+            Bill(order_id=order.order_id, total_amount=total, currency=self.table.currency)
+            for order, total in zip(orders, self.price_many(orders))
+        ]
+
@@ -11,12 +11,17 @@ from app.domains.pizza.sdk.contracts import (
     ACTIVITY_CALCULATE_BILL,
     ACTIVITY_CHARGE_CREDIT_CARD,
     ACTIVITY_PROCESS_DELIVERY,
+    LOCAL_ACTIVITIES,
     # DTOs
     Address,
     PizzaItem,
     PizzaOrder,
     Bill,
     Receipt,
+    PizzaBatch,
+    BatchOrderFailure,
+    PizzaBatchResult,
+    PizzaBatchProgress,
     # Activity Interface
     PizzaActivities,
 )
@@ -26,12 +31,17 @@ __all__ = [
     "ACTIVITY_CALCULATE_BILL",
     "ACTIVITY_CHARGE_CREDIT_CARD",
     "ACTIVITY_PROCESS_DELIVERY",
+    "LOCAL_ACTIVITIES",
     # DTOs
     "Address",
     "PizzaItem",
     "PizzaOrder",
     "Bill",
     "Receipt",
+    "PizzaBatch",
+    "BatchOrderFailure",
+    "PizzaBatchResult",
+    "PizzaBatchProgress",
     # Activity Interface
     "PizzaActivities",
 ]
@@ -27,6 +27,9 @@ ACTIVITY_CALCULATE_BILL = "calculate_bill"
 ACTIVITY_CHARGE_CREDIT_CARD = "charge_credit_card"
 ACTIVITY_PROCESS_DELIVERY = "process_delivery"
 
+# 纯内存计算、无外部副作用的 activity：workflow 以 local activity 执行，不经过 task queue 往返
+LOCAL_ACTIVITIES = frozenset({ACTIVITY_CALCULATE_BILL})
+
 
 
 # ============================================================================
@@ -76,6 +79,56 @@ class Receipt(BaseModel):
     message: str
     delivered_to: str
 
+
+# --- Batch相关 ---
+
+class PizzaBatch(BaseModel):
+    """批量订单（企业/批量渠道），由 PizzaBatchWorkflow 分批扇出"""
+    batch_id: str
+    orders: List[PizzaOrder]
+    max_concurrency: int = Field(default=50, gt=0, description="同时进行中的订单数上限")
+    orders_per_run: int = Field(default=500, gt=0, description="每个 workflow run 处理的订单数，之后 continue-as-new")
+    max_failure_samples: int = Field(default=100, ge=0, description="结果中保留的失败订单样本数上限")
+    # continue-as-new 时携带的进度（只有计数与有上限的失败样本，不随订单数增长），调用方无需设置
+    total: Optional[int] = None
+    run_index: int = 0
+    completed: int = 0
+    failed: int = 0
+    failures: List["BatchOrderFailure"] = []
+
+
+class BatchOrderFailure(BaseModel):
+    """批量订单中失败的单个订单"""
+    order_id: str
+    error: str
+
+
+class PizzaBatchResult(BaseModel):
+    """批量订单结果
+
+    Receipt 不汇总到结果中：第 i 个订单（从 0 开始，按提交顺序）的 Receipt 是子 workflow
+    "{batch workflow id}-{i}" 的结果，可通过 client.get_workflow_handle(...).result() 获取。
+    failed 是失败订单总数，failures 只是前 max_failure_samples 个失败订单的样本。
+    """
+    batch_id: str
+    total: int
+    completed: int
+    failed: int = 0
+    failures: List[BatchOrderFailure] = []
+
+
+class PizzaBatchProgress(BaseModel):
+    """批量订单进度（query）"""
+    batch_id: str
+    total: int
+    completed: int
+    failed: int
+    in_flight: int
+    runs: int
+
+
+PizzaBatch.model_rebuild()
+
 # ============================================================================
 # Activity Interfaces (Stubs)
 # ============================================================================
@@ -88,7 +141,11 @@ class Receipt(BaseModel):
 # Activity Interface (Class-based)
 # ============================================================================
 class PizzaActivities:
-    """Pizza Domain Activity 接口定义 (契约)"""
+    """Pizza Domain Activity 接口定义 (契约)
+
+    LOCAL_ACTIVITIES 中的 activity 是纯内存计算，workflow 通过
+    app.workflows.local_activity.execute_activity 调用时以 local activity 执行。
+    """
     
     @activity.defn(name=ACTIVITY_CALCULATE_BILL)
     async def calculate_bill(self, order: PizzaOrder) -> Bill:
@@ -2,7 +2,10 @@
 Pizza Payment Gateway Interface - 支付网关接口
 """
 
+import asyncio
 from abc import ABC, abstractmethod
+from typing import List
+
 from app.domains.pizza.sdk import Bill
 
 
@@ -20,6 +23,20 @@ class IPaymentGateway(ABC):
             True 表示扣款成功，False 表示失败
         """
         pass
+
+    async def charge_many(self, bills: List[Bill]) -> List[bool]:
+        """批量扣款（可选）
+        
+        支持批量接口的支付服务应覆盖此方法，一次往返完成多笔扣款。
+        默认实现逐笔并发调用 charge。
+        
+        Args:
+            bills: 账单列表
+            
+        Returns:
+            与 bills 一一对应的扣款结果
+        """
+        return list(await asyncio.gather(*(self.charge(bill) for bill in bills)))
     
     @abstractmethod
     async def refund(self, order_id: str, amount: float) -> bool:
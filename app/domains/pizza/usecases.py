@@ -7,12 +7,27 @@ Pizza Domain Usecases - 纯业务逻辑
 - 可以进行单元测试而无需外部依赖
 """
 
+from typing import Any, Awaitable, Callable, List, Optional
+
+from app.domains.pizza.pricing import PricingEngine
 from app.domains.pizza.sdk.contracts import PizzaOrder, Bill
 from app.domains.pizza.services import IPaymentGateway, IDeliveryService, IPizzaRepository
 
 
 class CalculateBillUseCase:
     """计算账单用例 - 纯计算逻辑，无外部依赖"""
+
+    def __init__(self, pricing_engine: Optional[PricingEngine] = None):
+        """
+        Args:
+            pricing_engine: 计价引擎（价目表由 composition root 注入），默认使用 DEFAULT_PRICE_TABLE
+        """
+        self.pricing_engine = pricing_engine or PricingEngine()
+
+    @property
+    def price_table_version(self) -> str:
+        """价目表版本（内容哈希），价目表变化时依赖它的账单缓存自动失效"""
+        return self.pricing_engine.version
     
     def execute(self, order: PizzaOrder) -> Bill:
         """根据订单计算账单
@@ -22,29 +37,19 @@ class CalculateBillUseCase:
             
         Returns:
             计算后的账单
-        """
-        # 计算总价
-        total = 0.0
-        for item in order.items:
-            # 根据尺寸定价
-            if item.size == "S":
-                price = 10.0
-            elif item.size == "M":
-                price = 15.0
-            else:  # L
-                price = 20.0
             
-            total += price * item.quantity
-        
-        # VIP 折扣
-        if order.is_vip:
-            total *= 0.8
-        
-        return Bill(
-            order_id=order.order_id,
-            total_amount=total,
-            currency="USD"
-        )
+        Raises:
+            UnknownPriceError: 价目表中没有订单条目的 (flavor, size)
+        """
+        return self.pricing_engine.bill(order)
+
+    async def execute_offloaded(self, order: PizzaOrder, offload: Callable[..., Awaitable[Any]]) -> Bill:
+        """通过 offload(fn, *args)（调用方注入的执行器）计算账单，不阻塞事件循环"""
+        return await offload(self.execute, order)
+
+    def execute_many(self, orders: List[PizzaOrder]) -> List[Bill]:
+        """批量计算账单（一次性向量化计价，用于批量订单与报表重算）"""
+        return self.pricing_engine.bill_many(orders)
 
 
 class ProcessPaymentUseCase:
@@ -0,0 +1,5 @@
+"""Shared HTTP Infrastructure Package"""
+
+from app.infrastructure.http.pool import close_http_client, get_http_client, raise_for_provider_status
+
+__all__ = ["get_http_client", "close_http_client", "raise_for_provider_status"]
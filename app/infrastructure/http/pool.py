@@ -0,0 +1,91 @@
+"""
+HTTP Pool - 进程内共享的 keep-alive HTTP 连接池
+
+所有对外的 HTTP 适配器（支付、配送等）共享同一个 httpx.AsyncClient，
+同一 provider 的连接在 activity 之间复用，而不是每次调用新建 TCP/TLS 连接：
+
+- 首次使用时在 worker 的事件循环中创建（导入本模块不导入 httpx，DEV/Mock 模式不需要它）
+- 连接上限与 keep-alive 过期时间来自环境变量（HTTP_MAX_CONNECTIONS、
+  HTTP_MAX_KEEPALIVE_CONNECTIONS、HTTP_KEEPALIVE_EXPIRY_SECONDS）
+- 安装了可选依赖 h2 时通过 ALPN 协商 HTTP/2（HTTP2=auto），同一连接多路复用并发请求
+- HTTP_TIMEOUT_SECONDS 只是默认超时，适配器按调用传入各自的超时
+- 每个 worker 进程（supervisor 子进程、fork 出的进程池子进程）各自持有一个 client
+
+Worker 退出时 await close_http_client()。
+"""
+
+import importlib.util
+import os
+from typing import Any, Optional
+
+_client: Optional[Any] = None
+_client_pid: Optional[int] = None
+
+
+def http2_enabled() -> bool:
+    """HTTP2=auto (default) enables HTTP/2 only when `h2` is importable"""
+    mode = os.getenv("HTTP2", "auto").lower()
+    if mode in ("0", "false", "no"):
+        return False
+    available = importlib.util.find_spec("h2") is not None
+    if mode in ("1", "true", "yes") and not available:
+        raise RuntimeError("HTTP2=true requires the 'h2' package (pip install 'httpx[http2]')")
+    return available
+
+
+def get_http_client():
+    """Return this process's shared httpx.AsyncClient, creating it on first use"""
+    global _client, _client_pid
+    pid = os.getpid()
+    if _client is not None and _client_pid == pid and not _client.is_closed:
+        return _client
+
+    import httpx
+
+    max_connections = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+    # 空闲连接上限默认与总上限相同：小于并发度时，超出的连接每次用完都会被关闭重建
+    limits = httpx.Limits(
+        max_connections=max_connections,
+        max_keepalive_connections=int(os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", str(max_connections))),
+        keepalive_expiry=float(os.getenv("HTTP_KEEPALIVE_EXPIRY_SECONDS", "30")),
+    )
+    timeout = httpx.Timeout(float(os.getenv("HTTP_TIMEOUT_SECONDS", "10")))
+    http2 = http2_enabled()
+    # 父进程的 client（及其连接）不能在 fork 出的子进程中复用，直接丢弃引用
+    _client = httpx.AsyncClient(limits=limits, timeout=timeout, http2=http2)
+    _client_pid = pid
+    print(
+        f"[HTTP] Shared client created (pid {pid}): max_connections={limits.max_connections}, "
+        f"keepalive={limits.max_keepalive_connections}, http2={http2}"
+    )
+    return _client
+
+
+async def close_http_client() -> None:
+    """Close this process's shared client (no-op if it was never created)"""
+    global _client, _client_pid
+    client, _client = _client, None
+    if client is not None and _client_pid == os.getpid():
+        await client.aclose()
+    _client_pid = None
+
+
+def raise_for_provider_status(response) -> None:
+    """按外部服务的响应状态抛出异常
+
+    - 2xx：返回
+    - 408/429/5xx：抛出 httpx.HTTPStatusError，activity 按重试策略重试
+    - 其他 4xx：请求本身有问题，重试不会成功，抛出 non-retryable ApplicationError
+    """
+    status = response.status_code
+    if status < 400:
+        return
+    if status < 500 and status not in (408, 429):
+        from temporalio.exceptions import ApplicationError
+
+        raise ApplicationError(
+            f"{response.request.method} {response.request.url} returned {status}: {response.text[:200]}",
+            type="HttpClientError",
+            non_retryable=True,
+        )
+    response.raise_for_status()
@@ -0,0 +1,7 @@
+"""Resilience Infrastructure Package - 外部服务调用的保护包装"""
+
+from app.infrastructure.resilience.breaker import CircuitBreaker, ProviderGuard
+from app.infrastructure.resilience.hedging import Hedger, LatencyHistogram
+from app.infrastructure.resilience.rate_limit import RateLimiter, RateLimitServer
+
+__all__ = ["CircuitBreaker", "ProviderGuard", "Hedger", "LatencyHistogram", "RateLimiter", "RateLimitServer"]
@@ -0,0 +1,275 @@
+"""
+Provider Guard - 外部服务调用的熔断器 + 舱壁
+
+外部服务变慢时，activity 会一直等到 start_to_close_timeout，占住 activity 槽位，
+拖慢同一 worker 上所有订单的 p99。ProviderGuard 包在每次外部调用外面：
+
+- CircuitBreaker：最近 window_size 次调用中失败或慢调用（>= slow_call_ms）的比例
+  达到 failure_rate_threshold（且至少 min_calls 次）时打开；open_seconds 后半开，
+  放行 half_open_max_calls 个探测调用，全部成功则关闭，任一失败重新打开
+- Bulkhead：每个 provider 最多 max_concurrent 个进行中的调用，排队最多 max_wait_ms
+  （Worker 组装时默认取该队列的 activity 槽位数，只有显式调小时才会在正常负载下排队/拒绝）
+- call_timeout_seconds：可选的单次调用超时，超时计为失败
+
+被拒绝（熔断打开、舱壁已满、超时）时抛出可重试的 ApplicationError(type="ProviderUnavailable")，
+带 next_retry_delay 提示 Temporal 在熔断器半开后再重试，而不是按重试策略立即重试。
+non-retryable 的 ApplicationError（如 4xx）是请求本身的问题，不计为 provider 失败。
+
+指标（Temporal Runtime 的 metric meter，按 provider 打标签）：
+  app_provider_breaker_state        gauge，0=closed 1=half_open 2=open
+  app_provider_breaker_transitions  counter，state=切换到的状态
+  app_provider_rejections           counter，reason=open|half_open|bulkhead|timeout
+  app_provider_in_flight            gauge，舱壁内进行中的调用数
+"""
+
+import asyncio
+import os
+import time
+from collections import deque
+from datetime import timedelta
+from typing import Awaitable, Callable, Deque, Dict, Optional, TypeVar
+
+from temporalio.exceptions import ApplicationError
+from temporalio.runtime import Runtime
+
+T = TypeVar("T")
+
+CLOSED = "closed"
+HALF_OPEN = "half_open"
+OPEN = "open"
+_STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+
+class _Metrics:
+    """按 provider 预先绑定标签的指标（首次使用时创建）"""
+
+    def __init__(self, provider: str):
+        meter = Runtime.default().metric_meter.with_additional_attributes({"provider": provider})
+        self.state = meter.create_gauge("app_provider_breaker_state", "Circuit breaker state (0=closed 1=half_open 2=open)")
+        self.transitions = meter.create_counter("app_provider_breaker_transitions", "Circuit breaker state transitions")
+        self.rejections = meter.create_counter("app_provider_rejections", "Provider calls rejected without being sent")
+        self.in_flight = meter.create_gauge("app_provider_in_flight", "Provider calls in flight inside the bulkhead")
+
+
+class CircuitBreaker:
+    """基于滑动窗口失败率 / 慢调用率的熔断器"""
+
+    def __init__(
+        self,
+        failure_rate_threshold: float = 0.5,
+        slow_call_ms: float = 2000.0,
+        window_size: int = 20,
+        min_calls: int = 10,
+        open_seconds: float = 30.0,
+        half_open_max_calls: int = 1,
+        on_transition: Optional[Callable[[str], None]] = None,
+    ):
+        self.failure_rate_threshold = failure_rate_threshold
+        self.slow_call = slow_call_ms / 1000
+        self.min_calls = min_calls
+        self.open_seconds = open_seconds
+        self.half_open_max_calls = half_open_max_calls
+        self.on_transition = on_transition
+        self.state = CLOSED
+        self.opened_at = 0.0
+        # True 表示失败或慢调用
+        self._outcomes: Deque[bool] = deque(maxlen=window_size)
+        self._probes = 0
+        self._probe_successes = 0
+
+    def retry_after(self) -> float:
+        """熔断打开时距离半开还有多久（秒）"""
+        return max(0.0, self.opened_at + self.open_seconds - time.monotonic())
+
+    def try_acquire(self) -> Optional[str]:
+        """允许调用时返回 None，否则返回拒绝原因"""
+        if self.state == OPEN:
+            if self.retry_after() > 0:
+                return OPEN
+            self._transition(HALF_OPEN)
+        if self.state == HALF_OPEN:
+            if self._probes >= self.half_open_max_calls:
+                return HALF_OPEN
+            self._probes += 1
+        return None
+
+    def release(self) -> None:
+        """取消一次已获准但没有发出的调用（退回半开探测名额）"""
+        if self.state == HALF_OPEN and self._probes > 0:
+            self._probes -= 1
+
+    def record(self, failed: bool, duration: float) -> None:
+        bad = failed or duration >= self.slow_call
+        if self.state == HALF_OPEN:
+            if bad:
+                self._transition(OPEN)
+                return
+            self._probe_successes += 1
+            if self._probe_successes >= self.half_open_max_calls:
+                self._transition(CLOSED)
+            return
+        if self.state == OPEN:
+            # 打开之前已经发出的调用，结果不再影响窗口
+            return
+        self._outcomes.append(bad)
+        if len(self._outcomes) >= self.min_calls:
+            if sum(self._outcomes) / len(self._outcomes) >= self.failure_rate_threshold:
+                self._transition(OPEN)
+
+    def _transition(self, state: str) -> None:
+        self.state = state
+        self._probes = 0
+        self._probe_successes = 0
+        if state == OPEN:
+            self.opened_at = time.monotonic()
+        if state == CLOSED:
+            self._outcomes.clear()
+        if self.on_transition is not None:
+            self.on_transition(state)
+
+
+class ProviderGuard:
+    """熔断器 + 舱壁 + 可选超时，包装单个 provider 的所有调用"""
+
+    def __init__(
+        self,
+        provider: str,
+        breaker: Optional[CircuitBreaker] = None,
+        max_concurrent: int = 50,
+        max_wait_ms: float = 1000.0,
+        call_timeout_seconds: Optional[float] = None,
+    ):
+        """
+        Args:
+            provider: provider 名称（日志与指标标签）
+            breaker: 熔断器，默认参数见 CircuitBreaker
+            max_concurrent: 舱壁大小，同时进行中的调用上限
+            max_wait_ms: 舱壁已满时最多排队等待的时间，0 表示立即拒绝
+            call_timeout_seconds: 单次调用超时，None 表示由被包装的实现自行控制
+        """
+        self.provider = provider
+        self.breaker = breaker or CircuitBreaker()
+        self.breaker.on_transition = self._on_transition
+        self.max_concurrent = max_concurrent
+        self.max_wait = max_wait_ms / 1000
+        self.call_timeout = call_timeout_seconds
+        self.in_flight = 0
+        self.rejected: Dict[str, int] = {}
+        self._slots = asyncio.Semaphore(max_concurrent)
+        self._metrics: Optional[_Metrics] = None
+
+    @classmethod
+    def from_env(cls, provider: str, max_concurrent: int = 50) -> "ProviderGuard":
+        """
+        从环境变量构建：<PROVIDER>_BREAKER_* 覆盖通用的 PROVIDER_BREAKER_*（如 PAYMENT_BULKHEAD_MAX_CONCURRENT）
+
+        Args:
+            provider: provider 名称
+            max_concurrent: 未配置 BULKHEAD_MAX_CONCURRENT 时的舱壁大小（通常是 worker 的 activity 槽位数）
+        """
+
+        def read(name: str, default: str) -> str:
+            return os.getenv(f"{provider.upper()}_{name}", os.getenv(f"PROVIDER_{name}", default))
+
+        timeout = read("CALL_TIMEOUT_SECONDS", "")
+        return cls(
+            provider,
+            breaker=CircuitBreaker(
+                failure_rate_threshold=float(read("BREAKER_FAILURE_RATE", "0.5")),
+                slow_call_ms=float(read("BREAKER_SLOW_CALL_MS", "2000")),
+                window_size=int(read("BREAKER_WINDOW", "20")),
+                min_calls=int(read("BREAKER_MIN_CALLS", "10")),
+                open_seconds=float(read("BREAKER_OPEN_SECONDS", "30")),
+                half_open_max_calls=int(read("BREAKER_HALF_OPEN_CALLS", "1")),
+            ),
+            max_concurrent=int(read("BULKHEAD_MAX_CONCURRENT", str(max_concurrent))),
+            max_wait_ms=float(read("BULKHEAD_MAX_WAIT_MS", "1000")),
+            call_timeout_seconds=float(timeout) if timeout else None,
+        )
+
+    async def call(self, fn: Callable[..., Awaitable[T]], *args) -> T:
+        reason = self.breaker.try_acquire()
+        if reason is not None:
+            self._reject(reason, retry_after=self.breaker.retry_after() or 1.0)
+        try:
+            entered = await self._enter()
+        except asyncio.CancelledError:
+            self.breaker.release()
+            raise
+        if not entered:
+            self.breaker.release()
+            self._reject("bulkhead", retry_after=1.0)
+
+        start = time.monotonic()
+        failed: Optional[bool] = True
+        try:
+            if self.call_timeout is None:
+                result = await fn(*args)
+            else:
+                try:
+                    result = await asyncio.wait_for(fn(*args), self.call_timeout)
+                except asyncio.TimeoutError:
+                    self._reject("timeout", retry_after=1.0)
+            failed = False
+            return result
+        except ApplicationError as e:
+            # 请求本身的问题（non-retryable）不代表 provider 不健康
+            failed = not e.non_retryable
+            raise
+        except asyncio.CancelledError:
+            # activity 被取消，不是 provider 的问题
+            failed = None
+            raise
+        finally:
+            self._exit()
+            if failed is None:
+                self.breaker.release()
+            else:
+                self.breaker.record(failed, time.monotonic() - start)
+
+    def stats(self) -> dict:
+        return {
+            "provider": self.provider,
+            "state": self.breaker.state,
+            "in_flight": self.in_flight,
+            "rejected": dict(self.rejected),
+        }
+
+    async def _enter(self) -> bool:
+        if self._slots.locked():
+            if self.max_wait <= 0:
+                return False
+            try:
+                await asyncio.wait_for(self._slots.acquire(), self.max_wait)
+            except asyncio.TimeoutError:
+                return False
+        else:
+            await self._slots.acquire()
+        self.in_flight += 1
+        self._get_metrics().in_flight.set(self.in_flight)
+        return True
+
+    def _exit(self) -> None:
+        self.in_flight -= 1
+        self._slots.release()
+        self._get_metrics().in_flight.set(self.in_flight)
+
+    def _reject(self, reason: str, retry_after: float) -> None:
+        self.rejected[reason] = self.rejected.get(reason, 0) + 1
+        self._get_metrics().rejections.with_additional_attributes({"reason": reason}).add(1)
+        raise ApplicationError(
+            f"Provider '{self.provider}' unavailable ({reason}), retry in {retry_after:.1f}s",
+            type="ProviderUnavailable",
+            next_retry_delay=timedelta(seconds=retry_after),
+        )
+
+    def _on_transition(self, state: str) -> None:
+        print(f"[ProviderGuard] '{self.provider}' circuit breaker -> {state}")
+        metrics = self._get_metrics()
+        metrics.state.set(_STATE_VALUES[state])
+        metrics.transitions.with_additional_attributes({"state": state}).add(1)
+
+    def _get_metrics(self) -> _Metrics:
+        if self._metrics is None:
+            self._metrics = _Metrics(self.provider)
+        return self._metrics
@@ -0,0 +1,165 @@
+"""
+Hedged Requests - 用重复请求削减尾延迟
+
+远程调用的 p99 往往是 p50 的数倍，而慢请求大多只是"运气差"（排队、GC、丢包重传）。
+Hedger 先发出一次请求；若在 hedge 延迟内没有完成，再发出一次相同的请求（调用方保证幂等，
+例如同一个 Idempotency-Key），取先成功的结果并取消另一个：
+
+- hedge 延迟 = 自身延迟直方图的第 percentile 分位（限制在 [min_delay_ms, max_delay_ms]），
+  样本不足 min_samples 时使用 initial_delay_ms；直方图定期衰减，跟随服务的延迟变化
+- 被取消的请求按已等待的时长记为样本（真实延迟至少这么长），避免只看到赢家导致分位数偏低、
+  hedge 越来越早
+- hedge 预算：hedge 次数不超过请求数的 max_hedge_ratio，服务整体变慢时不会把负载翻倍
+- 首个请求在 hedge 延迟之前失败时直接抛出（失败由重试处理，不是 hedge 的职责）
+
+指标（Temporal Runtime 的 metric meter，按 name 打标签）：
+  app_hedged_requests     counter，result=not_hedged|primary_won|hedge_won|budget_exhausted
+  app_hedge_delay         gauge，当前 hedge 延迟（毫秒）
+"""
+
+import asyncio
+import bisect
+import time
+from typing import Awaitable, Callable, List, Optional, TypeVar
+
+from temporalio.runtime import Runtime
+
+T = TypeVar("T")
+
+
+class LatencyHistogram:
+    """对数分桶的延迟直方图（毫秒），每 decay_every 个样本计数减半"""
+
+    def __init__(self, min_ms: float = 1.0, max_ms: float = 60000.0, growth: float = 1.2, decay_every: int = 1000):
+        self.bounds: List[float] = []
+        bound = min_ms
+        while bound < max_ms:
+            self.bounds.append(bound)
+            bound *= growth
+        self.bounds.append(max_ms)
+        self.counts = [0.0] * (len(self.bounds) + 1)
+        self.total = 0.0
+        self.decay_every = decay_every
+        self._since_decay = 0
+
+    def record(self, latency_ms: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, latency_ms)] += 1
+        self.total += 1
+        self._since_decay += 1
+        if self._since_decay >= self.decay_every:
+            self._since_decay = 0
+            self.counts = [count / 2 for count in self.counts]
+            self.total /= 2
+
+    def percentile(self, q: float) -> Optional[float]:
+        """第 q 分位（0-100）所在桶的上界，没有样本时返回 None"""
+        if self.total <= 0:
+            return None
+        target = self.total * q / 100
+        cumulative = 0.0
+        for i, count in enumerate(self.counts):
+            cumulative += count
+            if cumulative >= target and count > 0:
+                return self.bounds[min(i, len(self.bounds) - 1)]
+        return self.bounds[-1]
+
+
+class Hedger:
+    """按自适应延迟发出 hedge 请求"""
+
+    def __init__(
+        self,
+        name: str,
+        percentile: float = 95.0,
+        min_delay_ms: float = 10.0,
+        max_delay_ms: float = 2000.0,
+        initial_delay_ms: float = 500.0,
+        min_samples: int = 50,
+        max_hedge_ratio: float = 0.1,
+    ):
+        """
+        Args:
+            name: 名称（日志与指标标签）
+            percentile: 以自身延迟的该分位作为 hedge 延迟
+            min_delay_ms / max_delay_ms: hedge 延迟的上下限
+            initial_delay_ms: 样本不足 min_samples 时的 hedge 延迟
+            max_hedge_ratio: hedge 次数占请求数的上限
+        """
+        self.name = name
+        self.percentile = percentile
+        self.min_delay_ms = min_delay_ms
+        self.max_delay_ms = max_delay_ms
+        self.initial_delay_ms = initial_delay_ms
+        self.min_samples = min_samples
+        self.max_hedge_ratio = max_hedge_ratio
+        self.histogram = LatencyHistogram()
+        self.requests = 0
+        self.hedges = 0
+        self._counter = None
+        self._delay_gauge = None
+
+    def delay_ms(self) -> float:
+        if self.histogram.total < self.min_samples:
+            return self.initial_delay_ms
+        return min(self.max_delay_ms, max(self.min_delay_ms, self.histogram.percentile(self.percentile)))
+
+    async def call(self, fn: Callable[..., Awaitable[T]], *args) -> T:
+        self.requests += 1
+        delay = self.delay_ms()
+        primary = asyncio.ensure_future(self._timed(fn, *args))
+        tasks = [primary]
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=delay / 1000)
+            if done:
+                self._record("not_hedged", delay)
+                return primary.result()
+            if self.hedges >= self.requests * self.max_hedge_ratio:
+                self._record("budget_exhausted", delay)
+                return await primary
+
+            self.hedges += 1
+            tasks.append(asyncio.ensure_future(self._timed(fn, *args)))
+            pending = set(tasks)
+            error: Optional[BaseException] = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                # 先取出所有异常（标记为已读取），再看是否有成功的
+                errors = [task.exception() for task in done]
+                for task, task_error in zip(done, errors):
+                    if task_error is None:
+                        self._record("primary_won" if task is primary else "hedge_won", delay)
+                        return task.result()
+                error = error or next(e for e in errors if e is not None)
+            raise error
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    def stats(self) -> dict:
+        return {
+            "name": self.name,
+            "requests": self.requests,
+            "hedges": self.hedges,
+            "delay_ms": self.delay_ms(),
+            "samples": self.histogram.total,
+        }
+
+    async def _timed(self, fn: Callable[..., Awaitable[T]], *args) -> T:
+        start = time.perf_counter()
+        try:
+            result = await fn(*args)
+        except asyncio.CancelledError:
+            # 输掉的请求：真实延迟至少是已经等待的时长
+            self.histogram.record((time.perf_counter() - start) * 1000)
+            raise
+        self.histogram.record((time.perf_counter() - start) * 1000)
+        return result
+
+    def _record(self, result: str, delay_ms: float) -> None:
+        if self._counter is None:
+            meter = Runtime.default().metric_meter.with_additional_attributes({"name": self.name})
+            self._counter = meter.create_counter("app_hedged_requests", "Hedged requests by result")
+            self._delay_gauge = meter.create_gauge("app_hedge_delay", "Current hedge delay", "ms")
+        self._counter.with_additional_attributes({"result": result}).add(1)
+        self._delay_gauge.set(int(delay_ms))
@@ -0,0 +1,403 @@
+"""
+Rate Limit - 跨 worker 进程共享配额的令牌桶限流
+
+外部服务（如支付）按全局 QPS 限流，多个 worker 副本各自调用会一起超额、被限流后集中重试。
+RateLimiter 在每次外部调用前向后端预约一个令牌，等待预约到的时刻再发出请求：
+
+- 算法：GCRA（令牌桶的等价形式），每个 key 只存一个"理论到达时间" tat，
+  rate 为每秒令牌数，burst 为桶容量；一次预约只需一次后端往返
+- 需要等待超过 max_wait_seconds 时不预约，抛出可重试的 ApplicationError(type="RateLimited")，
+  带 next_retry_delay，由 Temporal 稍后重试，不占着 activity 槽位空等
+- 后端（RATE_LIMIT_BACKEND）：
+    local     进程内的桶，只限制本进程（默认）
+    socket    本地限流服务（RateLimitServer，TCP host:port 或 unix socket 路径），同一台机器
+              或能访问它的所有进程共享配额；Supervisor 设置 RATE_LIMIT_SERVE 时自动托管，
+              也可单独运行：python -m app.infrastructure.resilience.rate_limit --listen 127.0.0.1:7071
+    postgres  在 Postgres 中用 pg_advisory_xact_lock 串行化同一 key 的预约，时间取数据库时钟，
+              跨主机共享配额，除已有的数据库外不需要其他服务
+- 共享后端不可用（连接失败、RATE_LIMIT_TIMEOUT_MS 内无响应、数据库错误）时抛出可重试的
+  ApplicationError(type="RateLimiterUnavailable")，宁可延迟也不绕过全局配额
+
+指标（Temporal Runtime 的 metric meter，按 key 打标签）：
+  app_rate_limit_wait        histogram，预约到的等待时间（毫秒）
+  app_rate_limit_rejections  counter，等待超过 max_wait_seconds 被拒绝的调用
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from datetime import timedelta
+from typing import Awaitable, Callable, Deque, Dict, Optional, Tuple, TypeVar
+
+from temporalio.exceptions import ApplicationError
+from temporalio.runtime import Runtime
+
+T = TypeVar("T")
+
+
+def gcra(tat: Optional[float], now: float, rate: float, burst: int, max_wait: float) -> Tuple[bool, float, float]:
+    """预约一个令牌
+
+    Returns:
+        (是否预约成功, 需要等待的秒数, 新的 tat；预约失败时为原 tat)
+    """
+    interval = 1.0 / rate
+    start = now if tat is None else max(tat, now)
+    new_tat = start + interval
+    wait = max(0.0, new_tat - burst * interval - now)
+    if wait > max_wait:
+        return False, wait, start
+    return True, wait, new_tat
+
+
+class RateLimitBackend(ABC):
+    """令牌桶状态的存放位置"""
+
+    @abstractmethod
+    async def reserve(self, key: str, rate: float, burst: int, max_wait: float) -> Tuple[bool, float]:
+        """预约一个令牌，返回 (是否成功, 需要等待的秒数)"""
+        pass
+
+    async def close(self) -> None:
+        pass
+
+
+class LocalRateLimitBackend(RateLimitBackend):
+    """进程内的令牌桶"""
+
+    def __init__(self):
+        self._tats: Dict[str, float] = {}
+
+    def reserve_now(self, key: str, rate: float, burst: int, max_wait: float) -> Tuple[bool, float]:
+        granted, wait, self._tats[key] = gcra(self._tats.get(key), time.monotonic(), rate, burst, max_wait)
+        return granted, wait
+
+    async def reserve(self, key: str, rate: float, burst: int, max_wait: float) -> Tuple[bool, float]:
+        return self.reserve_now(key, rate, burst, max_wait)
+
+
+def _parse_address(address: str) -> Tuple[Optional[str], Optional[int], Optional[str]]:
+    """'host:port' -> (host, port, None)；'/path/to.sock' 或 'unix:/path' -> (None, None, path)"""
+    if address.startswith("unix:"):
+        return None, None, address[len("unix:"):]
+    if address.startswith("/"):
+        return None, None, address
+    host, _, port = address.rpartition(":")
+    return host or "127.0.0.1", int(port), None
+
+
+class RateLimitServer:
+    """本地限流服务：持有所有 key 的令牌桶，按行收发 JSON"""
+
+    def __init__(self):
+        self.backend = LocalRateLimitBackend()
+        self._server: Optional[asyncio.base_events.Server] = None
+        self._connections: Dict[asyncio.StreamWriter, asyncio.Task] = {}
+
+    async def start(self, address: str) -> None:
+        host, port, path = _parse_address(address)
+        if path is not None:
+            if os.path.exists(path):
+                os.unlink(path)
+            self._server = await asyncio.start_unix_server(self._serve, path)
+        else:
+            self._server = await asyncio.start_server(self._serve, host, port)
+        print(f"[RateLimit] Serving token buckets on {address}")
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            # 已建立的连接不会随监听 socket 关闭，主动断开让客户端重连
+            for writer in list(self._connections):
+                writer.close()
+            await asyncio.gather(*self._connections.values(), return_exceptions=True)
+            await self._server.wait_closed()
+            self._server = None
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        # 每个连接上的请求按顺序处理、按顺序响应，客户端可以流水线发送
+        self._connections[writer] = asyncio.current_task()
+        try:
+            while line := await reader.readline():
+                request = json.loads(line)
+                granted, wait = self.backend.reserve_now(
+                    request["key"], request["rate"], request["burst"], request["max_wait"]
+                )
+                writer.write(json.dumps({"granted": granted, "wait": wait}).encode("utf-8") + b"\n")
+                await writer.drain()
+        except (ConnectionError, ValueError, KeyError):
+            pass
+        finally:
+            self._connections.pop(writer, None)
+            writer.close()
+
+
+class SocketRateLimitBackend(RateLimitBackend):
+    """通过一条长连接向 RateLimitServer 预约令牌（请求流水线发送）"""
+
+    def __init__(self, address: str, timeout: float = 2.0):
+        self.address = address
+        # 一次预约（发送 + 等待响应）的超时，服务卡住时不让调用方无限等待
+        self.timeout = timeout
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._reader_task: Optional[asyncio.Task] = None
+        self._waiters: Deque[asyncio.Future] = deque()
+        self._connect_lock = asyncio.Lock()
+
+    async def reserve(self, key: str, rate: float, burst: int, max_wait: float) -> Tuple[bool, float]:
+        if self._writer is None:
+            async with self._connect_lock:
+                if self._writer is None:
+                    await self._connect()
+        if self._writer is None:
+            raise ConnectionError(f"rate limit server {self.address} disconnected")
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.append(future)
+        try:
+            response = await asyncio.wait_for(self._send(future, key, rate, burst, max_wait), self.timeout)
+        except asyncio.TimeoutError:
+            # 服务无响应：断开连接（同一连接上排队的预约一起失败），下次预约重新连接
+            error = ConnectionError(f"rate limit server {self.address} did not respond within {self.timeout}s")
+            self._disconnect(error)
+            raise error from None
+        return response["granted"], response["wait"]
+
+    async def close(self) -> None:
+        self._disconnect(ConnectionError("rate limit backend closed"))
+
+    async def _send(self, future: asyncio.Future, key: str, rate: float, burst: int, max_wait: float) -> dict:
+        writer = self._writer
+        writer.write(
+            json.dumps({"key": key, "rate": rate, "burst": burst, "max_wait": max_wait}).encode("utf-8") + b"\n"
+        )
+        # 服务读得慢时在这里等待写缓冲区排空，而不是无限堆积
+        await writer.drain()
+        return await future
+
+    def _disconnect(self, error: BaseException) -> None:
+        if self._reader_task is not None:
+            self._reader_task.cancel()
+            self._reader_task = None
+        self._reset(error)
+
+    async def _connect(self) -> None:
+        host, port, path = _parse_address(self.address)
+        if path is not None:
+            reader, writer = await asyncio.open_unix_connection(path)
+        else:
+            reader, writer = await asyncio.open_connection(host, port)
+        self._writer = writer
+        self._reader_task = asyncio.get_running_loop().create_task(self._read_responses(reader))
+
+    async def _read_responses(self, reader: asyncio.StreamReader) -> None:
+        try:
+            while line := await reader.readline():
+                waiter = self._waiters.popleft()
+                # 调用方可能已被取消（令牌仍按预约消耗）
+                if not waiter.done():
+                    waiter.set_result(json.loads(line))
+            raise ConnectionError(f"rate limit server {self.address} closed the connection")
+        except (ConnectionError, ValueError) as e:
+            self._reset(e)
+
+    def _reset(self, error: BaseException) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        while self._waiters:
+            future = self._waiters.popleft()
+            if not future.done():
+                future.set_exception(error)
+
+
+class PostgresRateLimitBackend(RateLimitBackend):
+    """Postgres 中的令牌桶：advisory lock 串行化同一 key，时间取数据库时钟"""
+
+    TABLE = "app_rate_limit_buckets"
+
+    def __init__(self, database_url: str):
+        from sqlalchemy import create_engine
+
+        # 每次预约是一个很短的事务，少量连接即可；同步驱动在线程中执行，不阻塞事件循环
+        self.engine = create_engine(database_url, pool_size=4, max_overflow=4, pool_pre_ping=True)
+        self._table_ready = False
+        self._setup_lock = threading.Lock()
+
+    async def reserve(self, key: str, rate: float, burst: int, max_wait: float) -> Tuple[bool, float]:
+        return await asyncio.to_thread(self._reserve, key, rate, burst, max_wait)
+
+    async def close(self) -> None:
+        self.engine.dispose()
+
+    def _reserve(self, key: str, rate: float, burst: int, max_wait: float) -> Tuple[bool, float]:
+        from sqlalchemy.exc import IntegrityError, OperationalError, ProgrammingError
+
+        try:
+            if not self._table_ready:
+                self._setup()
+            return self._reserve_in_transaction(key, rate, burst, max_wait)
+        except (OperationalError, IntegrityError, ProgrammingError) as e:
+            # 数据库不可达、建表或 SQL 出错都按后端不可用处理（RateLimiterUnavailable）
+            raise ConnectionError(str(e)) from e
+
+    def _setup(self) -> None:
+        """建表：每个进程只执行一次，在预约事务之外"""
+        from sqlalchemy import text
+
+        with self._setup_lock:
+            if self._table_ready:
+                return
+            with self.engine.begin() as conn:
+                # 多个进程同时 CREATE TABLE IF NOT EXISTS 仍可能因系统目录的唯一约束冲突，先用固定的 advisory lock 串行化
+                conn.execute(text("SELECT pg_advisory_xact_lock(hashtext(:name))"), {"name": self.TABLE})
+                conn.execute(text(
+                    f"CREATE TABLE IF NOT EXISTS {self.TABLE} (key text PRIMARY KEY, tat double precision NOT NULL)"
+                ))
+            self._table_ready = True
+
+    def _reserve_in_transaction(self, key: str, rate: float, burst: int, max_wait: float) -> Tuple[bool, float]:
+        from sqlalchemy import text
+
+        with self.engine.begin() as conn:
+            conn.execute(text("SELECT pg_advisory_xact_lock(hashtext(:key))"), {"key": key})
+            row = conn.execute(
+                text(
+                    f"SELECT extract(epoch FROM clock_timestamp()) AS now, "
+                    f"(SELECT tat FROM {self.TABLE} WHERE key = :key) AS tat"
+                ),
+                {"key": key},
+            ).one()
+            granted, wait, new_tat = gcra(row.tat, float(row.now), rate, burst, max_wait)
+            if granted:
+                conn.execute(
+                    text(
+                        f"INSERT INTO {self.TABLE} (key, tat) VALUES (:key, :tat) "
+                        f"ON CONFLICT (key) DO UPDATE SET tat = EXCLUDED.tat"
+                    ),
+                    {"key": key, "tat": new_tat},
+                )
+        return granted, wait
+
+
+_backend: Optional[RateLimitBackend] = None
+
+
+def get_rate_limit_backend() -> RateLimitBackend:
+    """按 RATE_LIMIT_BACKEND 创建本进程共享的后端（同一进程内所有 RateLimiter 共用一条连接）"""
+    global _backend
+    if _backend is None:
+        kind = os.getenv("RATE_LIMIT_BACKEND", "local").lower()
+        if kind == "local":
+            _backend = LocalRateLimitBackend()
+        elif kind == "socket":
+            _backend = SocketRateLimitBackend(
+                os.getenv("RATE_LIMIT_ADDRESS", "127.0.0.1:7071"),
+                timeout=float(os.getenv("RATE_LIMIT_TIMEOUT_MS", "2000")) / 1000,
+            )
+        elif kind == "postgres":
+            _backend = PostgresRateLimitBackend(os.environ["RATE_LIMIT_DATABASE_URL"])
+        else:
+            raise ValueError(f"Unknown RATE_LIMIT_BACKEND '{kind}' (expected local, socket or postgres)")
+    return _backend
+
+
+class RateLimiter:
+    """按 key 限流的调用包装"""
+
+    def __init__(
+        self,
+        key: str,
+        rate: float,
+        burst: Optional[int] = None,
+        max_wait_seconds: float = 1.0,
+        backend: Optional[RateLimitBackend] = None,
+    ):
+        """
+        Args:
+            key: 配额名称，共享后端中同一 key 的所有进程共用一个桶
+            rate: 每秒令牌数（全局配额）
+            burst: 桶容量，默认等于 rate（至少 1）
+            max_wait_seconds: 预约的等待时间超过该值时拒绝，交给 Temporal 稍后重试
+            backend: 令牌桶后端，默认按 RATE_LIMIT_BACKEND 创建
+        """
+        if rate <= 0:
+            raise ValueError("rate must be > 0")
+        self.key = key
+        self.rate = rate
+        self.burst = burst or max(1, int(rate))
+        self.max_wait = max_wait_seconds
+        self.backend = backend or get_rate_limit_backend()
+        self._wait_histogram = None
+        self._rejections = None
+
+    @classmethod
+    def from_env(cls, provider: str) -> Optional["RateLimiter"]:
+        """<PROVIDER>_RATE_LIMIT_RPS 未设置时返回 None（不限流）"""
+        prefix = provider.upper()
+        rate = os.getenv(f"{prefix}_RATE_LIMIT_RPS")
+        if not rate:
+            return None
+        burst = os.getenv(f"{prefix}_RATE_LIMIT_BURST")
+        return cls(
+            key=os.getenv(f"{prefix}_RATE_LIMIT_KEY", provider),
+            rate=float(rate),
+            burst=int(burst) if burst else None,
+            max_wait_seconds=float(os.getenv(f"{prefix}_RATE_LIMIT_MAX_WAIT_MS", "1000")) / 1000,
+        )
+
+    async def acquire(self) -> None:
+        try:
+            granted, wait = await self.backend.reserve(self.key, self.rate, self.burst, self.max_wait)
+        except (OSError, ConnectionError) as e:
+            raise ApplicationError(
+                f"Rate limit backend unavailable for '{self.key}': {e}",
+                type="RateLimiterUnavailable",
+                next_retry_delay=timedelta(seconds=1),
+            ) from e
+        self._record(wait, granted)
+        if not granted:
+            raise ApplicationError(
+                f"Rate limit for '{self.key}' exceeded ({self.rate}/s), retry in {wait:.2f}s",
+                type="RateLimited",
+                next_retry_delay=timedelta(seconds=wait),
+            )
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    async def call(self, fn: Callable[..., Awaitable[T]], *args) -> T:
+        await self.acquire()
+        return await fn(*args)
+
+    def _record(self, wait: float, granted: bool) -> None:
+        if self._wait_histogram is None:
+            meter = Runtime.default().metric_meter.with_additional_attributes({"key": self.key})
+            self._wait_histogram = meter.create_histogram("app_rate_limit_wait", "Rate limiter reservation wait", "ms")
+            self._rejections = meter.create_counter("app_rate_limit_rejections", "Calls rejected by the rate limiter")
+        if granted:
+            self._wait_histogram.record(int(wait * 1000))
+        else:
+            self._rejections.add(1)
+
+
+async def _serve_forever(address: str) -> None:
+    server = RateLimitServer()
+    await server.start(address)
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local token bucket server for RATE_LIMIT_BACKEND=socket")
+    parser.add_argument("--listen", default=os.getenv("RATE_LIMIT_ADDRESS", "127.0.0.1:7071"), help="host:port 或 unix socket 路径")
+    args = parser.parse_args()
+    try:
+        asyncio.run(_serve_forever(args.listen))
+    except KeyboardInterrupt:
+        pass
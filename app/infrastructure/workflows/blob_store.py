@@ -0,0 +1,133 @@
+"""
+Blob Stores - Claim-Check 模式的外部存储后端
+
+大 payload 不写入 Workflow History，而是存到 BlobStore，History 中只保留内容寻址的 key。
+- LocalFileBlobStore: 本地文件系统，用于开发与测试
+- S3BlobStore: S3 兼容存储（AWS S3 / MinIO / Ceph 等），依赖可选的 boto3
+
+key 来自 Workflow History（可被篡改或伪造），两种后端都只接受 SHA-256 十六进制摘要，
+避免拼接出 root_dir / prefix 之外的路径。
+"""
+
+import asyncio
+import os
+import re
+import tempfile
+from abc import ABC, abstractmethod
+from typing import Optional
+
+try:
+    import boto3
+except ImportError:  # boto3 是可选依赖，只有使用 S3BlobStore 时才需要
+    boto3 = None
+
+_KEY_PATTERN = re.compile(r"[0-9a-f]{64}")
+
+
+def validate_key(key: str) -> str:
+    """校验 key 是 SHA-256 十六进制摘要（小写），否则抛出 ValueError"""
+    if not isinstance(key, str) or not _KEY_PATTERN.fullmatch(key):
+        raise ValueError(f"Invalid blob key {key!r}: expected a SHA-256 hex digest")
+    return key
+
+
+class BlobStore(ABC):
+    """内容寻址的 Blob 存储接口（key 由调用方根据内容哈希生成）"""
+
+    @abstractmethod
+    async def put(self, key: str, data: bytes) -> None:
+        """保存 blob；相同 key 重复写入必须是幂等的"""
+        pass
+
+    @abstractmethod
+    async def get(self, key: str) -> bytes:
+        """读取 blob
+
+        Raises:
+            KeyError: key 不存在
+        """
+        pass
+
+
+class LocalFileBlobStore(BlobStore):
+    """本地文件系统存储（开发与测试用）"""
+
+    def __init__(self, root_dir: str):
+        self.root_dir = root_dir
+
+    def _path(self, key: str) -> str:
+        validate_key(key)
+        # 两级目录，避免单目录下文件过多
+        return os.path.join(self.root_dir, key[:2], key)
+
+    def _write(self, key: str, data: bytes) -> None:
+        path = self._path(key)
+        if os.path.exists(path):
+            return  # 内容寻址：已存在即内容相同
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # 先写临时文件再原子替换，避免并发读到半个文件
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+    def _read(self, key: str) -> bytes:
+        try:
+            with open(self._path(key), "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            raise KeyError(key) from None
+
+    async def put(self, key: str, data: bytes) -> None:
+        await asyncio.to_thread(self._write, key, data)
+
+    async def get(self, key: str) -> bytes:
+        return await asyncio.to_thread(self._read, key)
+
+
+class S3BlobStore(BlobStore):
+    """S3 兼容存储，endpoint_url 可指向 MinIO 等自建服务"""
+
+    def __init__(
+        self,
+        bucket: str,
+        prefix: str = "",
+        endpoint_url: Optional[str] = None,
+        client=None,
+    ):
+        """
+        Args:
+            bucket: Bucket 名称
+            prefix: key 前缀，例如 "temporal-payloads/"
+            endpoint_url: S3 兼容服务地址，None 使用 AWS 默认
+            client: 预先构建的 boto3 S3 client（可选，便于注入与复用连接池）
+        """
+        if client is None:
+            if boto3 is None:
+                raise RuntimeError("S3BlobStore requires the 'boto3' package")
+            client = boto3.client("s3", endpoint_url=endpoint_url)
+        self.client = client
+        self.bucket = bucket
+        self.prefix = prefix
+
+    def _put(self, key: str, data: bytes) -> None:
+        self.client.put_object(Bucket=self.bucket, Key=self.prefix + validate_key(key), Body=data)
+
+    def _get(self, key: str) -> bytes:
+        try:
+            response = self.client.get_object(Bucket=self.bucket, Key=self.prefix + validate_key(key))
+        except self.client.exceptions.NoSuchKey:
+            raise KeyError(key) from None
+        return response["Body"].read()
+
+    async def put(self, key: str, data: bytes) -> None:
+        # boto3 是同步 client，放到线程池避免阻塞事件循环
+        await asyncio.to_thread(self._put, key, data)
+
+    async def get(self, key: str) -> bytes:
+        return await asyncio.to_thread(self._get, key)
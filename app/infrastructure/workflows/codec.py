@@ -0,0 +1,214 @@
+"""
+Payload Codecs - 在 PayloadConverter 之后对 Payload 字节做二次编码
+
+CompressionPayloadCodec:
+- 只压缩超过阈值的 payload，小 payload 原样透传
+- 压缩后的 payload 用 metadata["encoding"] 标记算法 (binary/zlib, binary/zstd)
+- 编码只使用显式配置的算法 (zlib/zstd/none)，同一部署的所有进程结果一致
+- 解码时根据标记自动解压任一已知算法，与编码算法无关；未标记的 payload 直接透传（兼容旧历史）
+
+ClaimCheckPayloadCodec:
+- 超过阈值的 payload 存入 BlobStore，History 中只保留内容寻址的引用 (binary/claim-check)
+- 解码时取回的 blob 放入 LRU 缓存，Replay 时不重复拉取
+
+ChainPayloadCodec:
+- 按顺序串联多个 codec（DataConverter 只接受一个 payload_codec）
+"""
+
+import hashlib
+import zlib
+from collections import OrderedDict
+from typing import List, Optional, Sequence
+
+from temporalio.api.common.v1 import Payload
+from temporalio.converter import PayloadCodec
+
+from app.infrastructure.workflows.blob_store import BlobStore
+
+try:
+    import zstandard
+except ImportError:  # zstandard 是可选依赖，只有配置 zstd 或解码 zstd payload 时需要
+    zstandard = None
+
+
+ENCODING_ZLIB = b"binary/zlib"
+ENCODING_ZSTD = b"binary/zstd"
+ENCODING_CLAIM_CHECK = b"binary/claim-check"
+
+
+class CompressionPayloadCodec(PayloadCodec):
+    """
+    Compresses serialized payloads above a byte threshold.
+
+    The whole original Payload (metadata + data) is serialized and compressed, so the
+    inner encoding (json/pydantic, binary/pydantic-msgpack, ...) is restored on decode.
+    """
+
+    def __init__(self, algorithm: str = "zlib", threshold: int = 1024, level: Optional[int] = None):
+        """
+        Args:
+            algorithm: 编码使用的算法 "zlib"、"zstd" 或 "none"（只解码，不压缩）
+            threshold: 序列化后小于该字节数的 payload 不压缩
+            level: 压缩级别，None 使用算法默认值
+        """
+        # 不根据本机是否安装 zstandard 自动选择：不同进程会写出不同算法的 payload
+        if algorithm not in ("zstd", "zlib", "none"):
+            raise ValueError(f"Unknown compression algorithm '{algorithm}' (expected 'zstd', 'zlib' or 'none')")
+        if algorithm == "zstd" and zstandard is None:
+            raise RuntimeError("zstd compression requires the 'zstandard' package")
+
+        self.algorithm = algorithm
+        self.threshold = threshold
+        self.level = level
+
+        if algorithm == "zstd":
+            self._encoding = ENCODING_ZSTD
+            self._compressor = zstandard.ZstdCompressor(level=level if level is not None else 3)
+        elif algorithm == "zlib":
+            self._encoding = ENCODING_ZLIB
+            self._zlib_level = level if level is not None else 6
+        # 解压器不依赖配置的算法，保证切换算法后旧 payload 仍可解码
+        self._zstd_decompressor = zstandard.ZstdDecompressor() if zstandard is not None else None
+
+    def _compress(self, data: bytes) -> bytes:
+        if self.algorithm == "zstd":
+            return self._compressor.compress(data)
+        return zlib.compress(data, self._zlib_level)
+
+    def _decompress(self, encoding: bytes, data: bytes) -> bytes:
+        if encoding == ENCODING_ZSTD:
+            if self._zstd_decompressor is None:
+                raise RuntimeError("Payload is zstd-compressed but the 'zstandard' package is not installed")
+            return self._zstd_decompressor.decompress(data)
+        return zlib.decompress(data)
+
+    async def encode(self, payloads: Sequence[Payload]) -> List[Payload]:
+        """Compress payloads whose serialized size reaches the threshold."""
+        if self.algorithm == "none":
+            return list(payloads)
+        result = []
+        for payload in payloads:
+            raw = payload.SerializeToString()
+            if len(raw) < self.threshold:
+                result.append(payload)
+                continue
+
+            compressed = Payload(metadata={"encoding": self._encoding}, data=self._compress(raw))
+            # 压缩没有收益时保持原样（例如已经是高熵数据）
+            if compressed.ByteSize() >= len(raw):
+                result.append(payload)
+                continue
+
+            result.append(compressed)
+        return result
+
+    async def decode(self, payloads: Sequence[Payload]) -> List[Payload]:
+        """Decompress payloads tagged by this codec, pass through everything else."""
+        result = []
+        for payload in payloads:
+            encoding = payload.metadata.get("encoding", b"")
+            if encoding not in (ENCODING_ZLIB, ENCODING_ZSTD):
+                result.append(payload)
+                continue
+
+            decoded = Payload()
+            decoded.ParseFromString(self._decompress(encoding, payload.data))
+            result.append(decoded)
+        return result
+
+
+class ClaimCheckPayloadCodec(PayloadCodec):
+    """
+    Offloads large payloads to a BlobStore and keeps only a reference in history.
+
+    The key is the SHA-256 of the serialized Payload, so identical payloads
+    (e.g. the same PizzaOrder passed to several activities) are stored once.
+    """
+
+    def __init__(self, store: BlobStore, threshold: int = 128 * 1024, cache_bytes: int = 64 * 1024 * 1024):
+        """
+        Args:
+            store: Blob 存储后端
+            threshold: 序列化后达到该字节数的 payload 才外置
+            cache_bytes: 解码侧 LRU 缓存的容量上限（字节）
+        """
+        self.store = store
+        self.threshold = threshold
+        self.cache_bytes = cache_bytes
+        self._cache: "OrderedDict[str, bytes]" = OrderedDict()
+        self._cache_size = 0
+
+    def _cache_get(self, key: str) -> Optional[bytes]:
+        data = self._cache.get(key)
+        if data is not None:
+            self._cache.move_to_end(key)
+        return data
+
+    def _cache_put(self, key: str, data: bytes) -> None:
+        if len(data) > self.cache_bytes or key in self._cache:
+            return
+        self._cache[key] = data
+        self._cache_size += len(data)
+        while self._cache_size > self.cache_bytes:
+            _, evicted = self._cache.popitem(last=False)
+            self._cache_size -= len(evicted)
+
+    async def encode(self, payloads: Sequence[Payload]) -> List[Payload]:
+        """Replace payloads at or above the threshold with a content-addressed reference."""
+        result = []
+        for payload in payloads:
+            raw = payload.SerializeToString()
+            if len(raw) < self.threshold:
+                result.append(payload)
+                continue
+
+            key = hashlib.sha256(raw).hexdigest()
+            await self.store.put(key, raw)
+            # 编码端也写入缓存：同一进程内紧接着的解码（如 Activity 结果回到 Workflow）无需再拉取
+            self._cache_put(key, raw)
+            result.append(Payload(metadata={"encoding": ENCODING_CLAIM_CHECK}, data=key.encode("ascii")))
+        return result
+
+    async def decode(self, payloads: Sequence[Payload]) -> List[Payload]:
+        """Resolve claim-check references back to the original payloads."""
+        result = []
+        for payload in payloads:
+            if payload.metadata.get("encoding", b"") != ENCODING_CLAIM_CHECK:
+                result.append(payload)
+                continue
+
+            key = payload.data.decode("ascii")
+            raw = self._cache_get(key)
+            if raw is None:
+                raw = await self.store.get(key)
+                if hashlib.sha256(raw).hexdigest() != key:
+                    raise RuntimeError(f"Claim-check blob {key} failed integrity check")
+                self._cache_put(key, raw)
+
+            decoded = Payload()
+            decoded.ParseFromString(raw)
+            result.append(decoded)
+        return result
+
+
+class ChainPayloadCodec(PayloadCodec):
+    """
+    Applies several codecs in order on encode and in reverse order on decode.
+
+    例如 ChainPayloadCodec(compression, claim_check)：先压缩，压缩后仍然过大的才外置存储。
+    """
+
+    def __init__(self, *codecs: PayloadCodec):
+        self.codecs = list(codecs)
+
+    async def encode(self, payloads: Sequence[Payload]) -> List[Payload]:
+        result = list(payloads)
+        for codec in self.codecs:
+            result = await codec.encode(result)
+        return result
+
+    async def decode(self, payloads: Sequence[Payload]) -> List[Payload]:
+        result = list(payloads)
+        for codec in reversed(self.codecs):
+            result = await codec.decode(result)
+        return result
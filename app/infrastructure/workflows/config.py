@@ -1,5 +1,8 @@
 import os
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    from app.infrastructure.workflows.tuning import TuningConfig
 
 class WorkerConfig:
     @property
@@ -17,4 +20,288 @@ class WorkerConfig:
             return []
         return [d.strip() for d in raw.split(",") if d.strip()]
 
+    @property
+    def payload_encoding(self) -> str:
+        """
+        Preferred encoding for outgoing Pydantic payloads: "json" or "msgpack".
+        msgpack trades CPU for smaller payloads (see PydanticMsgpackPayloadConverter); keep json
+        unless payload bytes, not worker CPU, are the bottleneck.
+        Decoding always accepts both, so switching is safe for in-flight workflows
+        as long as every worker/client of the deployment can decode msgpack.
+        Example Env: PAYLOAD_ENCODING="msgpack"
+        """
+        return os.getenv("PAYLOAD_ENCODING", "json").strip().lower()
+
+    @property
+    def payload_compression(self) -> str:
+        """
+        Algorithm used to compress outgoing payloads: "zlib", "zstd" or "none".
+        Every algorithm is always decoded, so workers with different settings interoperate.
+        Example Env: PAYLOAD_COMPRESSION="zstd"
+        """
+        return os.getenv("PAYLOAD_COMPRESSION", "zlib").strip().lower()
+
+    @property
+    def payload_compression_threshold(self) -> int:
+        """
+        Payloads smaller than this many bytes are sent as-is (compression overhead isn't worth it).
+        Example Env: PAYLOAD_COMPRESSION_THRESHOLD="1024"
+        """
+        return int(os.getenv("PAYLOAD_COMPRESSION_THRESHOLD", "1024"))
+
+    @property
+    def claim_check_store(self) -> str:
+        """
+        Blob store for claim-check offloading of large payloads: "none", "local" or "s3".
+        Example Env: CLAIM_CHECK_STORE="local"
+        """
+        return os.getenv("CLAIM_CHECK_STORE", "none").strip().lower()
+
+    @property
+    def claim_check_threshold(self) -> int:
+        """Payloads (after compression) at or above this many bytes are offloaded."""
+        return int(os.getenv("CLAIM_CHECK_THRESHOLD", str(128 * 1024)))
+
+    @property
+    def claim_check_cache_bytes(self) -> int:
+        """Capacity of the worker-side LRU cache for fetched blobs."""
+        return int(os.getenv("CLAIM_CHECK_CACHE_BYTES", str(64 * 1024 * 1024)))
+
+    @property
+    def claim_check_local_dir(self) -> str:
+        return os.getenv("CLAIM_CHECK_LOCAL_DIR", "/tmp/temporal-claim-check")
+
+    @property
+    def claim_check_s3_bucket(self) -> Optional[str]:
+        return os.getenv("CLAIM_CHECK_S3_BUCKET")
+
+    @property
+    def claim_check_s3_prefix(self) -> str:
+        return os.getenv("CLAIM_CHECK_S3_PREFIX", "temporal-payloads/")
+
+    @property
+    def claim_check_s3_endpoint(self) -> Optional[str]:
+        """S3-compatible endpoint (e.g. MinIO); unset means AWS."""
+        return os.getenv("CLAIM_CHECK_S3_ENDPOINT")
+
+    @property
+    def converter_metrics(self) -> bool:
+        """
+        Record per-model encode/decode latency and payload size histograms.
+        Example Env: CONVERTER_METRICS="true"
+        """
+        return os.getenv("CONVERTER_METRICS", "false").strip().lower() in ("1", "true", "yes")
+
+    @property
+    def graceful_shutdown_seconds(self) -> float:
+        """
+        On SIGTERM, how long running activities get to finish before being cancelled.
+        Example Env: WORKER_GRACEFUL_SHUTDOWN_SECONDS="30"
+        """
+        return float(os.getenv("WORKER_GRACEFUL_SHUTDOWN_SECONDS", "30"))
+
+    @property
+    def worker_processes(self) -> dict[str, int]:
+        """
+        Supervisor mode: number of worker processes per task queue.
+        WORKER_PROCESSES sets the default for every queue ("auto" = CPU count),
+        WORKER_PROCESSES_PER_QUEUE overrides specific queues.
+        Example Env: WORKER_PROCESSES="2" WORKER_PROCESSES_PER_QUEUE="pizza-task-queue=4"
+        """
+        raw_default = os.getenv("WORKER_PROCESSES", "1").strip().lower()
+        default = (os.cpu_count() or 1) if raw_default == "auto" else int(raw_default)
+        result = {"*": default}
+        for entry in os.getenv("WORKER_PROCESSES_PER_QUEUE", "").split(","):
+            if not entry.strip():
+                continue
+            queue, _, count = entry.partition("=")
+            result[queue.strip()] = int(count)
+        for queue, count in result.items():
+            if count < 1:
+                name = "WORKER_PROCESSES" if queue == "*" else f"WORKER_PROCESSES_PER_QUEUE ({queue})"
+                raise ValueError(f"{name} must be >= 1, got {count}")
+        return result
+
+    @property
+    def supervisor_health_port(self) -> Optional[int]:
+        """
+        Port for the supervisor's aggregated health endpoint (GET /health); unset disables it.
+        Example Env: SUPERVISOR_HEALTH_PORT="8081"
+        """
+        raw = os.getenv("SUPERVISOR_HEALTH_PORT")
+        return int(raw) if raw else None
+
+    @property
+    def core_log_level(self) -> str:
+        """
+        Log level of the Temporal Core (Rust) runtime: ERROR, WARN, INFO, DEBUG or TRACE.
+        Example Env: TEMPORAL_CORE_LOG_LEVEL="INFO"
+        """
+        return os.getenv("TEMPORAL_CORE_LOG_LEVEL", "WARN").strip().upper()
+
+    @property
+    def metric_global_tags(self) -> dict[str, str]:
+        """
+        Tags attached to every metric emitted by this process.
+        Example Env: METRIC_GLOBAL_TAGS="env=prod,region=eu"
+        """
+        tags = {}
+        for entry in os.getenv("METRIC_GLOBAL_TAGS", "").split(","):
+            key, _, value = entry.partition("=")
+            if key.strip():
+                tags[key.strip()] = value.strip()
+        return tags
+
+    @property
+    def worker_tuning(self) -> "TuningConfig":
+        """Per task queue Worker tuning, see app/infrastructure/workflows/tuning.py."""
+        from app.infrastructure.workflows.tuning import load_tuning_config
+        return load_tuning_config()
+
+    @property
+    def activity_thread_pool_size(self) -> Optional[int]:
+        """
+        Threads for BLOCKING offloads and synchronous activities (unset = Python default).
+        Example Env: ACTIVITY_THREAD_POOL_SIZE="32"
+        """
+        raw = os.getenv("ACTIVITY_THREAD_POOL_SIZE")
+        return int(raw) if raw else None
+
+    @property
+    def activity_process_pool_size(self) -> int:
+        """
+        Processes for CPU_BOUND offloads; 0 runs them on the thread pool instead.
+        Example Env: ACTIVITY_PROCESS_POOL_SIZE="4"
+        """
+        return int(os.getenv("ACTIVITY_PROCESS_POOL_SIZE", "0"))
+
+    @property
+    def workflow_sandbox(self) -> str:
+        """
+        "tuned" passes domain SDK packages and known-deterministic deps through the
+        workflow sandbox; "default" uses the SDK's stock sandbox.
+        Example Env: WORKFLOW_SANDBOX="default"
+        """
+        return os.getenv("WORKFLOW_SANDBOX", "tuned").strip().lower()
+
+    @property
+    def workflow_sandbox_passthrough(self) -> list[str]:
+        """
+        Extra modules to pass through the workflow sandbox.
+        Example Env: WORKFLOW_SANDBOX_PASSTHROUGH="app.common.money,dateutil"
+        """
+        raw = os.getenv("WORKFLOW_SANDBOX_PASSTHROUGH", "")
+        return [m.strip() for m in raw.split(",") if m.strip()]
+
+    @property
+    def metrics_bind_address(self) -> Optional[str]:
+        """
+        Prometheus /metrics endpoint for SDK and app metrics; unset disables it.
+        In supervisor mode each child adds its process index to the port.
+        Example Env: METRICS_BIND_ADDRESS="0.0.0.0:9464"
+        """
+        raw = os.getenv("METRICS_BIND_ADDRESS")
+        if not raw:
+            return None
+        index = int(os.getenv("WORKER_PROCESS_INDEX", "0"))
+        host, _, port = raw.rpartition(":")
+        return f"{host}:{int(port) + index}"
+
+    @property
+    def otel_metrics_url(self) -> Optional[str]:
+        """
+        OpenTelemetry collector (OTLP/gRPC) URL, used when METRICS_BIND_ADDRESS is unset.
+        Example Env: OTEL_METRICS_URL="http://otel-collector:4317"
+        """
+        return os.getenv("OTEL_METRICS_URL")
+
+    @property
+    def loop_watchdog(self) -> bool:
+        """
+        Enable the event loop lag watchdog (see loop_watchdog.py).
+        Example Env: LOOP_WATCHDOG="true"
+        """
+        return os.getenv("LOOP_WATCHDOG", "false").lower() in ("1", "true", "yes")
+
+    @property
+    def loop_watchdog_threshold_ms(self) -> float:
+        """
+        Loop stalls longer than this are captured and reported.
+        Example Env: LOOP_WATCHDOG_THRESHOLD_MS="100"
+        """
+        return float(os.getenv("LOOP_WATCHDOG_THRESHOLD_MS", "100"))
+
+    @property
+    def loop_watchdog_log_interval_seconds(self) -> float:
+        """
+        Minimum interval between two "top blocking sites" reports.
+        Example Env: LOOP_WATCHDOG_LOG_INTERVAL_SECONDS="60"
+        """
+        return float(os.getenv("LOOP_WATCHDOG_LOG_INTERVAL_SECONDS", "60"))
+
+    @property
+    def profiler(self) -> bool:
+        """
+        Enable on-demand profiling (SIGUSR1 CPU sampling, SIGUSR2 tracemalloc diff; see profiler.py).
+        Example Env: PROFILER="true"
+        """
+        return os.getenv("PROFILER", "false").lower() in ("1", "true", "yes")
+
+    @property
+    def profiler_port(self) -> Optional[int]:
+        """
+        Local (127.0.0.1) HTTP trigger port for the profiler; unset disables it.
+        In supervisor mode each child adds its process index to the port.
+        Example Env: PROFILER_PORT="6060"
+        """
+        raw = os.getenv("PROFILER_PORT")
+        if not raw:
+            return None
+        return int(raw) + int(os.getenv("WORKER_PROCESS_INDEX", "0"))
+
+    @property
+    def profiler_output_dir(self) -> str:
+        """
+        Directory for folded CPU stacks and memory diffs.
+        Example Env: PROFILER_OUTPUT_DIR="/var/tmp/worker-profiles"
+        """
+        return os.getenv("PROFILER_OUTPUT_DIR", "/tmp/worker-profiles")
+
+    @property
+    def profiler_cpu_seconds(self) -> float:
+        """
+        Duration of a signal-triggered CPU profile.
+        Example Env: PROFILER_CPU_SECONDS="30"
+        """
+        return float(os.getenv("PROFILER_CPU_SECONDS", "30"))
+
+    @property
+    def profiler_sample_interval_ms(self) -> float:
+        """
+        CPU sampling interval.
+        Example Env: PROFILER_SAMPLE_INTERVAL_MS="10"
+        """
+        return float(os.getenv("PROFILER_SAMPLE_INTERVAL_MS", "10"))
+
+    @property
+    def worker_control_port(self) -> Optional[int]:
+        """
+        Local (127.0.0.1) control port to start/drain/reload single task queues (see control.py); unset disables it.
+        In supervisor mode each child adds its process index to the port.
+        Example Env: WORKER_CONTROL_PORT="7070"
+        """
+        raw = os.getenv("WORKER_CONTROL_PORT")
+        if not raw:
+            return None
+        return int(raw) + int(os.getenv("WORKER_PROCESS_INDEX", "0"))
+
+    @property
+    def rate_limit_serve(self) -> Optional[str]:
+        """
+        Address (host:port or unix socket path) where the supervisor serves shared token buckets;
+        children default to RATE_LIMIT_BACKEND=socket against it. Unset disables it.
+        Example Env: RATE_LIMIT_SERVE="/tmp/worker-rate-limit.sock"
+        """
+        return os.getenv("RATE_LIMIT_SERVE") or None
+
 config = WorkerConfig()
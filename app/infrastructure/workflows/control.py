@@ -0,0 +1,127 @@
+"""
+Worker Control - 运行中 Worker 进程的本地控制端点
+
+修改 ENABLE_DOMAINS 或发布新 domain 不再需要重启整个 worker 进程：
+控制端点（WORKER_CONTROL_PORT，仅监听 127.0.0.1）对单个 task_queue 的 Worker
+做启动、优雅 drain 和热重载，其他队列的 Worker 与 sticky cache 不受影响。
+
+  GET    /queues                  各队列状态（是否运行、domains、workflows）
+  POST   /queues/<queue>/start    启动队列的 Worker
+  POST   /queues/<queue>/drain    优雅停止队列的 Worker（等待进行中的 activity）
+  POST   /queues/<queue>/reload   重新导入队列的 domains，drain 旧 Worker 后启动新 Worker
+  POST   /domains/<module path>   新增 domain（已存在时重载）
+  DELETE /domains/<module path>   移除 domain
+
+命令行：python -m app.infrastructure.workflows.control reload pizza-task-queue
+"""
+
+import argparse
+import asyncio
+import json
+import traceback
+import urllib.error
+import urllib.request
+from typing import TYPE_CHECKING, Optional, Tuple
+
+from app.infrastructure.workflows.config import config
+
+if TYPE_CHECKING:
+    from app.infrastructure.workflows.worker import WorkerPool
+
+
+class ControlServer:
+    """Local HTTP control path for a running WorkerPool."""
+
+    def __init__(self, pool: "WorkerPool"):
+        self.pool = pool
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self, port: int) -> None:
+        self._server = await asyncio.start_server(self._serve, "127.0.0.1", port)
+        print(f"Worker control endpoint on http://127.0.0.1:{port} (GET /queues)")
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def handle(self, method: str, path: str) -> Tuple[int, dict]:
+        parts = [p for p in path.split("/") if p]
+        if method == "GET" and parts == ["queues"]:
+            return 200, self.pool.status()
+        if method == "POST" and len(parts) == 3 and parts[0] == "queues":
+            _, queue, action = parts
+            if action == "start":
+                started = await self.pool.start_queue(queue)
+                return (200 if started else 404), {"queue": queue, "running": started}
+            if action == "drain":
+                await self.pool.drain_queue(queue)
+                return 200, {"queue": queue, "running": False}
+            if action == "reload":
+                running = await self.pool.reload_queue(queue)
+                return 200, {"queue": queue, "running": running}
+        if len(parts) == 2 and parts[0] == "domains":
+            if method == "POST":
+                queue = await self.pool.add_domain(parts[1])
+                return 200, {"domain": parts[1], "queue": queue}
+            if method == "DELETE":
+                queue = await self.pool.remove_domain(parts[1])
+                return 200, {"domain": parts[1], "queue": queue}
+        return 404, {"error": f"unknown control path: {method} {path}"}
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """极简 HTTP 处理：只读取请求行，忽略请求体"""
+        try:
+            request_line = (await reader.readuntil(b"\r\n\r\n")).split(b"\r\n", 1)[0].decode("ascii")
+            method, path = request_line.split(" ")[:2]
+            try:
+                status, result = await self.handle(method, path)
+            except KeyError as e:
+                status, result = 404, {"error": f"not found: {e}"}
+            except Exception as e:
+                traceback.print_exc()
+                status, result = 500, {"error": str(e)}
+            body = json.dumps(result).encode("utf-8")
+            reason = {200: "OK", 404: "Not Found", 500: "Internal Server Error"}[status]
+            writer.write(
+                f"HTTP/1.1 {status} {reason}\r\nContent-Type: application/json\r\n"
+                f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode("ascii") + body
+            )
+            await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Control a running worker process")
+    parser.add_argument("action", choices=["status", "start", "drain", "reload", "add-domain", "remove-domain"])
+    parser.add_argument("target", nargs="?", help="task queue or domain module path")
+    parser.add_argument("--port", type=int, default=config.worker_control_port, help="WORKER_CONTROL_PORT of the target process")
+    args = parser.parse_args()
+
+    if args.port is None:
+        parser.error("--port or WORKER_CONTROL_PORT is required")
+    if args.action != "status" and not args.target:
+        parser.error(f"'{args.action}' requires a target")
+
+    method, path = {
+        "status": ("GET", "/queues"),
+        "start": ("POST", f"/queues/{args.target}/start"),
+        "drain": ("POST", f"/queues/{args.target}/drain"),
+        "reload": ("POST", f"/queues/{args.target}/reload"),
+        "add-domain": ("POST", f"/domains/{args.target}"),
+        "remove-domain": ("DELETE", f"/domains/{args.target}"),
+    }[args.action]
+    request = urllib.request.Request(f"http://127.0.0.1:{args.port}{path}", method=method)
+    try:
+        with urllib.request.urlopen(request) as response:
+            print(json.dumps(json.loads(response.read()), indent=2, ensure_ascii=False))
+    except urllib.error.HTTPError as e:
+        print(json.dumps(json.loads(e.read()), indent=2, ensure_ascii=False))
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
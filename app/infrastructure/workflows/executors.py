@@ -0,0 +1,91 @@
+"""
+Activity Executors - 把同步/CPU 密集的调用移出事件循环
+
+Worker 进程中所有 async activity 共享一个事件循环，同步的 usecase（如计算账单）
+直接在 activity 中调用会阻塞其他 activity 和 poller。Domain 的组装函数通过 offloader(kind)
+把对应性质的执行函数注入 Gateway，由 worker 创建的执行器执行：
+
+- BLOCKING: 阻塞 I/O 或释放 GIL 的调用 -> 线程池（同时作为 Worker 的 activity_executor）
+- CPU_BOUND: 纯 Python 计算 -> 进程池（ACTIVITY_PROCESS_POOL_SIZE > 0 时），否则退回线程池
+
+进程池使用 spawn 启动（Temporal Runtime 不支持 fork），提交的可调用对象及参数必须可 pickle，
+例如无状态 usecase 的绑定方法 + Pydantic DTO。
+"""
+
+import asyncio
+import functools
+import multiprocessing
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Optional, TypeVar
+
+from app.infrastructure.workflows.config import config
+
+T = TypeVar("T")
+
+BLOCKING = "blocking"
+CPU_BOUND = "cpu"
+
+
+class ActivityExecutors:
+    """Worker 进程内共享的线程池与（可选的）进程池"""
+
+    def __init__(self, thread_pool_size: Optional[int] = None, process_pool_size: int = 0):
+        # 与 ThreadPoolExecutor 的默认值一致，显式记录以便日志与调优
+        self.thread_pool_size = thread_pool_size or min(32, (os.cpu_count() or 1) + 4)
+        self.process_pool_size = process_pool_size
+        self.thread_pool = ThreadPoolExecutor(
+            max_workers=self.thread_pool_size, thread_name_prefix="activity"
+        )
+        self.process_pool: Optional[ProcessPoolExecutor] = None
+        if process_pool_size > 0:
+            self.process_pool = ProcessPoolExecutor(
+                max_workers=process_pool_size, mp_context=multiprocessing.get_context("spawn")
+            )
+
+    def executor_for(self, kind: str) -> Executor:
+        if kind == CPU_BOUND and self.process_pool is not None:
+            return self.process_pool
+        if kind in (BLOCKING, CPU_BOUND):
+            return self.thread_pool
+        raise ValueError(f"Unknown offload kind '{kind}' (expected '{BLOCKING}' or '{CPU_BOUND}')")
+
+    def shutdown(self) -> None:
+        self.thread_pool.shutdown(wait=True)
+        if self.process_pool is not None:
+            self.process_pool.shutdown(wait=True)
+
+
+_executors: Optional[ActivityExecutors] = None
+
+
+def create_activity_executors() -> ActivityExecutors:
+    """根据 WorkerConfig 创建执行器并设为进程内共享实例（worker 启动时调用）"""
+    global _executors
+    _executors = ActivityExecutors(
+        thread_pool_size=config.activity_thread_pool_size,
+        process_pool_size=config.activity_process_pool_size,
+    )
+    print(
+        f"Activity executors: thread pool={_executors.thread_pool_size}, "
+        f"process pool={_executors.process_pool_size or 'disabled'}"
+    )
+    return _executors
+
+
+async def run_offloaded(kind: str, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """
+    在 kind 对应的执行器中运行同步调用，不阻塞事件循环。
+
+    未创建执行器时（例如脚本或单元测试中直接调用 gateway），使用事件循环的默认线程池。
+    """
+    call = functools.partial(fn, *args, **kwargs)
+    executor = _executors.executor_for(kind) if _executors is not None else None
+    return await asyncio.get_running_loop().run_in_executor(executor, call)
+
+
+def offloader(kind: str) -> Callable[..., Awaitable[Any]]:
+    """返回 offload(fn, *args) 形式的函数，供 Domain 组装时注入 Gateway（调用时才查找执行器）"""
+    if kind not in (BLOCKING, CPU_BOUND):
+        raise ValueError(f"Unknown offload kind '{kind}' (expected '{BLOCKING}' or '{CPU_BOUND}')")
+    return functools.partial(run_offloaded, kind)
@@ -0,0 +1,122 @@
+"""
+Converter Instrumentation - PayloadConverter 的可选埋点包装
+
+按 模型类 + 编码 记录：
+- temporal_converter_encode_latency / temporal_converter_decode_latency (ms)
+- temporal_converter_payload_size (bytes)
+
+指标通过 Temporal Runtime 的 metric meter 上报，与 SDK 自身指标走同一个出口
+（Prometheus / OpenTelemetry 由 Runtime 的 TelemetryConfig 决定）。
+通过 WorkerConfig.converter_metrics (CONVERTER_METRICS=true) 开启。
+"""
+
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Type
+
+from temporalio.api.common.v1 import Payload
+from temporalio.common import MetricHistogram, MetricHistogramFloat, MetricMeter
+from temporalio.converter import PayloadConverter
+from temporalio.runtime import Runtime
+
+from app.infrastructure.workflows.type_registry import METADATA_TYPE
+
+
+class _ConverterMetrics:
+    """按 (方向, 模型, 编码) 缓存带属性的 histogram，避免每次记录都重新构建属性集"""
+
+    def __init__(self, meter: MetricMeter):
+        self._encode_latency = meter.create_histogram_float(
+            "temporal_converter_encode_latency", "Time to convert a value to a payload", "ms"
+        )
+        self._decode_latency = meter.create_histogram_float(
+            "temporal_converter_decode_latency", "Time to convert a payload to a value", "ms"
+        )
+        self._payload_size = meter.create_histogram(
+            "temporal_converter_payload_size", "Size of converted payload data", "bytes"
+        )
+        self._bound: Dict[Tuple[str, str, str], Tuple[MetricHistogramFloat, MetricHistogram]] = {}
+
+    def _get(self, direction: str, model: str, encoding: str) -> Tuple[MetricHistogramFloat, MetricHistogram]:
+        key = (direction, model, encoding)
+        bound = self._bound.get(key)
+        if bound is None:
+            attributes = {"model": model, "encoding": encoding}
+            latency = self._encode_latency if direction == "encode" else self._decode_latency
+            bound = (
+                latency.with_additional_attributes(attributes),
+                self._payload_size.with_additional_attributes({**attributes, "direction": direction}),
+            )
+            self._bound[key] = bound
+        return bound
+
+    def record(self, direction: str, model: str, encoding: str, elapsed_ms: float, size: int) -> None:
+        latency, payload_size = self._get(direction, model, encoding)
+        latency.record(elapsed_ms)
+        payload_size.record(size)
+
+
+_metrics: Optional[_ConverterMetrics] = None
+
+
+def _get_metrics() -> _ConverterMetrics:
+    # 延迟到首次记录时才获取 Runtime，保证 worker 已经设置好带 telemetry 的默认 Runtime
+    global _metrics
+    if _metrics is None:
+        _metrics = _ConverterMetrics(Runtime.default().metric_meter)
+    return _metrics
+
+
+def _model_name_for_value(value: Any) -> str:
+    if isinstance(value, (list, tuple)) and value:
+        return f"list[{type(value[0]).__name__}]"
+    return type(value).__name__
+
+
+def _model_name_for_payload(payload: Payload, type_hint: Optional[Type]) -> str:
+    type_id = payload.metadata.get(METADATA_TYPE)
+    if type_id:
+        # "app.domains.pizza.sdk.contracts.PizzaOrder" -> "PizzaOrder"
+        type_id = type_id.decode("utf-8")
+        if type_id.startswith("list[") and type_id.endswith("]"):
+            return f"list[{type_id[5:-1].rsplit('.', 1)[-1]}]"
+        return type_id.rsplit(".", 1)[-1]
+    if type_hint is not None:
+        return getattr(type_hint, "__name__", str(type_hint))
+    return "unknown"
+
+
+class InstrumentedPayloadConverter(PayloadConverter):
+    """
+    Wraps a PayloadConverter and records per-model, per-encoding latency and size histograms.
+
+    Values are converted one at a time so each gets its own timing; the wrapped
+    composite converter already handles values serially, so behaviour is unchanged.
+    """
+
+    def __init__(self, inner: PayloadConverter):
+        self.inner = inner
+
+    def to_payloads(self, values: Sequence[Any]) -> List[Payload]:
+        metrics = _get_metrics()
+        payloads = []
+        for value in values:
+            start = time.perf_counter()
+            payload = self.inner.to_payloads([value])[0]
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            encoding = payload.metadata.get("encoding", b"unknown").decode("utf-8")
+            metrics.record("encode", _model_name_for_value(value), encoding, elapsed_ms, len(payload.data))
+            payloads.append(payload)
+        return payloads
+
+    def from_payloads(self, payloads: Sequence[Payload], type_hints: Optional[List[Type]] = None) -> List[Any]:
+        metrics = _get_metrics()
+        values = []
+        for index, payload in enumerate(payloads):
+            type_hint = type_hints[index] if type_hints and len(type_hints) > index else None
+            start = time.perf_counter()
+            value = self.inner.from_payloads([payload], [type_hint] if type_hint is not None else None)[0]
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            encoding = payload.metadata.get("encoding", b"unknown").decode("utf-8")
+            metrics.record("decode", _model_name_for_payload(payload, type_hint), encoding, elapsed_ms, len(payload.data))
+            values.append(value)
+        return values
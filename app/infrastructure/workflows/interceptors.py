@@ -0,0 +1,88 @@
+"""
+Worker Interceptors
+
+ActivityMetricsInterceptor: 为每个 activity 记录执行耗时与结果计数，
+按 domain / task_queue / activity_type / outcome 打标签，通过共享 Runtime 的 metric meter
+与 SDK 指标一起从 /metrics 暴露。
+"""
+
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from temporalio import activity
+from temporalio.common import MetricCounter, MetricHistogramFloat, MetricMeter
+from temporalio.worker import (
+    ActivityInboundInterceptor,
+    ExecuteActivityInput,
+    Interceptor,
+)
+
+
+class _ActivityMetrics:
+    def __init__(self, meter: MetricMeter):
+        self._duration = meter.create_histogram_float(
+            "app_activity_duration", "Activity execution time including usecase and provider calls", "ms"
+        )
+        self._executions = meter.create_counter(
+            "app_activity_executions", "Activity executions by outcome"
+        )
+        self._bound: Dict[Tuple[str, str, str, str], Tuple[MetricHistogramFloat, MetricCounter]] = {}
+
+    def record(self, domain: str, task_queue: str, activity_type: str, outcome: str, elapsed_ms: float) -> None:
+        key = (domain, task_queue, activity_type, outcome)
+        bound = self._bound.get(key)
+        if bound is None:
+            attributes = {
+                "domain": domain,
+                "task_queue": task_queue,
+                "activity_type": activity_type,
+                "outcome": outcome,
+            }
+            bound = (
+                self._duration.with_additional_attributes(attributes),
+                self._executions.with_additional_attributes(attributes),
+            )
+            self._bound[key] = bound
+        duration, executions = bound
+        duration.record(elapsed_ms)
+        executions.add(1)
+
+
+class _ActivityMetricsInbound(ActivityInboundInterceptor):
+    def __init__(self, next: ActivityInboundInterceptor, root: "ActivityMetricsInterceptor"):
+        super().__init__(next)
+        self._root = root
+
+    async def execute_activity(self, input: ExecuteActivityInput) -> Any:
+        info = activity.info()
+        domain = self._root.domain_by_activity.get(info.activity_type, "unknown")
+        start = time.perf_counter()
+        outcome = "failed"
+        try:
+            result = await super().execute_activity(input)
+            outcome = "completed"
+            return result
+        except BaseException:
+            if activity.is_cancelled():
+                outcome = "cancelled"
+            raise
+        finally:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            self._root.metrics.record(domain, info.task_queue, info.activity_type, outcome, elapsed_ms)
+
+
+class ActivityMetricsInterceptor(Interceptor):
+    """Records per-activity duration histograms and outcome counters."""
+
+    def __init__(self, meter: MetricMeter, domain_by_activity: Optional[Dict[str, str]] = None):
+        """
+        Args:
+            meter: 共享 Runtime 的 metric meter
+            domain_by_activity: activity 名称 -> domain 名称（用于 domain 标签），按引用持有，调用方可以后续原地更新
+        """
+        self.metrics = _ActivityMetrics(meter)
+        # 保留调用方传入的同一个 dict（即使为空）：Worker 构建 interceptor 后才原地填充映射
+        self.domain_by_activity = domain_by_activity if domain_by_activity is not None else {}
+
+    def intercept_activity(self, next: ActivityInboundInterceptor) -> ActivityInboundInterceptor:
+        return _ActivityMetricsInbound(next, self)
@@ -0,0 +1,194 @@
+"""
+Event Loop Watchdog - 检测阻塞 Worker 事件循环的同步调用
+
+Worker 进程中所有 async activity 与 poller 共享一个事件循环，任何一次同步阻塞
+（CPU 计算、同步 I/O、大量 print）都会拖慢整个进程。Watchdog 由两部分组成：
+
+- 事件循环内的心跳任务：每 interval 醒来一次，实际间隔与预期间隔之差即 loop lag，
+  记录到 app_event_loop_lag 直方图（ms）。
+- 后台监控线程：心跳超过 threshold 未更新时，抓取事件循环线程当前的 Python 栈
+  （协程运行时其帧就在该线程栈上），以及当前运行的 asyncio Task 名称。
+
+每次卡顿按调用点（栈中最内层的项目代码帧）聚合次数与阻塞时长，
+最多每 log_interval 秒打印一次 Top N 阻塞调用点，避免刷屏。
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+import traceback
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from temporalio.common import MetricMeter
+
+# 项目根目录（包含 app/ 的目录），用于在栈中定位项目自身的调用点
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+# 事件循环自身的帧（run_forever/_run_once/Handle._run）对定位阻塞点没有帮助
+_ASYNCIO_DIR = os.path.dirname(asyncio.__file__)
+
+
+@dataclass
+class BlockingSite:
+    """一个阻塞调用点的聚合统计"""
+
+    site: str
+    task_name: str
+    stack: List[str]
+    count: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+
+
+def _blocking_site(frames: List[traceback.FrameSummary]) -> str:
+    """优先取最内层的项目代码帧，全部是第三方/标准库时取最内层帧"""
+    for frame in reversed(frames):
+        if frame.filename.startswith(_PROJECT_ROOT) and __file__ != frame.filename:
+            return f"{os.path.relpath(frame.filename, _PROJECT_ROOT)}:{frame.lineno} in {frame.name}"
+    frame = frames[-1]
+    return f"{frame.filename}:{frame.lineno} in {frame.name}"
+
+
+class LoopLagWatchdog:
+    """Measures event loop lag and captures the stack of whatever is blocking it."""
+
+    def __init__(
+        self,
+        meter: Optional[MetricMeter] = None,
+        threshold_ms: float = 100.0,
+        interval_ms: float = 50.0,
+        log_interval_seconds: float = 60.0,
+        top_n: int = 5,
+    ):
+        """
+        Args:
+            meter: 共享 Runtime 的 metric meter，None 时只打印日志
+            threshold_ms: 心跳超过该时长未更新即视为阻塞并抓栈
+            interval_ms: 心跳间隔
+            log_interval_seconds: 两次 Top N 日志之间的最小间隔
+            top_n: 每次日志打印的调用点数量
+        """
+        self.threshold = threshold_ms / 1000
+        self.interval = interval_ms / 1000
+        self.log_interval = log_interval_seconds
+        self.top_n = top_n
+        self._lag_histogram = (
+            meter.create_histogram_float(
+                "app_event_loop_lag", "Delay between scheduled and actual event loop wake-ups", "ms"
+            )
+            if meter is not None
+            else None
+        )
+        self._stall_counter = (
+            meter.create_counter("app_event_loop_stalls", "Event loop stalls longer than the watchdog threshold")
+            if meter is not None
+            else None
+        )
+
+        self.sites: Dict[str, BlockingSite] = {}
+        # 监控线程抓到、等待心跳任务结算阻塞时长的调用点
+        self._pending: Optional[BlockingSite] = None
+        self._stalls_since_log = 0
+        self._last_log = time.monotonic()
+        self._heartbeat = time.monotonic()
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+
+    def start(self) -> None:
+        """在事件循环内调用：启动心跳任务与监控线程"""
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        self._stopped.clear()
+        self._task = self._loop.create_task(self._beat(), name="loop-lag-watchdog")
+        self._thread = threading.Thread(target=self._monitor, name="loop-lag-watchdog", daemon=True)
+        self._thread.start()
+        print(
+            f"Loop watchdog: threshold {self.threshold * 1000:.0f}ms, "
+            f"logging top {self.top_n} blocking sites at most every {self.log_interval:.0f}s"
+        )
+
+    async def stop(self) -> None:
+        self._stopped.set()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        if self._thread is not None:
+            self._thread.join(timeout=1)
+        self._log_top(force=True)
+
+    async def _beat(self) -> None:
+        while True:
+            expected = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            lag_ms = max(0.0, now - expected) * 1000
+            with self._lock:
+                self._heartbeat = now
+                stall, self._pending = self._pending, None
+            if self._lag_histogram is not None:
+                self._lag_histogram.record(lag_ms)
+            if stall is not None:
+                # 卡顿期间抓到的调用点，按本次心跳观测到的 lag 结算阻塞时长
+                stall.total_ms += lag_ms
+                stall.max_ms = max(stall.max_ms, lag_ms)
+            self._log_top()
+
+    def _monitor(self) -> None:
+        check_every = min(self.threshold / 2, self.interval)
+        captured_for = None
+        while not self._stopped.wait(check_every):
+            with self._lock:
+                heartbeat = self._heartbeat
+            if time.monotonic() - heartbeat < self.threshold + self.interval or heartbeat == captured_for:
+                continue
+            # 同一次卡顿只抓一次栈
+            captured_for = heartbeat
+            self._capture()
+
+    def _capture(self) -> None:
+        frame = sys._current_frames().get(self._loop_thread_id)
+        if frame is None:
+            return
+        frames = [f for f in traceback.extract_stack(frame) if not f.filename.startswith(_ASYNCIO_DIR)]
+        if not frames:
+            return
+        task = asyncio.current_task(self._loop)
+        task_name = task.get_name() if task is not None else "<loop callback>"
+        key = _blocking_site(frames)
+        with self._lock:
+            site = self.sites.get(key)
+            if site is None:
+                site = BlockingSite(site=key, task_name=task_name, stack=traceback.format_list(frames[-8:]))
+                self.sites[key] = site
+            site.count += 1
+            self._stalls_since_log += 1
+            self._pending = site
+        if self._stall_counter is not None:
+            self._stall_counter.add(1)
+
+    def _log_top(self, force: bool = False) -> None:
+        now = time.monotonic()
+        if not self._stalls_since_log or (not force and now - self._last_log < self.log_interval):
+            return
+        with self._lock:
+            stalls, self._stalls_since_log = self._stalls_since_log, 0
+            top = sorted(self.sites.values(), key=lambda s: s.total_ms, reverse=True)[: self.top_n]
+        self._last_log = now
+        print(f"[LOOP WATCHDOG] {stalls} event loop stall(s) >= {self.threshold * 1000:.0f}ms since last report")
+        for rank, site in enumerate(top, 1):
+            print(
+                f"  #{rank} {site.site} (task {site.task_name}): "
+                f"{site.count} stalls, total {site.total_ms:.0f}ms, max {site.max_ms:.0f}ms"
+            )
+            if rank == 1:
+                print("".join(site.stack).rstrip())
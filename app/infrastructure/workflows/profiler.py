@@ -0,0 +1,278 @@
+"""
+Worker Profiler - 运行中 Worker 的按需 CPU 采样与内存快照
+
+生产环境 Worker 变慢时无需重启即可查看进程内部：
+
+- CPU：采样线程按固定间隔读取所有 Python 线程的当前栈，持续 N 秒后输出
+  folded stacks（每行 `frame;frame;... count`），可直接交给 flamegraph.pl / speedscope / inferno。
+  栈中包含已注册 activity 的函数帧时，以 `activity:<name>` 作为根节点，火焰图按 activity 分组。
+- 内存：首次触发时启动 tracemalloc 并记录基线快照，之后每次触发与上一次快照做 diff，
+  按 activity 汇总新增分配（traceback 中命中 activity 函数所在的源码行范围）。
+  快照与 diff 在线程中执行，不阻塞事件循环上的 activity 和 poller。
+
+触发方式：
+- 信号：SIGUSR1 -> CPU 采样（PROFILER_CPU_SECONDS 秒），SIGUSR2 -> 内存快照/diff
+- 本地 HTTP（PROFILER_PORT，仅监听 127.0.0.1）：GET /cpu?seconds=N、GET /memory，返回 JSON 摘要
+
+输出文件写入 PROFILER_OUTPUT_DIR（cpu-<pid>-<ts>.folded / memory-<pid>-<ts>.txt）。
+"""
+
+import asyncio
+import json
+import os
+import signal
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter, defaultdict
+from types import CodeType
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Set, Tuple
+from urllib.parse import parse_qs, urlparse
+
+from temporalio import activity
+
+# 采样时视为空闲的叶子帧（等待 I/O / 锁 / 队列），不计入 CPU profile
+_IDLE_LEAVES = {
+    ("selectors.py", "select"),
+    ("threading.py", "wait"),
+    ("queue.py", "get"),
+    ("thread.py", "_worker"),
+}
+_TRACEMALLOC_FRAMES = 25
+
+
+def _activity_name(fn: Callable) -> str:
+    definition = activity._Definition.from_callable(fn)
+    return definition.name if definition and definition.name else fn.__name__
+
+
+def _code_of(fn: Callable) -> Optional[CodeType]:
+    fn = getattr(fn, "__func__", fn)
+    return getattr(fn, "__code__", None)
+
+
+class WorkerProfiler:
+    """On-demand CPU sampling profiler and tracemalloc diffs, attributed to activities."""
+
+    def __init__(
+        self,
+        activities: Iterable[Callable],
+        output_dir: str,
+        sample_interval_ms: float = 10.0,
+        default_cpu_seconds: float = 30.0,
+    ):
+        """
+        Args:
+            activities: Worker 注册的 activity 函数（用于把栈帧/分配归属到 activity 名称）
+            output_dir: profile 输出目录
+            sample_interval_ms: CPU 采样间隔
+            default_cpu_seconds: 信号触发 CPU 采样时的持续时间
+        """
+        self.output_dir = output_dir
+        self.sample_interval = sample_interval_ms / 1000
+        self.default_cpu_seconds = default_cpu_seconds
+
+        # CPU 采样用 code 对象匹配；tracemalloc 只有文件名+行号，用源码行范围匹配
+        self._activity_by_code: Dict[CodeType, str] = {}
+        self._activity_lines: Dict[str, List[Tuple[int, int, str]]] = defaultdict(list)
+        for fn in activities:
+            code = _code_of(fn)
+            if code is None:
+                continue
+            name = _activity_name(fn)
+            self._activity_by_code[code] = name
+            lines = [line for _, _, line in code.co_lines() if line is not None]
+            self._activity_lines[code.co_filename].append((min(lines), max(lines), name))
+
+        self._cpu_lock = asyncio.Lock()
+        self._memory_lock = asyncio.Lock()
+        self._last_snapshot: Optional[tracemalloc.Snapshot] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        # 信号触发的任务：事件循环只持有弱引用，需要保留引用直到完成
+        self._tasks: Set[asyncio.Task] = set()
+
+    # ------------------------------------------------------------------
+    # CPU
+    # ------------------------------------------------------------------
+    async def profile_cpu(self, seconds: Optional[float] = None) -> dict:
+        """采样 seconds 秒并写出 folded stacks；同一时间只允许一个 CPU profile"""
+        seconds = seconds or self.default_cpu_seconds
+        if self._cpu_lock.locked():
+            return {"error": "cpu profile already running"}
+        async with self._cpu_lock:
+            stop = threading.Event()
+            stacks: Counter = Counter()
+            sampler = threading.Thread(target=self._sample, args=(stop, stacks), name="profiler-sampler", daemon=True)
+            print(f"[PROFILER] CPU sampling for {seconds:.0f}s every {self.sample_interval * 1000:.0f}ms...")
+            sampler.start()
+            try:
+                await asyncio.sleep(seconds)
+            finally:
+                stop.set()
+                await asyncio.to_thread(sampler.join)
+
+            path = self._output_path("cpu", "folded")
+            with open(path, "w", encoding="utf-8") as f:
+                for stack, count in stacks.most_common():
+                    f.write(f"{stack} {count}\n")
+
+            by_root: Counter = Counter()
+            for stack, count in stacks.items():
+                by_root[stack.split(";", 1)[0]] += count
+            total = sum(stacks.values())
+            summary = {
+                "path": path,
+                "samples": total,
+                "top": [{"root": root, "samples": n, "share": round(n / total, 3)} for root, n in by_root.most_common(10)],
+            }
+            print(f"[PROFILER] CPU profile written to {path} ({total} samples)")
+            return summary
+
+    def _sample(self, stop: threading.Event, stacks: Counter) -> None:
+        me = threading.get_ident()
+        while not stop.wait(self.sample_interval):
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == me:
+                    continue
+                folded = self._fold(frame, names.get(thread_id, str(thread_id)))
+                if folded is not None:
+                    stacks[folded] += 1
+
+    def _fold(self, frame, thread_name: str) -> Optional[str]:
+        leaf = frame.f_code
+        if (os.path.basename(leaf.co_filename), leaf.co_name) in _IDLE_LEAVES:
+            return None
+        parts = []
+        root = f"thread:{thread_name}"
+        while frame is not None:
+            code = frame.f_code
+            name = self._activity_by_code.get(code)
+            if name is not None:
+                root = f"activity:{name}"
+            parts.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+            frame = frame.f_back
+        parts.append(root)
+        return ";".join(reversed(parts))
+
+    # ------------------------------------------------------------------
+    # Memory
+    # ------------------------------------------------------------------
+    async def snapshot_memory(self, top: int = 30) -> dict:
+        """首次调用启动 tracemalloc；之后与上一次快照 diff，并按 activity 汇总新增分配"""
+        # 快照与 diff 可能耗时数百毫秒，放到线程中执行；同一时间只做一次，保证 diff 的基线有序
+        async with self._memory_lock:
+            return await asyncio.to_thread(self._snapshot_memory, top)
+
+    def _snapshot_memory(self, top: int) -> dict:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(_TRACEMALLOC_FRAMES)
+            self._last_snapshot = self._take_snapshot()
+            print("[PROFILER] tracemalloc started, trigger again to diff against this baseline")
+            return {"status": "tracing started"}
+
+        snapshot = self._take_snapshot()
+        stats = snapshot.compare_to(self._last_snapshot, "traceback")
+        self._last_snapshot = snapshot
+
+        by_activity: Dict[str, List[int]] = defaultdict(lambda: [0, 0])
+        for stat in stats:
+            name = self._attribute(stat.traceback)
+            by_activity[name][0] += stat.size_diff
+            by_activity[name][1] += stat.count_diff
+
+        current, peak = tracemalloc.get_traced_memory()
+        path = self._output_path("memory", "txt")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(f"traced current={current} peak={peak}\n\n# size_diff by activity\n")
+            for name, (size, count) in sorted(by_activity.items(), key=lambda kv: kv[1][0], reverse=True):
+                f.write(f"{name}\t{size:+d} B\t{count:+d} blocks\n")
+            f.write(f"\n# top {top} allocation sites\n")
+            for stat in stats[:top]:
+                f.write(f"\n[{self._attribute(stat.traceback)}] {stat}\n")
+                f.write("\n".join(stat.traceback.format(limit=8)) + "\n")
+
+        summary = {
+            "path": path,
+            "traced_bytes": current,
+            "peak_bytes": peak,
+            "by_activity": {name: {"size_diff": s, "count_diff": c} for name, (s, c) in by_activity.items()},
+        }
+        print(f"[PROFILER] Memory diff written to {path} (traced {current / 1024:.0f} KiB)")
+        return summary
+
+    def _take_snapshot(self) -> tracemalloc.Snapshot:
+        return tracemalloc.take_snapshot().filter_traces(
+            (
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+            )
+        )
+
+    def _attribute(self, traceback: tracemalloc.Traceback) -> str:
+        for frame in traceback:
+            for first, last, name in self._activity_lines.get(frame.filename, ()):
+                if first <= frame.lineno <= last:
+                    return name
+        return "<outside activities>"
+
+    # ------------------------------------------------------------------
+    # Triggers
+    # ------------------------------------------------------------------
+    async def start(self, port: Optional[int] = None) -> None:
+        """注册 SIGUSR1/SIGUSR2，可选启动本地 HTTP 触发端点"""
+        loop = asyncio.get_running_loop()
+        try:
+            loop.add_signal_handler(signal.SIGUSR1, lambda: self._spawn(self.profile_cpu()))
+            loop.add_signal_handler(signal.SIGUSR2, lambda: self._spawn(self.snapshot_memory()))
+        except (NotImplementedError, RuntimeError, AttributeError):
+            pass  # 非主线程或不支持的平台，只能用 HTTP 触发
+        if port:
+            self._server = await asyncio.start_server(self._serve, "127.0.0.1", port)
+            print(f"[PROFILER] Trigger endpoint on http://127.0.0.1:{port} (GET /cpu?seconds=N, GET /memory)")
+        print(f"[PROFILER] kill -USR1 {os.getpid()} for a CPU profile, kill -USR2 {os.getpid()} for a memory diff")
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """极简 HTTP 处理：/cpu 与 /memory，其余路径返回 404"""
+        try:
+            request_line = (await reader.readuntil(b"\r\n\r\n")).split(b"\r\n", 1)[0].decode("ascii")
+            url = urlparse(request_line.split(" ")[1])
+            if url.path == "/cpu":
+                seconds = float(parse_qs(url.query).get("seconds", [self.default_cpu_seconds])[0])
+                status, result = "200 OK", await self.profile_cpu(seconds)
+            elif url.path == "/memory":
+                status, result = "200 OK", await self.snapshot_memory()
+            else:
+                status, result = "404 Not Found", {"error": "use /cpu?seconds=N or /memory"}
+            body = json.dumps(result).encode("utf-8")
+            writer.write(
+                f"HTTP/1.1 {status}\r\nContent-Type: application/json\r\n"
+                f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode("ascii") + body
+            )
+            await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError, IndexError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    def _spawn(self, coro: Awaitable[dict]) -> None:
+        task = asyncio.ensure_future(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def _output_path(self, kind: str, ext: str) -> str:
+        os.makedirs(self.output_dir, exist_ok=True)
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        return os.path.join(self.output_dir, f"{kind}-{os.getpid()}-{stamp}.{ext}")
@@ -0,0 +1,55 @@
+"""
+Temporal Runtime - 进程内共享的 Runtime
+
+Runtime 持有 Core 的线程池与 telemetry 配置，每创建一个都会新建线程池，
+所以 Client 与所有 Worker 应共享同一个 Runtime（同时设为默认 Runtime，
+让 converter instrumentation 等通过 Runtime.default() 拿到同一个 metric meter）。
+"""
+
+from typing import Optional, Union
+
+from temporalio.runtime import (
+    LoggingConfig,
+    OpenTelemetryConfig,
+    PrometheusConfig,
+    Runtime,
+    TelemetryConfig,
+    TelemetryFilter,
+)
+
+from app.infrastructure.workflows.config import config
+
+_runtime: Optional[Runtime] = None
+
+
+def _metrics_config() -> Optional[Union[PrometheusConfig, OpenTelemetryConfig]]:
+    """Prometheus 优先（本地 /metrics 拉取），否则推送到 OpenTelemetry collector，都未配置时不导出"""
+    if config.metrics_bind_address:
+        print(f"Metrics: Prometheus endpoint on http://{config.metrics_bind_address}/metrics")
+        return PrometheusConfig(bind_address=config.metrics_bind_address, durations_as_seconds=False)
+    if config.otel_metrics_url:
+        print(f"Metrics: exporting to OpenTelemetry collector {config.otel_metrics_url}")
+        return OpenTelemetryConfig(url=config.otel_metrics_url)
+    return None
+
+
+def create_runtime() -> Runtime:
+    """根据 WorkerConfig 构建 Runtime（Core 日志级别、metrics 导出、全局 metric tags）"""
+    return Runtime(
+        telemetry=TelemetryConfig(
+            logging=LoggingConfig(
+                filter=TelemetryFilter(core_level=config.core_log_level, other_level="ERROR"),
+            ),
+            metrics=_metrics_config(),
+            global_tags=config.metric_global_tags,
+        )
+    )
+
+
+def get_runtime() -> Runtime:
+    """进程内共享的 Runtime，首次调用时创建并设为默认 Runtime"""
+    global _runtime
+    if _runtime is None:
+        _runtime = create_runtime()
+        Runtime.set_default(_runtime, error_if_already_set=False)
+    return _runtime
@@ -0,0 +1,64 @@
+"""
+Workflow Sandbox - 调优后的 SandboxedWorkflowRunner
+
+默认 sandbox 会为每次 workflow 运行重新导入所有非 passthrough 模块。Workflow 只依赖
+各 Domain 的 SDK 契约层（DTO + Activity 名称常量），这些模块没有副作用、可以安全共享，
+所以把它们以及已知确定性的第三方依赖设为 passthrough，只在 worker 进程中导入一次。
+
+- SDK 包：自动扫描 app.domains.*.sdk
+- 第三方：KNOWN_DETERMINISTIC_MODULES（pydantic 依赖链）
+- 额外模块：WORKFLOW_SANDBOX_PASSTHROUGH
+"""
+
+import importlib
+import importlib.util
+import pkgutil
+from typing import List
+
+from temporalio.worker import WorkflowRunner
+from temporalio.worker.workflow_sandbox import SandboxedWorkflowRunner, SandboxRestrictions
+
+from app.infrastructure.workflows.config import config
+
+DOMAINS_PACKAGE = "app.domains"
+SDK_PACKAGE = "sdk"
+
+# 只做纯数据校验/类型定义、导入时无副作用的第三方模块
+# （pydantic 本身已在 SDK 默认 passthrough 列表中）
+KNOWN_DETERMINISTIC_MODULES = (
+    "pydantic_core",
+    "annotated_types",
+    "typing_extensions",
+    "typing_inspection",
+)
+
+
+def domain_sdk_modules() -> List[str]:
+    """所有 Domain 的 SDK 包（workflow 可以跨 domain，所以不限于 ENABLE_DOMAINS）"""
+    modules = []
+    domains = importlib.import_module(DOMAINS_PACKAGE)
+    for info in pkgutil.iter_modules(domains.__path__):
+        if not info.ispkg:
+            continue
+        name = f"{DOMAINS_PACKAGE}.{info.name}.{SDK_PACKAGE}"
+        if importlib.util.find_spec(name) is not None:
+            modules.append(name)
+    return sorted(modules)
+
+
+def sandbox_passthrough_modules() -> List[str]:
+    return [*domain_sdk_modules(), *KNOWN_DETERMINISTIC_MODULES, *config.workflow_sandbox_passthrough]
+
+
+def create_workflow_runner() -> WorkflowRunner:
+    """WORKFLOW_SANDBOX=tuned（默认）使用 passthrough 调优的 sandbox，=default 使用 SDK 默认 sandbox"""
+    if config.workflow_sandbox == "default":
+        return SandboxedWorkflowRunner()
+    if config.workflow_sandbox != "tuned":
+        raise ValueError(f"Unknown WORKFLOW_SANDBOX '{config.workflow_sandbox}' (expected 'tuned' or 'default')")
+
+    modules = sandbox_passthrough_modules()
+    print(f"Workflow sandbox passthrough: {modules}")
+    return SandboxedWorkflowRunner(
+        restrictions=SandboxRestrictions.default.with_passthrough_modules(*modules)
+    )
@@ -0,0 +1,226 @@
+"""
+Worker Supervisor - 多进程 Worker 模式
+
+单个 worker.py 进程中所有 Worker 共享一个事件循环，Python 侧的 workflow task 处理和
+CPU 密集的 activity 只能用满一个核。Supervisor 为每个 task_queue 启动 N 个子进程
+（每个子进程运行 worker.main(task_queues=[queue])），从而让一个容器用满多核机器。
+
+- 子进程使用 spawn 启动（Temporal Runtime 不支持 fork），配置通过环境变量继承
+- 子进程异常退出（非 0 退出码或被信号终止）时按指数退避重启，稳定运行一段时间后退避重置；
+  退出码为 0 表示子进程已正常结束（例如被单独发送 SIGTERM 后完成 drain），不再重启，
+  所有子进程都正常结束后 Supervisor 退出
+- 收到 SIGTERM/SIGINT 时转发给所有子进程，等待其优雅 drain 后退出
+- 可选的 GET /health 汇总所有子进程状态（全部存活返回 200，否则 503）
+- 可选托管本机共享的限流令牌桶服务（RATE_LIMIT_SERVE，见 app/infrastructure/resilience/rate_limit.py）
+
+启动：python -m app.infrastructure.workflows.supervisor
+"""
+
+import asyncio
+import json
+import multiprocessing
+import os
+import signal
+import time
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+from app.infrastructure.workflows.config import config
+
+RESTART_BACKOFF_INITIAL = 1.0
+RESTART_BACKOFF_MAX = 60.0
+# 子进程连续运行超过该时长后，认为已恢复稳定，退避时间重置
+STABLE_UPTIME_SECONDS = 60.0
+MONITOR_INTERVAL = 0.5
+
+
+def _child_main(task_queue: str, index: int) -> None:
+    """子进程入口：只为指定 task_queue 运行 worker"""
+    os.environ["WORKER_PROCESS_INDEX"] = str(index)
+    from app.infrastructure.workflows import worker
+    asyncio.run(worker.main(task_queues=[task_queue]))
+
+
+@dataclass
+class ChildProcess:
+    """一个 worker 子进程槽位（进程崩溃后在同一槽位重启）"""
+    task_queue: str
+    index: int
+    process: Optional[multiprocessing.Process] = None
+    started_at: float = 0.0
+    restarts: int = 0
+    backoff: float = RESTART_BACKOFF_INITIAL
+    next_start_at: float = 0.0
+    last_exitcode: Optional[int] = None
+    finished: bool = False
+
+    @property
+    def alive(self) -> bool:
+        return self.process is not None and self.process.is_alive()
+
+    def health(self) -> dict:
+        return {
+            "task_queue": self.task_queue,
+            "index": self.index,
+            "pid": self.process.pid if self.process else None,
+            "alive": self.alive,
+            "uptime_seconds": round(time.monotonic() - self.started_at, 1) if self.alive else 0.0,
+            "restarts": self.restarts,
+            "last_exitcode": self.last_exitcode,
+            "finished": self.finished,
+        }
+
+
+@dataclass
+class Supervisor:
+    task_queues: List[str]
+    children: List[ChildProcess] = field(default_factory=list)
+    stopping: bool = False
+
+    def __post_init__(self):
+        self._ctx = multiprocessing.get_context("spawn")
+        processes = config.worker_processes
+        index = 0
+        for task_queue in self.task_queues:
+            for _ in range(processes.get(task_queue, processes["*"])):
+                self.children.append(ChildProcess(task_queue=task_queue, index=index))
+                index += 1
+
+    def _start(self, child: ChildProcess) -> None:
+        child.process = self._ctx.Process(
+            target=_child_main,
+            args=(child.task_queue, child.index),
+            name=f"worker-{child.task_queue}-{child.index}",
+        )
+        child.process.start()
+        child.started_at = time.monotonic()
+        print(f"[Supervisor] Started worker #{child.index} for '{child.task_queue}' (pid {child.process.pid})")
+
+    def _check(self, child: ChildProcess) -> None:
+        """检测退出的子进程并按退避策略重启（正常退出的不重启）"""
+        now = time.monotonic()
+        if child.finished:
+            return
+        if child.alive:
+            if now - child.started_at > STABLE_UPTIME_SECONDS:
+                child.backoff = RESTART_BACKOFF_INITIAL
+            return
+
+        if child.process is not None:
+            child.last_exitcode = child.process.exitcode
+            child.process = None
+            if child.last_exitcode == 0:
+                child.finished = True
+                print(f"[Supervisor] Worker #{child.index} for '{child.task_queue}' exited cleanly, not restarting")
+                return
+            child.next_start_at = now + child.backoff
+            print(
+                f"[Supervisor] Worker #{child.index} for '{child.task_queue}' exited with code "
+                f"{child.last_exitcode}, restarting in {child.backoff:.1f}s"
+            )
+            child.backoff = min(child.backoff * 2, RESTART_BACKOFF_MAX)
+            return
+
+        if now >= child.next_start_at:
+            child.restarts += 1
+            self._start(child)
+
+    def health(self) -> dict:
+        children = [c.health() for c in self.children]
+        return {
+            "healthy": all(c["alive"] or c["finished"] for c in children),
+            "alive": sum(1 for c in children if c["alive"]),
+            "total": len(children),
+            "children": children,
+        }
+
+    async def _serve_health(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """极简 HTTP 处理：任意路径都返回汇总后的健康状态"""
+        try:
+            await reader.readuntil(b"\r\n\r\n")
+            health = self.health()
+            body = json.dumps(health).encode("utf-8")
+            status = "200 OK" if health["healthy"] else "503 Service Unavailable"
+            writer.write(
+                f"HTTP/1.1 {status}\r\nContent-Type: application/json\r\n"
+                f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode("ascii") + body
+            )
+            await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    def _forward_signal(self, sig: signal.Signals) -> None:
+        if self.stopping:
+            return
+        self.stopping = True
+        print(f"[Supervisor] Received {sig.name}, forwarding SIGTERM to {len(self.children)} worker(s)...")
+        for child in self.children:
+            if child.alive:
+                child.process.terminate()
+
+    async def _drain(self) -> None:
+        """等待子进程优雅退出，超过宽限期后强制结束"""
+        deadline = time.monotonic() + config.graceful_shutdown_seconds + 10
+        while any(c.alive for c in self.children) and time.monotonic() < deadline:
+            await asyncio.sleep(MONITOR_INTERVAL)
+        for child in self.children:
+            if child.alive:
+                print(f"[Supervisor] Worker #{child.index} did not drain in time, killing pid {child.process.pid}")
+                child.process.kill()
+                child.process.join()
+
+    async def run(self) -> None:
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            loop.add_signal_handler(sig, self._forward_signal, sig)
+
+        server = None
+        if config.supervisor_health_port:
+            server = await asyncio.start_server(self._serve_health, "0.0.0.0", config.supervisor_health_port)
+            print(f"[Supervisor] Health endpoint on :{config.supervisor_health_port}/health")
+
+        rate_limit_server = None
+        if config.rate_limit_serve:
+            # 本机所有 worker 子进程共享的令牌桶服务，子进程通过继承的环境变量连接
+            from app.infrastructure.resilience import RateLimitServer
+            rate_limit_server = RateLimitServer()
+            await rate_limit_server.start(config.rate_limit_serve)
+            os.environ.setdefault("RATE_LIMIT_BACKEND", "socket")
+            os.environ.setdefault("RATE_LIMIT_ADDRESS", config.rate_limit_serve)
+
+        for child in self.children:
+            self._start(child)
+
+        while not self.stopping and not all(c.finished for c in self.children):
+            for child in self.children:
+                self._check(child)
+            await asyncio.sleep(MONITOR_INTERVAL)
+
+        await self._drain()
+        if server is not None:
+            server.close()
+        if rate_limit_server is not None:
+            await rate_limit_server.stop()
+        print("[Supervisor] All workers stopped.")
+
+
+def main() -> None:
+    if not config.enabled_domains:
+        print("Warning: No domains enabled! Set ENABLE_DOMAINS env var.")
+        return
+
+    from app.infrastructure.workflows.worker import discover_task_queues
+    task_queues = discover_task_queues()
+    if not task_queues:
+        print("Error: No task queues found for the enabled domains.")
+        return
+
+    supervisor = Supervisor(task_queues)
+    print(f"[Supervisor] Running {len(supervisor.children)} worker process(es) for queues: {task_queues}")
+    asyncio.run(supervisor.run())
+
+
+if __name__ == "__main__":
+    main()
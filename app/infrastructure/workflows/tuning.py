@@ -0,0 +1,85 @@
+"""
+Worker Tuning - 按 task_queue 的 Worker 性能参数
+
+配置来源（JSON，二选一，WORKER_TUNING 优先）：
+- WORKER_TUNING: 内联 JSON
+- WORKER_TUNING_FILE: JSON 文件路径
+
+格式：
+    {
+      "default": {"max_concurrent_activities": 200},
+      "queues": {
+        "pizza-task-queue": {"max_concurrent_activities": 500, "max_cached_workflows": 2000}
+      }
+    }
+
+队列配置在 default 之上覆盖；未设置的字段使用 Temporal SDK 默认值。
+"""
+
+import json
+import os
+from datetime import timedelta
+from typing import Any, Dict, Optional
+
+from pydantic import BaseModel, ConfigDict, Field
+
+# 未设置 max_concurrent_activities 时 Temporal SDK 使用的 activity 槽位数
+SDK_DEFAULT_MAX_CONCURRENT_ACTIVITIES = 100
+
+
+class WorkerTuning(BaseModel):
+    """单个 task_queue 的 Worker 参数（None 表示使用 SDK 默认值）"""
+    model_config = ConfigDict(extra="forbid")
+
+    max_concurrent_activities: Optional[int] = Field(None, gt=0)
+    max_concurrent_workflow_tasks: Optional[int] = Field(None, gt=1)  # SDK 要求至少为 2
+    max_concurrent_local_activities: Optional[int] = Field(None, gt=0)
+    max_concurrent_workflow_task_polls: Optional[int] = Field(None, gt=1)
+    max_concurrent_activity_task_polls: Optional[int] = Field(None, gt=0)
+    nonsticky_to_sticky_poll_ratio: Optional[float] = Field(None, gt=0, le=1)
+    max_cached_workflows: Optional[int] = Field(None, ge=0)
+    sticky_queue_schedule_to_start_timeout_seconds: Optional[float] = Field(None, gt=0)
+    max_activities_per_second: Optional[float] = Field(None, gt=0)
+    max_task_queue_activities_per_second: Optional[float] = Field(None, gt=0)
+
+    def merged_with(self, override: "WorkerTuning") -> "WorkerTuning":
+        """返回在当前配置上叠加 override 中显式设置字段后的新配置"""
+        return self.model_copy(update=override.model_dump(exclude_unset=True))
+
+    def activity_slots(self) -> int:
+        """Worker 同时执行的 activity 上限（未设置时为 SDK 默认值）"""
+        return self.max_concurrent_activities or SDK_DEFAULT_MAX_CONCURRENT_ACTIVITIES
+
+    def to_worker_kwargs(self) -> Dict[str, Any]:
+        """转换为 temporalio.worker.Worker 的关键字参数（只包含已设置的字段）"""
+        kwargs = self.model_dump(exclude_none=True)
+        seconds = kwargs.pop("sticky_queue_schedule_to_start_timeout_seconds", None)
+        if seconds is not None:
+            kwargs["sticky_queue_schedule_to_start_timeout"] = timedelta(seconds=seconds)
+        return kwargs
+
+
+class TuningConfig(BaseModel):
+    """所有 task_queue 的 Worker 参数"""
+    model_config = ConfigDict(extra="forbid")
+
+    default: WorkerTuning = WorkerTuning()
+    queues: Dict[str, WorkerTuning] = {}
+
+    def for_queue(self, task_queue: str) -> WorkerTuning:
+        override = self.queues.get(task_queue)
+        return self.default.merged_with(override) if override else self.default
+
+
+def load_tuning_config() -> TuningConfig:
+    """从 WORKER_TUNING / WORKER_TUNING_FILE 加载并校验配置，未配置时返回空配置"""
+    raw = os.getenv("WORKER_TUNING")
+    if raw:
+        return TuningConfig.model_validate_json(raw)
+
+    path = os.getenv("WORKER_TUNING_FILE")
+    if path:
+        with open(path, encoding="utf-8") as f:
+            return TuningConfig.model_validate(json.load(f))
+
+    return TuningConfig()
@@ -0,0 +1,140 @@
+"""
+Model Type Registry - Payload 元数据中的模型标识 <-> Pydantic 类
+
+Converter 编码时在 payload metadata 中写入：
+- "pydantic-type": 模型的 SDK 类路径，例如 "app.domains.pizza.sdk.contracts.PizzaOrder"
+  （由模型组成的 list 写作 "list[<类路径>]"）
+- "pydantic-schema": 模型 JSON Schema 的短指纹
+
+解码时若没有 type hint（Query、Signal、未类型化的 handle），通过注册表直接定位到
+Pydantic 类，一次解析即得到类型化结果，而不是退化成 dict。
+注册表在启动时根据各 Domain 的 sdk/contracts.py 预先构建。
+"""
+
+import hashlib
+import importlib
+import inspect
+import json
+import logging
+import pkgutil
+from types import ModuleType
+from typing import Any, Dict, List, Optional, Tuple, Type
+
+from pydantic import BaseModel
+
+logger = logging.getLogger(__name__)
+
+METADATA_TYPE = "pydantic-type"
+METADATA_SCHEMA = "pydantic-schema"
+
+DOMAINS_PACKAGE = "app.domains"
+CONTRACTS_MODULE = "sdk.contracts"
+
+
+def model_path(model: Type[BaseModel]) -> str:
+    """模型的稳定标识：定义它的模块路径 + 类名"""
+    return f"{model.__module__}.{model.__qualname__}"
+
+
+def schema_fingerprint(model: Type[BaseModel]) -> str:
+    """模型 JSON Schema 的短指纹，schema 变化时随之变化"""
+    schema = json.dumps(model.model_json_schema(), sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(schema.encode("utf-8")).hexdigest()[:16]
+
+
+class ModelRegistry:
+    """模型标识 -> Pydantic 类 的注册表"""
+
+    def __init__(self):
+        self._models: Dict[str, Type[BaseModel]] = {}
+        self._fingerprints: Dict[str, str] = {}
+        # 编码侧缓存：模型标识 -> 预编码好的 metadata bytes
+        # 按类路径而不是类对象做键：sandbox 重新导入的同名类共用一项，缓存大小有界且不持有旧类
+        self._metadata: Dict[str, Tuple[bytes, bytes]] = {}
+        self._warned: set = set()
+
+    def register(self, model: Type[BaseModel]) -> None:
+        path = model_path(model)
+        self._models[path] = model
+        self._fingerprints[path] = schema_fingerprint(model)
+
+    def register_module(self, module: ModuleType) -> int:
+        """注册模块中定义的所有 BaseModel 子类，返回注册数量"""
+        count = 0
+        for _, obj in inspect.getmembers(module, inspect.isclass):
+            if issubclass(obj, BaseModel) and obj is not BaseModel and obj.__module__ == module.__name__:
+                self.register(obj)
+                count += 1
+        return count
+
+    def metadata_for(self, value: Any) -> Optional[Dict[str, bytes]]:
+        """为 BaseModel 实例（或同类模型组成的 list）生成 payload metadata"""
+        if isinstance(value, BaseModel):
+            model, container = type(value), False
+        elif isinstance(value, (list, tuple)) and value and all(type(v) is type(value[0]) for v in value):
+            model, container = type(value[0]), True
+        else:
+            return None
+
+        path = model_path(model)
+        cached = self._metadata.get(path)
+        if cached is None:
+            fingerprint = self._fingerprints.get(path) or schema_fingerprint(model)
+            cached = (path.encode("utf-8"), fingerprint.encode("utf-8"))
+            self._metadata[path] = cached
+
+        type_id, fingerprint = cached
+        if container:
+            type_id = b"list[" + type_id + b"]"
+        return {METADATA_TYPE: type_id, METADATA_SCHEMA: fingerprint}
+
+    def resolve(self, metadata: Any) -> Optional[Any]:
+        """根据 payload metadata 返回可用作 type hint 的类型，未知时返回 None"""
+        raw = metadata.get(METADATA_TYPE)
+        if not raw:
+            return None
+
+        type_id = raw.decode("utf-8")
+        container = type_id.startswith("list[") and type_id.endswith("]")
+        path = type_id[5:-1] if container else type_id
+
+        model = self._models.get(path)
+        if model is None:
+            return None
+
+        fingerprint = metadata.get(METADATA_SCHEMA, b"").decode("utf-8")
+        if fingerprint and fingerprint != self._fingerprints[path] and path not in self._warned:
+            # schema 已演进：仍按当前类校验（兼容的变更可以正常解码），但提示一次
+            self._warned.add(path)
+            logger.warning(f"Payload schema fingerprint for {path} differs from the registered model")
+
+        return List[model] if container else model
+
+
+def build_domain_registry() -> ModelRegistry:
+    """扫描 app.domains.*.sdk.contracts，注册所有 Domain 的 DTO"""
+    registry = ModelRegistry()
+    domains = importlib.import_module(DOMAINS_PACKAGE)
+    for info in pkgutil.iter_modules(domains.__path__):
+        if not info.ispkg:
+            continue
+        module_name = f"{DOMAINS_PACKAGE}.{info.name}.{CONTRACTS_MODULE}"
+        try:
+            module = importlib.import_module(module_name)
+        except ModuleNotFoundError as e:
+            if e.name and module_name.startswith(e.name):
+                continue  # 该 domain 没有 sdk/contracts.py
+            raise
+        registry.register_module(module)
+    return registry
+
+
+_default_registry: Optional[ModelRegistry] = None
+
+
+def get_default_registry() -> ModelRegistry:
+    """进程内共享的注册表（首次调用时构建）"""
+    global _default_registry
+    if _default_registry is None:
+        _default_registry = build_domain_registry()
+    return _default_registry
@@ -1,61 +1,60 @@
 import asyncio
 import importlib
-from typing import List
+import signal
+import sys
+import time
+from dataclasses import dataclass
+from datetime import timedelta
+from types import ModuleType
+from typing import Callable, Dict, List, Optional, Set
 from temporalio.client import Client
 from temporalio.worker import Worker
-from temporalio.converter import DataConverter
 
+from app.infrastructure.http import close_http_client
 from app.infrastructure.workflows.config import config
-from app.infrastructure.workflows.converter import PydanticDataConverter
+from app.infrastructure.workflows.control import ControlServer
+from app.infrastructure.workflows.converter import create_data_converter
+from app.infrastructure.workflows.executors import create_activity_executors
+from app.infrastructure.workflows.interceptors import ActivityMetricsInterceptor
+from app.infrastructure.workflows.loop_watchdog import LoopLagWatchdog
+from app.infrastructure.workflows.profiler import WorkerProfiler
+from app.infrastructure.workflows.runtime import get_runtime
+from app.infrastructure.workflows.sandbox import create_workflow_runner
 
-async def main():
-    print(f"Connecting to Temporal Server at {config.temporal_host}...")
-    
-    client = await Client.connect(
-        config.temporal_host,
-        data_converter=DataConverter(payload_converter_class=PydanticDataConverter),
-    )
-
-    enabled_domains = config.enabled_domains
-    workers = []
-
-    print(f"Starting Worker for Domains: {enabled_domains}")
 
-    if not enabled_domains:
-        print("Warning: No domains enabled! Set ENABLE_DOMAINS env var.")
-        return
+@dataclass
+class LoadedDomain:
+    """已导入的 domain 模块（尚未组装依赖）"""
+    path: str
+    module: ModuleType
+    task_queue: str
+    import_ms: float
 
-    # 导入workflow注册表
-    from app.workflows import get_workflows_by_queue
-    workflows_by_queue = get_workflows_by_queue()
-    
-    print(f"Loaded {len(workflows_by_queue)} workflow queues from registry")
 
-    # 步骤1: 从domains收集activities（按task_queue分组）
-    activities_by_queue = {}
+def load_domains(enabled_domains: List[str]) -> Dict[str, List[LoadedDomain]]:
+    """导入domains并读取注册信息（按task_queue分组），不触发依赖组装"""
+    domains_by_queue = {}
     
     for domain_path in enabled_domains:
         try:
             print(f"  - Loading Domain: '{domain_path}'...")
+            start = time.perf_counter()
             module = importlib.import_module(domain_path)
+            import_ms = (time.perf_counter() - start) * 1000
             
-            activities = getattr(module, 'activities', [])
             task_queue = getattr(module, 'TASK_QUEUE', None)
             
             if not task_queue:
                 print(f"    [ERROR] Domain '{domain_path}' missing TASK_QUEUE. Skipping.")
                 continue
             
-            if not activities:
-                print(f"    [WARN] Domain '{domain_path}' has no activities.")
-                continue
-            
-            # 按task_queue收集activities
-            if task_queue not in activities_by_queue:
-                activities_by_queue[task_queue] = []
-            activities_by_queue[task_queue].extend(activities)
+            if not getattr(module, 'ACTIVITY_MANIFEST', None) and not hasattr(module, 'create_activities'):
+                print(f"    [WARN] Domain '{domain_path}' declares no ACTIVITY_MANIFEST / create_activities.")
             
-            print(f"    [SUCCESS] Registered {len(activities)} activities to '{task_queue}'")
+            # 按task_queue收集domains
+            if task_queue not in domains_by_queue:
+                domains_by_queue[task_queue] = []
+            domains_by_queue[task_queue].append(LoadedDomain(domain_path, module, task_queue, import_ms))
             
         except ImportError as e:
             print(f"    [ERROR] Failed to import domain '{domain_path}': {e}")
@@ -66,39 +65,347 @@ async def main():
             import traceback
             traceback.print_exc()
 
-    # 步骤2: 合并workflows和activities，为每个task_queue创建worker
-    all_queues = set(workflows_by_queue.keys()) | set(activities_by_queue.keys())
+    return domains_by_queue
+
+
+def create_domain_activities(domain: LoadedDomain) -> list:
+    """调用 domain 的 create_activities() 工厂组装依赖；旧约定的 domain 退回读取 activities 列表"""
+    factory = getattr(domain.module, 'create_activities', None)
+    activities = factory() if factory else getattr(domain.module, 'activities', [])
+
+    manifest = getattr(domain.module, 'ACTIVITY_MANIFEST', None)
+    if manifest is not None and len(activities) != len(manifest):
+        print(f"    [WARN] Domain '{domain.path}' built {len(activities)} activities but manifest lists {len(manifest)}")
+    return activities
+
+
+def build_activities_by_queue(domains_by_queue: Dict[str, List[LoadedDomain]], task_queues: Set[str]) -> Dict[str, list]:
+    """只为需要运行的task_queue组装activities，并输出每个domain的冷启动耗时"""
+    activities_by_queue = {}
+    for task_queue, domains in domains_by_queue.items():
+        if task_queue not in task_queues:
+            continue
+        for domain in domains:
+            try:
+                start = time.perf_counter()
+                activities = create_domain_activities(domain)
+                build_ms = (time.perf_counter() - start) * 1000
+            except Exception as e:
+                print(f"    [ERROR] Failed to build domain '{domain.path}': {e}")
+                import traceback
+                traceback.print_exc()
+                continue
+
+            if not activities:
+                print(f"    [WARN] Domain '{domain.path}' has no activities.")
+                continue
+
+            activities_by_queue.setdefault(task_queue, []).extend(activities)
+            print(
+                f"    [SUCCESS] Registered {len(activities)} activities to '{task_queue}' "
+                f"(domain '{domain.path}': import {domain.import_ms:.1f}ms, build {build_ms:.1f}ms)"
+            )
+    return activities_by_queue
+
+
+def discover_task_queues() -> List[str]:
+    """返回当前配置下需要创建 worker 的所有 task_queue（supervisor 用来规划子进程，不组装依赖）"""
+    from app.workflows import get_workflows_by_queue
+    queues = set(get_workflows_by_queue().keys()) | set(load_domains(config.enabled_domains).keys())
+    return sorted(queues)
+
+
+def reload_domain(domain: LoadedDomain) -> LoadedDomain:
+    """重新导入 domain 包及其子模块；sdk 契约不重载，保持 workflow 与 converter 中的类型身份不变"""
+    prefix = domain.path + "."
+    sdk = prefix + "sdk"
+    start = time.perf_counter()
+    # 按模块深度逐个 reload 不等于依赖顺序（infrastructure 会绑定到旧的 usecases/services），
+    # 改为移除 domain 的全部模块（sdk 除外）后重新导入包，由 import 系统按依赖顺序加载
+    for name in [
+        name for name in sys.modules
+        if (name == domain.path or name.startswith(prefix)) and name != sdk and not name.startswith(sdk + ".")
+    ]:
+        del sys.modules[name]
+    importlib.invalidate_caches()
+    module = importlib.import_module(domain.path)
+    import_ms = (time.perf_counter() - start) * 1000
+    task_queue = getattr(module, 'TASK_QUEUE', None) or domain.task_queue
+    return LoadedDomain(domain.path, module, task_queue, import_ms)
+
+
+class WorkerPool:
+    """
+    进程内按 task_queue 管理 Worker。
+
+    单个队列可以启动、优雅 drain（Worker.shutdown 等待 graceful_shutdown_timeout）
+    或热重载（重新导入 domain、构建新 Worker 后先 drain 旧 Worker 再启动新 Worker），
+    其他队列的 Worker 持续运行，sticky cache 保持热状态。
+    """
+
+    def __init__(
+        self,
+        build_worker: Callable[[str, List[LoadedDomain]], Optional[Worker]],
+        workflows_by_queue: Dict[str, list],
+        domains_by_queue: Dict[str, List[LoadedDomain]],
+    ):
+        """
+        Args:
+            build_worker: 为 task_queue 与其 domains 构建 Worker（没有任何 workflow/activity 时返回 None）
+            workflows_by_queue: workflow 注册表（按 task_queue 分组）
+            domains_by_queue: 已导入的 domains（按 task_queue 分组）
+        """
+        self._build_worker = build_worker
+        self.workflows_by_queue = workflows_by_queue
+        self.domains_by_queue = domains_by_queue
+        self.workers: Dict[str, Worker] = {}
+        self._tasks: Dict[Worker, asyncio.Task] = {}
+        self._lock = asyncio.Lock()
+        self._stop = asyncio.Event()
+        self._failure: Optional[BaseException] = None
+
+    def status(self) -> dict:
+        queues = set(self.workflows_by_queue) | set(self.domains_by_queue) | set(self.workers)
+        return {
+            queue: {
+                "running": queue in self.workers,
+                "domains": [d.path for d in self.domains_by_queue.get(queue, [])],
+                "workflows": [w.__name__ for w in self.workflows_by_queue.get(queue, [])],
+            }
+            for queue in sorted(queues)
+        }
+
+    async def start_queue(self, task_queue: str) -> bool:
+        async with self._lock:
+            if task_queue in self.workers:
+                return True
+            return await self._replace(task_queue)
+
+    async def drain_queue(self, task_queue: str) -> None:
+        """优雅停止单个队列的 Worker，其他队列不受影响"""
+        async with self._lock:
+            worker = self.workers.pop(task_queue, None)
+            if worker is None:
+                raise KeyError(task_queue)
+            await self._drain(task_queue, worker)
+
+    async def reload_queue(self, task_queue: str) -> bool:
+        """重新导入该队列的 domains 并替换 Worker"""
+        async with self._lock:
+            domains = self.domains_by_queue.get(task_queue)
+            if not domains and task_queue not in self.workers:
+                raise KeyError(task_queue)
+            self.domains_by_queue[task_queue] = [reload_domain(d) for d in domains or []]
+            return await self._replace(task_queue)
+
+    async def add_domain(self, domain_path: str) -> str:
+        """导入新 domain 并启动/替换其 task_queue 的 Worker，返回 task_queue"""
+        async with self._lock:
+            for task_queue, domains in self.domains_by_queue.items():
+                if any(d.path == domain_path for d in domains):
+                    self.domains_by_queue[task_queue] = [
+                        reload_domain(d) if d.path == domain_path else d for d in domains
+                    ]
+                    await self._replace(task_queue)
+                    return task_queue
+
+            previously_imported = domain_path in sys.modules
+            loaded = load_domains([domain_path])
+            if not loaded:
+                raise ValueError(f"Domain '{domain_path}' could not be loaded")
+            (task_queue, domains), = loaded.items()
+            if previously_imported:
+                # 之前移除过的 domain 重新加入时使用最新代码
+                domains = [reload_domain(d) for d in domains]
+            self.domains_by_queue.setdefault(task_queue, []).extend(domains)
+            await self._replace(task_queue)
+            return task_queue
+
+    async def remove_domain(self, domain_path: str) -> str:
+        """移除 domain；队列中仍有其他 domain/workflow 时替换 Worker，否则 drain"""
+        async with self._lock:
+            for task_queue, domains in self.domains_by_queue.items():
+                if any(d.path == domain_path for d in domains):
+                    self.domains_by_queue[task_queue] = [d for d in domains if d.path != domain_path]
+                    await self._replace(task_queue)
+                    return task_queue
+            raise KeyError(domain_path)
+
+    async def _replace(self, task_queue: str) -> bool:
+        # 先构建新 Worker：构建失败时旧 Worker 继续运行
+        new = self._build_worker(task_queue, self.domains_by_queue.get(task_queue, []))
+        # 旧 Worker drain 完成后再启动新 Worker，同一队列不会同时有新旧两份代码在处理任务
+        old = self.workers.pop(task_queue, None)
+        if old is not None:
+            await self._drain(task_queue, old)
+        if new is not None:
+            self.workers[task_queue] = new
+            self._tasks[new] = asyncio.create_task(self._run_worker(task_queue, new))
+        return new is not None
+
+    async def _run_worker(self, task_queue: str, worker: Worker) -> None:
+        try:
+            await worker.run()
+        except Exception as e:
+            # 任一 worker 异常退出时关闭整个进程，让进程以错误退出（由 supervisor/容器重启）
+            print(f"  [ERROR] Worker for '{task_queue}' failed: {e}")
+            if self._failure is None:
+                self._failure = e
+            self._stop.set()
+
+    async def _drain(self, task_queue: str, worker: Worker) -> None:
+        print(f"  [DRAIN] '{task_queue}': waiting up to {config.graceful_shutdown_seconds}s for in-flight activities...")
+        start = time.perf_counter()
+        # 刚启动的 worker 可能还未进入 run()，以 run 任务是否结束为准
+        task = self._tasks.pop(worker, None)
+        if task is not None and not task.done():
+            await worker.shutdown()
+            await task
+        print(f"  [DRAIN] '{task_queue}' stopped after {time.perf_counter() - start:.1f}s")
+
+    async def run(self) -> None:
+        """运行直到收到 SIGTERM/SIGINT 或任一 worker 失败，然后优雅关闭所有 worker"""
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            try:
+                loop.add_signal_handler(sig, self._stop.set)
+            except (NotImplementedError, RuntimeError):
+                pass  # 非主线程或不支持的平台，依赖 KeyboardInterrupt
+
+        await self._stop.wait()
+        async with self._lock:
+            if self._failure is None:
+                print(f"Shutdown requested, draining {len(self.workers)} worker(s) (grace period {config.graceful_shutdown_seconds}s)...")
+            await asyncio.gather(*[w.shutdown() for w, t in self._tasks.items() if not t.done()], return_exceptions=True)
+            await asyncio.gather(*self._tasks.values(), return_exceptions=True)
+            self.workers.clear()
+            self._tasks.clear()
+
+        # 传播 worker 的异常
+        if self._failure is not None:
+            raise self._failure
+
+
+async def main(task_queues: Optional[List[str]] = None):
+    """
+    Args:
+        task_queues: 只为这些 task_queue 创建 worker（supervisor 子进程使用），None 表示全部
+    """
+    print(f"Connecting to Temporal Server at {config.temporal_host}...")
+    
+    # Runtime 需先于 converter 创建：converter instrumentation 通过默认 Runtime 上报指标
+    runtime = get_runtime()
+    client = await Client.connect(
+        config.temporal_host,
+        data_converter=create_data_converter(),
+        runtime=runtime,
+    )
+
+    enabled_domains = config.enabled_domains
+
+    print(f"Starting Worker for Domains: {enabled_domains}")
+
+    if not enabled_domains:
+        print("Warning: No domains enabled! Set ENABLE_DOMAINS env var.")
+        return
+
+    # 导入workflow注册表
+    from app.workflows import get_workflows_by_queue
+    workflows_by_queue = get_workflows_by_queue()
     
-    for task_queue in all_queues:
+    print(f"Loaded {len(workflows_by_queue)} workflow queues from registry")
+
+    tuning_config = config.worker_tuning
+    executors = create_activity_executors()
+    workflow_runner = create_workflow_runner()
+
+    # 步骤1: 导入domains（按task_queue分组），此时还不组装依赖
+    domains_by_queue = load_domains(enabled_domains)
+
+    all_queues = set(workflows_by_queue.keys()) | set(domains_by_queue.keys())
+    if task_queues is not None:
+        all_queues &= set(task_queues)
+
+    # activity 名称 -> domain 名称，用于 activity 指标的 domain 标签（热重载/新增 domain 时原地更新）
+    domain_by_activity: Dict[str, str] = {}
+    activity_metrics = ActivityMetricsInterceptor(runtime.metric_meter, domain_by_activity)
+    activities_by_queue: Dict[str, list] = {}
+
+    def build_worker(task_queue: str, domains: List[LoadedDomain]) -> Optional[Worker]:
+        # 步骤2: 只为本进程要运行的task_queue组装activities
+        activities = build_activities_by_queue({task_queue: domains}, {task_queue}).get(task_queue, [])
+        activities_by_queue[task_queue] = activities
+        for domain in domains:
+            for name in getattr(domain.module, 'ACTIVITY_MANIFEST', {}):
+                domain_by_activity[name] = domain.path.rsplit(".", 1)[-1]
+
+        # 步骤3: 合并workflows和activities，创建worker
         workflow_classes = workflows_by_queue.get(task_queue, [])
-        activities = activities_by_queue.get(task_queue, [])
-        
-        
         if not workflow_classes and not activities:
             print(f"  [SKIP] Queue '{task_queue}' has no workflows or activities")
-            continue
+            return None
         
         print(f"  [WORKER] Creating worker for '{task_queue}': {len(workflow_classes)} workflows, {len(activities)} activities")
+
+        tuning = tuning_config.for_queue(task_queue).to_worker_kwargs()
+        print(f"    [TUNING] '{task_queue}': {tuning or 'SDK defaults'}")
         
         # Worker会从Client继承data_converter配置
-        workers.append(
-            Worker(
-                client,
-                task_queue=task_queue,
-                workflows=workflow_classes,
-                activities=activities,
-            )
+        return Worker(
+            client,
+            task_queue=task_queue,
+            workflows=workflow_classes,
+            activities=activities,
+            activity_executor=executors.thread_pool,
+            workflow_runner=workflow_runner,
+            interceptors=[activity_metrics],
+            graceful_shutdown_timeout=timedelta(seconds=config.graceful_shutdown_seconds),
+            **tuning,
         )
 
+    pool = WorkerPool(build_worker, workflows_by_queue, domains_by_queue)
+    for task_queue in sorted(all_queues):
+        await pool.start_queue(task_queue)
 
-
-    if not workers:
+    if not pool.workers:
         print("Error: No workers were successfully registered.")
+        executors.shutdown()
         return
 
     # Run all registered workers concurrently
-    print(f"Worker process running with {len(workers)} active worker instances...")
-    await asyncio.gather(*[w.run() for w in workers])
+    print(f"Worker process running with {len(pool.workers)} active worker instances...")
+    watchdog = None
+    if config.loop_watchdog:
+        watchdog = LoopLagWatchdog(
+            runtime.metric_meter,
+            threshold_ms=config.loop_watchdog_threshold_ms,
+            log_interval_seconds=config.loop_watchdog_log_interval_seconds,
+        )
+        watchdog.start()
+    profiler = None
+    if config.profiler:
+        profiler = WorkerProfiler(
+            [fn for activities in activities_by_queue.values() for fn in activities],
+            output_dir=config.profiler_output_dir,
+            sample_interval_ms=config.profiler_sample_interval_ms,
+            default_cpu_seconds=config.profiler_cpu_seconds,
+        )
+        await profiler.start(config.profiler_port)
+    control = None
+    if config.worker_control_port:
+        control = ControlServer(pool)
+        await control.start(config.worker_control_port)
+    try:
+        await pool.run()
+    finally:
+        if control is not None:
+            await control.stop()
+        if profiler is not None:
+            await profiler.stop()
+        if watchdog is not None:
+            await watchdog.stop()
+        await close_http_client()
+        executors.shutdown()
 
 if __name__ == "__main__":
     try:
@@ -11,10 +11,12 @@ Workflow注册：
 """
 
 from app.workflows.pizza_workflow import PizzaOrderWorkflow
+from app.workflows.pizza_batch_workflow import PizzaBatchWorkflow
 
 # Workflow注册表：workflow_class → task_queue映射
 WORKFLOW_REGISTRY = {
     PizzaOrderWorkflow: "pizza-task-queue",
+    PizzaBatchWorkflow: "pizza-task-queue",       # 批量订单（子 workflow 扇出）
     # 未来示例:
     # ComplexOrderWorkflow: "pizza-task-queue",      # 复杂订单流程
     # CrossDomainWorkflow: "multi-domain-queue",     # 跨domain workflow
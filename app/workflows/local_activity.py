@@ -0,0 +1,50 @@
+"""
+Local Activity - 纯计算 activity 的本地执行模式
+
+普通 activity 需要经过 task queue 往返（schedule -> poll -> complete），并产生
+ActivityTaskScheduled/Started/Completed 三个 history 事件。像计算账单这样的纯内存计算，
+可以作为 local activity 在执行 workflow task 的同一 worker 中直接运行，只记录一个 marker。
+
+- SDK 契约以数据声明哪些 activity 足够便宜、无外部副作用（如 pizza 的 LOCAL_ACTIVITIES）
+- Workflow 通过 execute_activity() 调用并显式传入契约中的 activity 名称（如 ACTIVITY_CALCULATE_BILL），
+  声明为 local 的 activity 走 workflow.execute_local_activity
+
+开关是确定性的，不依赖 worker 的进程状态：
+- 选择 local 时先调用 workflow.patched()，切换前已开始的 workflow 在重放时
+  仍按原来的普通 activity 执行，不会产生 non-determinism 错误
+- 启动 workflow 时设置 memo {"local_activities": false} 可让该 workflow 全部按普通 activity 调度
+  （用于基准测试/排障）；memo 记录在 history 中，重放时取值相同
+"""
+
+from typing import Any, Callable, Collection
+
+from temporalio import workflow
+
+MEMO_LOCAL_ACTIVITIES = "local_activities"
+
+
+def local_activities_enabled() -> bool:
+    """当前 workflow 是否允许 local activity（memo 未设置时为 True）"""
+    return bool(workflow.memo_value(MEMO_LOCAL_ACTIVITIES, True, type_hint=bool))
+
+
+async def execute_activity(
+    activity_fn: Callable[..., Any],
+    name: str,
+    arg: Any,
+    local_activities: Collection[str],
+    **options: Any,
+) -> Any:
+    """
+    在 workflow 中执行 activity：契约声明为 local 的走 execute_local_activity，其余走 execute_activity。
+
+    Args:
+        activity_fn: SDK 契约中的接口方法（如 PizzaActivities.calculate_bill）
+        name: 该 activity 在契约中的名称（如 ACTIVITY_CALCULATE_BILL），与 local_activities 比较
+        arg: activity 参数
+        local_activities: 契约中声明为 local 的 activity 名称（如 pizza 的 LOCAL_ACTIVITIES）
+        options: 透传给 SDK 的调度参数（start_to_close_timeout、retry_policy 等）
+    """
+    if name in local_activities and local_activities_enabled() and workflow.patched(f"local-activity-{name}"):
+        return await workflow.execute_local_activity(activity_fn, arg, **options)
+    return await workflow.execute_activity(activity_fn, arg, **options)
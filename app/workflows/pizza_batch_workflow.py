@@ -0,0 +1,129 @@
+"""
+Pizza Batch Workflow - 批量订单扇出
+
+企业/批量渠道一次提交成千上万个订单：
+- 每个订单作为子 workflow（PizzaOrderWorkflow）执行，复用单个订单的流程
+- 同时进行中的子 workflow 数由 max_concurrency 限制（FIFO 信号量，重放时顺序确定）
+- 每个 run 只处理 orders_per_run 个订单，之后携带剩余订单、完成/失败计数与失败样本 continue-as-new，
+  保证单个 run 的 history 与 continue-as-new 的输入有界（Receipt 不汇总，留在各子 workflow 的结果中）
+- 子 workflow 执行失败或启动失败（如 ID 已被占用）都记为该订单失败，不会中断整个批量
+- 失败订单只保留前 max_failure_samples 个样本，失败总数单独计数
+- 子 workflow ID 为 "{批量 workflow id}-{订单序号}"，批量中重复的 order_id 不会冲突
+- progress query 返回总数、完成/失败/进行中数量和当前 run 序号
+"""
+
+import asyncio
+from typing import List, Optional
+
+from temporalio import workflow
+from temporalio.exceptions import ChildWorkflowError, WorkflowAlreadyStartedError
+
+# 只导入 SDK Contracts
+from app.domains.pizza.sdk import (
+    # DTOs
+    BatchOrderFailure,
+    PizzaBatch,
+    PizzaBatchProgress,
+    PizzaBatchResult,
+    PizzaOrder,
+)
+from app.workflows.local_activity import MEMO_LOCAL_ACTIVITIES, local_activities_enabled
+from app.workflows.pizza_workflow import PizzaOrderWorkflow
+
+
+@workflow.defn
+class PizzaBatchWorkflow:
+    """批量订单工作流
+
+    流程步骤:
+    1. 取出本 run 的订单（最多 orders_per_run 个）
+    2. 在并发窗口内扇出子 workflow，统计完成数并记录失败订单
+    3. 还有剩余订单时 continue-as-new，否则返回汇总结果
+    """
+
+    def __init__(self) -> None:
+        self._progress: Optional[PizzaBatchProgress] = None
+
+    @workflow.run
+    async def run(self, batch: PizzaBatch) -> PizzaBatchResult:
+        """运行批量订单流程"""
+        total = batch.total if batch.total is not None else len(batch.orders)
+        # 之前的 run 已处理的订单数，用于生成全局唯一的子 workflow ID
+        offset = total - len(batch.orders)
+        self._progress = PizzaBatchProgress(
+            batch_id=batch.batch_id,
+            total=total,
+            completed=batch.completed,
+            failed=batch.failed,
+            in_flight=0,
+            runs=batch.run_index + 1,
+        )
+
+        chunk = batch.orders[:batch.orders_per_run]
+        remaining = batch.orders[batch.orders_per_run:]
+        workflow.logger.info(
+            f"[BatchWorkflow] Run {batch.run_index + 1}: {len(chunk)} orders "
+            f"(window {batch.max_concurrency}, {len(remaining)} remaining)"
+        )
+
+        # 失败样本按完成顺序记录，总数达到上限后只计数
+        failures: List[BatchOrderFailure] = list(batch.failures)
+        window = asyncio.Semaphore(batch.max_concurrency)
+        parent_id = workflow.info().workflow_id
+        # 子 workflow 沿用批量 workflow 的 local activity 开关
+        memo = {MEMO_LOCAL_ACTIVITIES: local_activities_enabled()}
+
+        def record_failure(order: PizzaOrder, error: str) -> None:
+            if len(failures) < batch.max_failure_samples:
+                failures.append(BatchOrderFailure(order_id=order.order_id, error=error))
+            self._progress.failed += 1
+
+        async def process(index: int, order: PizzaOrder) -> None:
+            async with window:
+                self._progress.in_flight += 1
+                try:
+                    await workflow.execute_child_workflow(
+                        PizzaOrderWorkflow.run,
+                        order,
+                        id=f"{parent_id}-{offset + index}",
+                        memo=memo,
+                    )
+                    self._progress.completed += 1
+                except ChildWorkflowError as e:
+                    record_failure(order, str(e.cause or e))
+                except WorkflowAlreadyStartedError as e:
+                    # 子 workflow 没有启动（同 ID 的 workflow 已存在）
+                    record_failure(order, f"child workflow not started: {e}")
+                finally:
+                    self._progress.in_flight -= 1
+
+        await asyncio.gather(*(process(i, order) for i, order in enumerate(chunk)))
+
+        completed = self._progress.completed
+        failed = self._progress.failed
+
+        if remaining:
+            # 新 run 从空 history 开始，只携带剩余订单、完成/失败计数与失败样本
+            workflow.continue_as_new(
+                batch.model_copy(update={
+                    "orders": remaining,
+                    "total": total,
+                    "run_index": batch.run_index + 1,
+                    "completed": completed,
+                    "failed": failed,
+                    "failures": failures,
+                })
+            )
+
+        workflow.logger.info(
+            f"[BatchWorkflow] Batch {batch.batch_id} done: "
+            f"{completed} completed, {failed} failed"
+        )
+        return PizzaBatchResult(
+            batch_id=batch.batch_id, total=total, completed=completed, failed=failed, failures=failures
+        )
+
+    @workflow.query
+    def progress(self) -> Optional[PizzaBatchProgress]:
+        """批量订单进度"""
+        return self._progress
@@ -7,10 +7,17 @@ Pizza Order Workflow - 披萨订单流程编排
 from datetime import timedelta
 from temporalio import workflow
 
+# 按契约声明的 LOCAL_ACTIVITIES 选择 execute_local_activity / execute_activity
+from app.workflows.local_activity import execute_activity
+
 # 只导入 SDK Contracts
 from app.domains.pizza.sdk import (
     # Activity Interface
     PizzaActivities,
+    ACTIVITY_CALCULATE_BILL,
+    ACTIVITY_CHARGE_CREDIT_CARD,
+    ACTIVITY_PROCESS_DELIVERY,
+    LOCAL_ACTIVITIES,
     # DTOs
     PizzaOrder,
     Receipt,
@@ -32,19 +39,23 @@ class PizzaOrderWorkflow:
         """运行披萨订单流程"""
         workflow.logger.info(f"[Workflow] Starting order for {order.customer_name}")
         
-        # 步骤 1: 计算账单
+        # 步骤 1: 计算账单（契约声明为 local activity，不经过 task queue 往返）
         # 传入接口类的方法 (Unbound Method)，Temporal SDK 会提取元数据
-        bill = await workflow.execute_activity(
+        bill = await execute_activity(
             PizzaActivities.calculate_bill, 
+            ACTIVITY_CALCULATE_BILL,
             order,
+            LOCAL_ACTIVITIES,
             start_to_close_timeout=timedelta(seconds=5)
         )
         workflow.logger.info(f"[Workflow] Bill Total: ${bill.total_amount}")
         
         # 步骤 2: 处理支付
-        paid = await workflow.execute_activity(
+        paid = await execute_activity(
             PizzaActivities.charge_credit_card,
+            ACTIVITY_CHARGE_CREDIT_CARD,
             bill,
+            LOCAL_ACTIVITIES,
             start_to_close_timeout=timedelta(seconds=10)
         )
         if not paid:
@@ -53,9 +64,11 @@ class PizzaOrderWorkflow:
         workflow.logger.info("[Workflow] Payment successful")
         
         # 步骤 3: 安排配送
-        delivery_address = await workflow.execute_activity(
+        delivery_address = await execute_activity(
             PizzaActivities.process_delivery,
+            ACTIVITY_PROCESS_DELIVERY,
             order,
+            LOCAL_ACTIVITIES,
             start_to_close_timeout=timedelta(seconds=10)
         )
         workflow.logger.info(f"[Workflow] Delivery to: {delivery_address}")
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+批量订单吞吐基准测试：PizzaBatchWorkflow（子 workflow 扇出 + continue-as-new）
+
+在进程内启动 Worker（独立的临时 task queue），提交一个包含 N 个订单的批次，
+每秒通过 progress query 打印进度，结束后报告订单吞吐（orders/s）与 continue-as-new 次数。
+不同的 --concurrency / --orders-per-run 组合可用于选择并发窗口与分批大小。
+
+需要 Temporal Server（本地 dev server 即可：temporal server start-dev）：
+    python -m scripts.bench_batch --orders 2000 --concurrency 100
+"""
+
+import argparse
+import asyncio
+import time
+import uuid
+
+from temporalio.client import Client
+from temporalio.worker import Worker
+
+from app.domains.pizza import create_activities
+from app.domains.pizza.sdk import PizzaBatch
+from app.infrastructure.workflows.config import config
+from app.infrastructure.workflows.converter import create_data_converter
+from app.infrastructure.workflows.sandbox import create_workflow_runner
+from app.workflows import PizzaBatchWorkflow, PizzaOrderWorkflow
+from scripts.bench_codec import make_order
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--orders", type=int, default=1000, help="批次中的订单数")
+    parser.add_argument("--concurrency", type=int, default=50, help="max_concurrency：同时进行中的子 workflow 数")
+    parser.add_argument("--orders-per-run", type=int, default=500, help="每个 run 处理的订单数，之后 continue-as-new")
+    parser.add_argument("--items", type=int, default=3, help="每个订单的披萨条目数")
+    args = parser.parse_args()
+
+    print(f"Connecting to Temporal Server at {config.temporal_host}...")
+    client = await Client.connect(config.temporal_host, data_converter=create_data_converter())
+
+    task_queue = f"bench-batch-{uuid.uuid4().hex[:8]}"
+    template = make_order(args.items)
+    orders = [template.model_copy(update={"order_id": f"order-{i}"}) for i in range(args.orders)]
+    batch = PizzaBatch(
+        batch_id=task_queue,
+        orders=orders,
+        max_concurrency=args.concurrency,
+        orders_per_run=args.orders_per_run,
+    )
+
+    async with Worker(
+        client,
+        task_queue=task_queue,
+        workflows=[PizzaOrderWorkflow, PizzaBatchWorkflow],
+        activities=create_activities(),
+        workflow_runner=create_workflow_runner(),
+        max_concurrent_workflow_tasks=max(100, args.concurrency),
+    ):
+        start = time.perf_counter()
+        handle = await client.start_workflow(PizzaBatchWorkflow.run, batch, id=task_queue, task_queue=task_queue)
+        result_task = asyncio.create_task(handle.result())
+        while not result_task.done():
+            await asyncio.wait([result_task], timeout=1)
+            try:
+                progress = await handle.query(PizzaBatchWorkflow.progress)
+            except Exception:
+                continue  # continue-as-new 切换 run 的瞬间 query 可能失败
+            if progress is not None:
+                elapsed = time.perf_counter() - start
+                done = progress.completed + progress.failed
+                print(
+                    f"  [{elapsed:6.1f}s] run {progress.runs}: {done}/{progress.total} done, "
+                    f"{progress.in_flight} in flight, {done / elapsed:.1f} orders/s"
+                )
+        result = await result_task
+        elapsed = time.perf_counter() - start
+
+    progress = await handle.query(PizzaBatchWorkflow.progress)
+    print(f"\nBatch {result.batch_id}: {result.completed}/{result.total} completed, {result.failed} failed")
+    print(f"Elapsed {elapsed:.1f}s, throughput {args.orders / elapsed:.1f} orders/s, runs {progress.runs}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
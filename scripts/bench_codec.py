@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Payload 压缩基准测试
+
+对不同大小的 PizzaOrder 测量各压缩算法的 CPU 开销与节省的字节数：
+    python -m scripts.bench_codec
+    python -m scripts.bench_codec --sizes 1,100,5000 --rounds 200
+"""
+
+import argparse
+import asyncio
+import time
+
+from temporalio.converter import CompositePayloadConverter, DefaultPayloadConverter
+
+from app.infrastructure.workflows.codec import CompressionPayloadCodec, zstandard
+from app.infrastructure.workflows.converter import (
+    PydanticJSONPayloadConverter,
+    PydanticMsgpackPayloadConverter,
+    msgpack,
+)
+from app.domains.pizza.sdk.contracts import PizzaOrder, PizzaItem, Address
+
+FLAVORS = ["Cheese", "Veggie", "Pepperoni", "Hawaiian", "BBQ Chicken"]
+SIZES = ["S", "M", "L"]
+
+
+def make_order(item_count: int) -> PizzaOrder:
+    """构造包含 item_count 个条目的代表性订单"""
+    return PizzaOrder(
+        order_id=f"order-bench-{item_count}",
+        customer_name="Benchmark Customer",
+        items=[
+            PizzaItem(flavor=FLAVORS[i % len(FLAVORS)], size=SIZES[i % len(SIZES)], quantity=1 + i % 4)
+            for i in range(item_count)
+        ],
+        delivery_address=Address(street="456 Python Ave", city="PyCity", zip_code="10101"),
+        is_vip=item_count % 2 == 0,
+    )
+
+
+def payload_converters():
+    converters = {"json": PydanticJSONPayloadConverter()}
+    if msgpack is not None:
+        converters["msgpack"] = PydanticMsgpackPayloadConverter()
+    return {
+        name: CompositePayloadConverter(c, *DefaultPayloadConverter.default_encoding_payload_converters)
+        for name, c in converters.items()
+    }
+
+
+def codecs(threshold: int):
+    result = {"none": None, "zlib": CompressionPayloadCodec("zlib", threshold)}
+    if zstandard is not None:
+        result["zstd"] = CompressionPayloadCodec("zstd", threshold)
+    return result
+
+
+async def bench_one(converter, codec, order: PizzaOrder, rounds: int):
+    """返回 (原始字节数, 编码后字节数, 单次 encode 微秒, 单次 decode 微秒)"""
+    payloads = converter.to_payloads([order])
+    raw_size = payloads[0].ByteSize()
+    encoded = await codec.encode(payloads) if codec else payloads
+    wire_size = encoded[0].ByteSize()
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        p = converter.to_payloads([order])
+        if codec:
+            await codec.encode(p)
+    encode_us = (time.perf_counter() - start) / rounds * 1e6
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        p = await codec.decode(encoded) if codec else encoded
+        converter.from_payloads(p, [PizzaOrder])
+    decode_us = (time.perf_counter() - start) / rounds * 1e6
+
+    return raw_size, wire_size, encode_us, decode_us
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Benchmark payload compression for PizzaOrder payloads")
+    parser.add_argument("--sizes", default="1,10,100,1000,5000", help="Comma separated item counts")
+    parser.add_argument("--rounds", type=int, default=100, help="Iterations per measurement")
+    parser.add_argument("--threshold", type=int, default=0, help="Codec threshold in bytes (0 = always compress)")
+    args = parser.parse_args()
+
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+    header = f"{'items':>6} {'encoding':>8} {'codec':>5} {'raw B':>9} {'wire B':>9} {'saved':>7} {'enc us':>10} {'dec us':>10}"
+    print(header)
+    print("-" * len(header))
+
+    for item_count in sizes:
+        order = make_order(item_count)
+        rounds = max(1, args.rounds // max(1, item_count // 100))
+        for enc_name, converter in payload_converters().items():
+            for codec_name, codec in codecs(args.threshold).items():
+                raw, wire, enc_us, dec_us = await bench_one(converter, codec, order, rounds)
+                saved = 1 - wire / raw
+                print(f"{item_count:>6} {enc_name:>8} {codec_name:>5} {raw:>9} {wire:>9} {saved:>6.1%} {enc_us:>10.1f} {dec_us:>10.1f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
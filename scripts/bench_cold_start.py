@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Worker 冷启动基准测试
+
+在全新的解释器中（python -X importtime）执行 worker 启动时的 domain 加载流程：
+导入 worker 模块 -> load_domains() -> build_activities_by_queue()（不连接 Temporal），
+报告每个 domain 的导入/组装耗时和最慢的导入模块，并与冷启动预算比较。
+
+用法：
+    ENABLE_DOMAINS=app.domains.pizza python -m scripts.bench_cold_start
+    python -m scripts.bench_cold_start --domains app.domains.pizza --runs 5 --budget-ms 1500
+超出预算时退出码为 1。
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+
+CHILD_CODE = """
+import json, time, sys, io, contextlib
+t0 = time.perf_counter()
+from app.infrastructure.workflows import worker
+from app.infrastructure.workflows.config import config
+t1 = time.perf_counter()
+with contextlib.redirect_stdout(io.StringIO()) as out:
+    domains_by_queue = worker.load_domains(config.enabled_domains)
+    t2 = time.perf_counter()
+    activities = worker.build_activities_by_queue(domains_by_queue, set(domains_by_queue))
+t3 = time.perf_counter()
+print(json.dumps({
+    "worker_import_ms": (t1 - t0) * 1000,
+    "load_domains_ms": (t2 - t1) * 1000,
+    "build_ms": (t3 - t2) * 1000,
+    "total_ms": (t3 - t0) * 1000,
+    "domains": {d.path: d.import_ms for ds in domains_by_queue.values() for d in ds},
+    "activities": sum(len(a) for a in activities.values()),
+    "log": out.getvalue(),
+}))
+"""
+
+
+def parse_importtime(stderr: str):
+    """解析 -X importtime 输出，返回 [(模块名, 累计微秒)]（同名模块取最大值）"""
+    rows = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        # 格式："import time:  self_us | cumulative_us | [缩进]module"
+        _, cumulative_us, name = line.split("|")
+        name = name.strip()
+        rows[name] = max(rows.get(name, 0), int(cumulative_us))
+    return list(rows.items())
+
+
+def run_once(domains: str):
+    env = dict(os.environ, ENABLE_DOMAINS=domains, PYTHONDONTWRITEBYTECODE="0")
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", CHILD_CODE],
+        capture_output=True, text=True, env=env, check=False,
+    )
+    if proc.returncode != 0:
+        print(proc.stderr[-2000:])
+        raise SystemExit(f"Cold start run failed with exit code {proc.returncode}")
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+    result["imports"] = parse_importtime(proc.stderr)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark worker cold start per domain")
+    parser.add_argument("--domains", default=os.getenv("ENABLE_DOMAINS", "app.domains.pizza"))
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=float(os.getenv("COLD_START_BUDGET_MS", "1500")))
+    parser.add_argument("--top", type=int, default=10, help="Slowest imported modules to list per domain")
+    args = parser.parse_args()
+
+    # 第一次运行用于生成字节码缓存，不计入结果
+    run_once(args.domains)
+    runs = [run_once(args.domains) for _ in range(args.runs)]
+
+    def median(key):
+        return statistics.median(r[key] for r in runs)
+
+    print(f"Domains: {args.domains}  ({args.runs} runs, median)")
+    print(f"  worker module import : {median('worker_import_ms'):8.1f} ms")
+    print(f"  load_domains()       : {median('load_domains_ms'):8.1f} ms")
+    print(f"  build activities     : {median('build_ms'):8.1f} ms  ({runs[-1]['activities']} activities)")
+    total = median("total_ms")
+    print(f"  total                : {total:8.1f} ms  (budget {args.budget_ms:.0f} ms)")
+
+    print("\nPer-domain import (ms):")
+    per_domain = defaultdict(list)
+    for r in runs:
+        for path, ms in r["domains"].items():
+            per_domain[path].append(ms)
+    for path, values in per_domain.items():
+        print(f"  {path:<40} {statistics.median(values):8.1f}")
+        own = sorted(
+            ((name, us) for name, us in runs[-1]["imports"] if name.startswith(path)),
+            key=lambda row: row[1], reverse=True,
+        )[: args.top]
+        for name, us in own:
+            print(f"      {name:<50} {us / 1000:8.1f}")
+
+    print("\nSlowest imports overall (cumulative ms, last run):")
+    for name, us in sorted(runs[-1]["imports"], key=lambda row: row[1], reverse=True)[: args.top]:
+        print(f"  {name:<50} {us / 1000:8.1f}")
+
+    if total > args.budget_ms:
+        print(f"\n❌ Cold start {total:.1f} ms exceeds budget {args.budget_ms:.0f} ms")
+        sys.exit(1)
+    print(f"\n✅ Cold start within budget")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+PydanticDataConverter 基准测试与性能回归检查
+
+对 PizzaOrder / Bill / Receipt 在 small / typical / huge 三种规模下，遍历 converter 与 codec，
+完整执行 to_payloads -> codec.encode -> codec.decode -> from_payloads，报告：
+ops/sec、p50/p99 延迟、每个 payload 的字节数、每次往返的内存分配峰值。
+
+- converter：json、msgpack 单独的 Pydantic converter；production 为 PydanticDataConverter
+  （按 PAYLOAD_ENCODING，带类型注册表）；production+metrics 为 InstrumentedPydanticDataConverter
+  （CONVERTER_METRICS=true 时使用）
+- codec：none、zlib、zstd、claim-check（threshold=0，全部外置）；compress+claim-check 为 create_data_converter
+  默认配置下的链：压缩 (zlib, 1 KiB 阈值) + claim-check (128 KiB 阈值，本地目录)
+
+Baseline 与机器相关，不提交到仓库（.benchmarks/ 已在 .gitignore 中）。在同一台机器上先用
+修改前的代码生成 baseline，再检查修改后的代码：
+    git stash                                                 # 或 git worktree add 出修改前的版本
+    python -m scripts.bench_converter --save-baseline
+    git stash pop
+    python -m scripts.bench_converter --check --tolerance 15  # p50 变慢超过 15% 时退出码为 1
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Dict, List, Optional
+
+from temporalio.converter import CompositePayloadConverter, DefaultPayloadConverter, PayloadCodec, PayloadConverter
+
+from app.infrastructure.workflows.blob_store import LocalFileBlobStore
+from app.infrastructure.workflows.codec import (
+    ChainPayloadCodec,
+    ClaimCheckPayloadCodec,
+    CompressionPayloadCodec,
+    zstandard,
+)
+from app.infrastructure.workflows.converter import (
+    InstrumentedPydanticDataConverter,
+    PydanticDataConverter,
+    PydanticJSONPayloadConverter,
+    PydanticMsgpackPayloadConverter,
+    msgpack,
+)
+from app.domains.pizza.sdk.contracts import Bill, Receipt
+from scripts.bench_codec import make_order
+
+DEFAULT_BASELINE = ".benchmarks/converter_baseline.json"
+
+# 规模 -> (PizzaOrder 条目数, Bill/Receipt 文本字段长度)
+SIZES = {
+    "small": (1, 16),
+    "typical": (10, 128),
+    "huge": (5000, 64 * 1024),
+}
+
+
+def make_values(size: str) -> Dict[str, Any]:
+    item_count, text_len = SIZES[size]
+    text = ("Bon Appetit! " * (text_len // 13 + 1))[:text_len]
+    return {
+        "PizzaOrder": make_order(item_count),
+        "Bill": Bill(order_id=f"order-{text}", total_amount=123.45, currency="USD"),
+        "Receipt": Receipt(order_id="order-bench", status="COMPLETED", message=text, delivered_to=text),
+    }
+
+
+def make_converters() -> Dict[str, PayloadConverter]:
+    encodings = {"json": PydanticJSONPayloadConverter()}
+    if msgpack is not None:
+        encodings["msgpack"] = PydanticMsgpackPayloadConverter()
+    converters: Dict[str, PayloadConverter] = {
+        name: CompositePayloadConverter(c, *DefaultPayloadConverter.default_encoding_payload_converters)
+        for name, c in encodings.items()
+    }
+    # Worker/Client 实际使用的 converter（埋点指标记录到 Runtime.default() 的 meter）
+    converters["production"] = PydanticDataConverter()
+    converters["production+metrics"] = InstrumentedPydanticDataConverter()
+    return converters
+
+
+def make_codecs(blob_dir: str) -> Dict[str, Optional[PayloadCodec]]:
+    codecs: Dict[str, Optional[PayloadCodec]] = {"none": None, "zlib": CompressionPayloadCodec("zlib")}
+    if zstandard is not None:
+        codecs["zstd"] = CompressionPayloadCodec("zstd")
+    # threshold=0：所有 payload 都外置，衡量 BlobStore 写入 + LRU 命中的开销
+    codecs["claim-check"] = ClaimCheckPayloadCodec(LocalFileBlobStore(blob_dir), threshold=0)
+    # create_data_converter 在 CLAIM_CHECK_STORE=local 且其余为默认值时构建的链
+    codecs["compress+claim-check"] = ChainPayloadCodec(
+        CompressionPayloadCodec("zlib", threshold=1024),
+        ClaimCheckPayloadCodec(LocalFileBlobStore(blob_dir), threshold=128 * 1024),
+    )
+    return codecs
+
+
+async def round_trip(converter, codec, value, type_hint):
+    payloads = converter.to_payloads([value])
+    if codec:
+        payloads = await codec.encode(payloads)
+    wire_size = payloads[0].ByteSize()
+    if codec:
+        payloads = await codec.decode(payloads)
+    converter.from_payloads(payloads, [type_hint])
+    return wire_size
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+async def bench_case(converter, codec, value, min_time: float) -> Dict[str, float]:
+    type_hint = type(value)
+    # 预热（构建 TypeAdapter 缓存、写入 blob 等）
+    wire_size = await round_trip(converter, codec, value, type_hint)
+
+    latencies = []
+    deadline = time.perf_counter() + min_time
+    while time.perf_counter() < deadline or len(latencies) < 20:
+        start = time.perf_counter_ns()
+        await round_trip(converter, codec, value, type_hint)
+        latencies.append((time.perf_counter_ns() - start) / 1000)
+
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    await round_trip(converter, codec, value, type_hint)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    latencies.sort()
+    return {
+        "ops_per_sec": len(latencies) / (sum(latencies) / 1e6),
+        "p50_us": percentile(latencies, 50),
+        "p99_us": percentile(latencies, 99),
+        "bytes": wire_size,
+        "alloc_peak_kib": peak / 1024,
+    }
+
+
+async def run(min_time: float) -> Dict[str, Dict[str, float]]:
+    results = {}
+    with tempfile.TemporaryDirectory() as blob_dir:
+        converters = make_converters()
+        codecs = make_codecs(blob_dir)
+        for size in SIZES:
+            for model_name, value in make_values(size).items():
+                for enc_name, converter in converters.items():
+                    for codec_name, codec in codecs.items():
+                        case = f"{model_name}/{size}/{enc_name}/{codec_name}"
+                        results[case] = await bench_case(converter, codec, value, min_time)
+                        r = results[case]
+                        print(
+                            f"{case:<48} {r['ops_per_sec']:>10.0f} {r['p50_us']:>10.1f} {r['p99_us']:>10.1f} "
+                            f"{r['bytes']:>9} {r['alloc_peak_kib']:>10.1f}"
+                        )
+    return results
+
+
+def check_regressions(results, baseline, tolerance: float) -> List[str]:
+    """返回 p50 延迟相对 baseline 变慢超过 tolerance% 的用例"""
+    failures = []
+    for case, base in baseline.items():
+        current = results.get(case)
+        if current is None:
+            continue
+        slowdown = (current["p50_us"] / base["p50_us"] - 1) * 100
+        if slowdown > tolerance:
+            failures.append(f"{case}: p50 {base['p50_us']:.1f}us -> {current['p50_us']:.1f}us (+{slowdown:.1f}%)")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark PydanticDataConverter round-trips")
+    parser.add_argument("--min-time", type=float, default=0.2, help="Seconds to sample each case")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline JSON path")
+    parser.add_argument("--save-baseline", action="store_true", help="Write results as the new baseline")
+    parser.add_argument("--check", action="store_true", help="Fail if any case is slower than the baseline")
+    parser.add_argument("--tolerance", type=float, default=10.0, help="Allowed p50 slowdown in percent")
+    args = parser.parse_args()
+
+    print(f"{'case':<48} {'ops/sec':>10} {'p50 us':>10} {'p99 us':>10} {'bytes':>9} {'peak KiB':>10}")
+    results = asyncio.run(run(args.min_time))
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(args.baseline) or ".", exist_ok=True)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+        print(f"\n✅ Baseline saved to {args.baseline}")
+
+    if args.check:
+        if not os.path.exists(args.baseline):
+            print(f"\n❌ Baseline {args.baseline} not found, run with --save-baseline first")
+            sys.exit(1)
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        failures = check_regressions(results, baseline, args.tolerance)
+        if failures:
+            print(f"\n❌ {len(failures)} case(s) regressed by more than {args.tolerance}%:")
+            for failure in failures:
+                print(f"  - {failure}")
+            sys.exit(1)
+        print(f"\n✅ No case regressed by more than {args.tolerance}%")
+
+
+if __name__ == "__main__":
+    main()
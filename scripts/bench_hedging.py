@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Hedged request 基准测试：HedgingDeliveryService 对派单尾延迟的影响
+
+用一个长尾延迟的模拟派单服务（大部分请求 --fast-ms，--slow-rate 比例的请求 --slow-ms，
+彼此独立），以 --concurrency 个并发调用方各自顺序派单，对比不 hedge 与 hedge 两种方式的
+p50/p99/p99.9 以及实际发出的请求数（额外负载）。不需要 Temporal Server：
+    python -m scripts.bench_hedging --orders 5000 --slow-rate 0.03
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+
+from app.domains.pizza.infrastructure.delivery.hedging_delivery_service import HedgingDeliveryService
+from app.domains.pizza.services import IDeliveryService
+from app.domains.pizza.sdk.contracts import PizzaOrder
+from app.infrastructure.resilience import Hedger
+from scripts.bench_codec import make_order
+
+
+class LongTailDeliveryService(IDeliveryService):
+    """每次请求独立地以 slow_rate 的概率变慢"""
+
+    def __init__(self, fast_ms: float, slow_ms: float, slow_rate: float, seed: int = 42):
+        self.fast = fast_ms / 1000
+        self.slow = slow_ms / 1000
+        self.slow_rate = slow_rate
+        self.rng = random.Random(seed)
+        self.sent = 0
+
+    async def schedule_delivery(self, order: PizzaOrder) -> str:
+        self.sent += 1
+        slow = self.rng.random() < self.slow_rate
+        await asyncio.sleep((self.slow if slow else self.fast) * self.rng.uniform(0.8, 1.2))
+        return order.delivery_address.street
+
+    async def track_delivery(self, order_id: str) -> dict:
+        return {"order_id": order_id}
+
+
+def percentile(sorted_values: list, q: float) -> float:
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * q / 100))]
+
+
+async def run_case(service: IDeliveryService, orders: int, concurrency: int) -> list:
+    order = make_order(1)
+    latencies = []
+
+    async def caller(count: int) -> None:
+        for _ in range(count):
+            start = time.perf_counter()
+            await service.schedule_delivery(order)
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    await asyncio.gather(*(caller(orders // concurrency) for _ in range(concurrency)))
+    return sorted(latencies)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--orders", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--fast-ms", type=float, default=20.0)
+    parser.add_argument("--slow-ms", type=float, default=300.0)
+    parser.add_argument("--slow-rate", type=float, default=0.03)
+    parser.add_argument("--percentile", type=float, default=95.0, help="hedge 延迟取自身延迟的该分位")
+    parser.add_argument("--max-hedge-ratio", type=float, default=0.1)
+    args = parser.parse_args()
+
+    results = {}
+    baseline = LongTailDeliveryService(args.fast_ms, args.slow_ms, args.slow_rate)
+    results["no hedge"] = (await run_case(baseline, args.orders, args.concurrency), baseline.sent)
+
+    inner = LongTailDeliveryService(args.fast_ms, args.slow_ms, args.slow_rate)
+    hedger = Hedger("bench", percentile=args.percentile, max_hedge_ratio=args.max_hedge_ratio)
+    hedged = HedgingDeliveryService(inner, hedger)
+    results["hedged"] = (await run_case(hedged, args.orders, args.concurrency), inner.sent)
+
+    print(f"{args.orders} orders, {args.slow_rate:.1%} of requests take {args.slow_ms:.0f}ms (else {args.fast_ms:.0f}ms)")
+    print(f"\n{'case':<10} {'p50 ms':>8} {'p99 ms':>8} {'p99.9 ms':>9} {'mean ms':>8} {'requests':>9}")
+    for name, (latencies, sent) in results.items():
+        print(
+            f"{name:<10} {statistics.median(latencies):8.1f} {percentile(latencies, 99):8.1f} "
+            f"{percentile(latencies, 99.9):9.1f} {statistics.fmean(latencies):8.1f} {sent:9d}"
+        )
+    print(f"\nFinal hedge delay {hedger.delay_ms():.1f}ms, {hedger.hedges} hedges / {hedger.requests} requests")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
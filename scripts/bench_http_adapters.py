@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+HTTP 适配器压测：共享 keep-alive 连接池 vs 每次调用新建连接
+
+在进程内启动 scripts/stub_provider.py 的桩服务，以 --concurrency 个并发调用方
+通过 HttpPaymentGateway.charge 与 HttpDeliveryService.schedule_delivery 处理 N 个订单，
+报告吞吐、延迟 p50/p99 与桩服务实际建立的连接数。
+对照组每次调用使用新的 httpx.AsyncClient（即不复用连接）。
+
+不需要 Temporal Server：
+    python -m scripts.bench_http_adapters --orders 2000 --concurrency 50 --latency-ms 5
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from unittest import mock
+
+import httpx
+
+from app.domains.pizza.infrastructure.delivery.http_delivery_service import HttpDeliveryService
+from app.domains.pizza.infrastructure.payment.http_payment_gateway import HttpPaymentGateway
+from app.domains.pizza.sdk.contracts import Bill
+from app.infrastructure.http import close_http_client
+from scripts.bench_codec import make_order
+from scripts.stub_provider import StubProvider
+
+
+class _ClientPerCall:
+    """对照组：每个请求都用一个新的 AsyncClient 发送并关闭"""
+
+    async def post(self, url, **kwargs):
+        async with httpx.AsyncClient() as client:
+            return await client.post(url, **kwargs)
+
+
+async def run_case(name: str, base_url: str, provider: StubProvider, orders: int, concurrency: int) -> dict:
+    payment = HttpPaymentGateway(base_url, timeout_seconds=10)
+    delivery = HttpDeliveryService(base_url, timeout_seconds=10)
+    order = make_order(3)
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one(i: int) -> None:
+        async with semaphore:
+            current = order.model_copy(update={"order_id": f"{name}-{i}"})
+            start = time.perf_counter()
+            await payment.charge(Bill(order_id=current.order_id, total_amount=42.0))
+            await delivery.schedule_delivery(current)
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    connections_before = provider.connections
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(orders)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        "orders/s": orders / elapsed,
+        "p50": statistics.median(latencies),
+        "p99": latencies[max(0, int(len(latencies) * 0.99) - 1)],
+        "connections": provider.connections - connections_before,
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--orders", type=int, default=1000, help="订单数（每单一次扣款 + 一次派单）")
+    parser.add_argument("--concurrency", type=int, default=50, help="并发调用方数")
+    parser.add_argument("--latency-ms", type=float, default=2.0, help="桩服务每个请求的延迟")
+    args = parser.parse_args()
+
+    provider = StubProvider(latency_ms=args.latency_ms)
+    port = await provider.start(port=0)
+    base_url = f"http://127.0.0.1:{port}"
+    print(f"Stub provider on {base_url}, {args.orders} orders, concurrency {args.concurrency}")
+
+    results = {}
+    try:
+        results["pooled"] = await run_case("pooled", base_url, provider, args.orders, args.concurrency)
+        await close_http_client()
+        with mock.patch(f"{HttpPaymentGateway.__module__}.get_http_client", _ClientPerCall), mock.patch(
+            f"{HttpDeliveryService.__module__}.get_http_client", _ClientPerCall
+        ):
+            results["client-per-call"] = await run_case(
+                "per-call", base_url, provider, args.orders, args.concurrency
+            )
+    finally:
+        await close_http_client()
+        await provider.stop()
+
+    print(f"\n{'case':<16} {'orders/s':>10} {'p50 ms':>8} {'p99 ms':>8} {'connections':>12}")
+    for name, r in results.items():
+        print(f"{name:<16} {r['orders/s']:10.1f} {r['p50']:8.2f} {r['p99']:8.2f} {r['connections']:12d}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
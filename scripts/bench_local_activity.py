@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Local Activity 基准测试：PizzaOrderWorkflow 端到端延迟（local activity vs 普通 activity）
+
+calculate_bill 在契约的 LOCAL_ACTIVITIES 中声明为 local。本脚本在进程内启动 Worker，
+分别以 memo local_activities 开启/关闭两种模式顺序提交 N 个订单，报告端到端延迟
+p50/p95/mean 与每个 workflow 的 history 事件数。
+
+每种模式使用独立的临时 task queue，不影响正在运行的 worker。需要 Temporal Server：
+    python -m scripts.bench_local_activity --orders 200
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+
+from temporalio.client import Client
+from temporalio.worker import Worker
+
+from app.domains.pizza import create_activities
+from app.infrastructure.workflows.config import config
+from app.infrastructure.workflows.converter import create_data_converter
+from app.infrastructure.workflows.sandbox import create_workflow_runner
+from app.workflows.local_activity import MEMO_LOCAL_ACTIVITIES
+from app.workflows.pizza_workflow import PizzaOrderWorkflow
+from scripts.bench_codec import make_order
+
+
+async def run_mode(client: Client, local: bool, orders: int, items: int) -> dict:
+    memo = {MEMO_LOCAL_ACTIVITIES: local}
+    task_queue = f"bench-local-activity-{uuid.uuid4().hex[:8]}"
+    order = make_order(items)
+    latencies = []
+    last_id = None
+    async with Worker(
+        client,
+        task_queue=task_queue,
+        workflows=[PizzaOrderWorkflow],
+        activities=create_activities(),
+        workflow_runner=create_workflow_runner(),
+    ):
+        # 预热：sandbox 首次导入、连接建立
+        await client.execute_workflow(
+            PizzaOrderWorkflow.run, order, id=f"{task_queue}-warmup", task_queue=task_queue, memo=memo
+        )
+        for i in range(orders):
+            last_id = f"{task_queue}-{i}"
+            start = time.perf_counter()
+            await client.execute_workflow(
+                PizzaOrderWorkflow.run, order, id=last_id, task_queue=task_queue, memo=memo
+            )
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    history = await client.get_workflow_handle(last_id).fetch_history()
+    latencies.sort()
+    return {
+        "p50": statistics.median(latencies),
+        "p95": latencies[int(len(latencies) * 0.95) - 1],
+        "mean": statistics.fmean(latencies),
+        "events": len(history.events),
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--orders", type=int, default=100, help="每种模式提交的订单数")
+    parser.add_argument("--items", type=int, default=3, help="每个订单的披萨条目数")
+    args = parser.parse_args()
+
+    print(f"Connecting to Temporal Server at {config.temporal_host}...")
+    client = await Client.connect(config.temporal_host, data_converter=create_data_converter())
+
+    results = {}
+    for mode, local in (("remote", False), ("local", True)):
+        print(f"Running {args.orders} orders with calculate_bill as {mode} activity...")
+        results[mode] = await run_mode(client, local, args.orders, args.items)
+
+    print(f"\n{'mode':<8} {'p50 ms':>8} {'p95 ms':>8} {'mean ms':>8} {'events':>7}")
+    for mode, r in results.items():
+        print(f"{mode:<8} {r['p50']:8.2f} {r['p95']:8.2f} {r['mean']:8.2f} {r['events']:7d}")
+    speedup = results["remote"]["p50"] / results["local"]["p50"]
+    print(f"\nlocal activity p50 speedup: {speedup:.2f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+限流基准测试：多个进程共享一个全局 QPS 配额
+
+启动 --processes 个进程，每个进程以 --concurrency 个并发调用方在 --seconds 秒内尽可能多地
+通过 RateLimiter 发出"请求"，统计所有进程合计的实际速率：
+- local：每个进程各自一个桶，合计速率约为配额 × 进程数（即现状下的超额）
+- socket：进程内启动 RateLimitServer（unix socket），所有进程共享同一个桶，合计速率约为配额
+（两者都包含开始时的一次 burst，即额外的 rate / seconds）
+
+postgres 后端需要数据库：设置 RATE_LIMIT_DATABASE_URL 并加上 --backends postgres。不需要 Temporal Server：
+    python -m scripts.bench_rate_limit --rate 200 --processes 4
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import tempfile
+import time
+
+from app.infrastructure.resilience import RateLimiter, RateLimitServer
+from app.infrastructure.resilience.rate_limit import get_rate_limit_backend
+
+
+async def _hammer(rate: float, seconds: float, concurrency: int) -> int:
+    limiter = RateLimiter("bench", rate=rate, max_wait_seconds=seconds, backend=get_rate_limit_backend())
+    deadline = time.monotonic() + seconds
+    sent = 0
+
+    async def caller() -> None:
+        nonlocal sent
+        while time.monotonic() < deadline:
+            await limiter.acquire()
+            if time.monotonic() < deadline:
+                sent += 1
+
+    await asyncio.gather(*(caller() for _ in range(concurrency)))
+    return sent
+
+
+def _child(backend: str, address: str, rate: float, seconds: float, concurrency: int, results) -> None:
+    os.environ["RATE_LIMIT_BACKEND"] = backend
+    os.environ["RATE_LIMIT_ADDRESS"] = address
+    results.put(asyncio.run(_hammer(rate, seconds, concurrency)))
+
+
+def run_backend(backend: str, address: str, args) -> float:
+    ctx = multiprocessing.get_context("spawn")
+    results = ctx.Queue()
+    processes = [
+        ctx.Process(target=_child, args=(backend, address, args.rate, args.seconds, args.concurrency, results))
+        for _ in range(args.processes)
+    ]
+    for process in processes:
+        process.start()
+    total = sum(results.get() for _ in processes)
+    for process in processes:
+        process.join()
+    return total / args.seconds
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rate", type=float, default=200.0, help="全局配额（每秒请求数）")
+    parser.add_argument("--processes", type=int, default=4)
+    parser.add_argument("--concurrency", type=int, default=20, help="每个进程的并发调用方数")
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--backends", default="local,socket", help="逗号分隔：local,socket,postgres")
+    args = parser.parse_args()
+
+    address = os.path.join(tempfile.mkdtemp(), "rate-limit.sock")
+    server = RateLimitServer()
+    await server.start(address)
+    try:
+        print(f"Quota {args.rate:.0f}/s, {args.processes} processes x {args.concurrency} callers, {args.seconds:.0f}s")
+        print(f"\n{'backend':<10} {'achieved/s':>11} {'vs quota':>9}")
+        for backend in args.backends.split(","):
+            achieved = await asyncio.to_thread(run_backend, backend, address, args)
+            print(f"{backend:<10} {achieved:11.1f} {achieved / args.rate:8.2f}x")
+    finally:
+        await server.stop()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Activity 指标检查脚本
+
+按 Worker 的接线方式构建 ActivityMetricsInterceptor（先传入空的 domain 映射，之后原地填充），
+通过拦截器执行一次 pizza activity，再从 Runtime 的 Prometheus 端点抓取指标，验证：
+1. app_activity_executions / app_activity_duration 已记录
+2. domain 标签是 activity 所属的 domain，而不是 "unknown"
+
+不需要 Temporal Server：
+    python -m scripts.check_activity_metrics
+"""
+
+import asyncio
+import dataclasses
+import socket
+import sys
+import urllib.request
+from typing import Any, Dict
+
+from temporalio.runtime import PrometheusConfig, Runtime, TelemetryConfig
+from temporalio.testing import ActivityEnvironment
+from temporalio.worker import ActivityInboundInterceptor, ExecuteActivityInput
+
+from app.domains import pizza
+from app.domains.pizza.sdk import ACTIVITY_CALCULATE_BILL
+from app.infrastructure.workflows.interceptors import ActivityMetricsInterceptor
+from scripts.bench_codec import make_order
+
+
+class _Call(ActivityInboundInterceptor):
+    """拦截器链的末端：直接调用 activity 函数"""
+
+    def __init__(self):
+        pass
+
+    async def execute_activity(self, input: ExecuteActivityInput) -> Any:
+        return await input.fn(*input.args)
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def main() -> None:
+    address = f"127.0.0.1:{_free_port()}"
+    runtime = Runtime(telemetry=TelemetryConfig(metrics=PrometheusConfig(bind_address=address)))
+
+    # 与 worker.main 相同：interceptor 先拿到空映射，build_worker 时再原地填充
+    domain_by_activity: Dict[str, str] = {}
+    interceptor = ActivityMetricsInterceptor(runtime.metric_meter, domain_by_activity)
+    for name in pizza.ACTIVITY_MANIFEST:
+        domain_by_activity[name] = "pizza"
+
+    calculate_bill = next(
+        fn for fn in pizza.create_activities() if getattr(fn, "__name__", "") == "calculate_bill"
+    )
+    inbound = interceptor.intercept_activity(_Call())
+
+    async def run() -> Any:
+        return await inbound.execute_activity(
+            ExecuteActivityInput(fn=calculate_bill, args=[make_order(2)], executor=None, headers={})
+        )
+
+    env = ActivityEnvironment()
+    env.info = dataclasses.replace(env.info, activity_type=ACTIVITY_CALCULATE_BILL)
+    bill = asyncio.run(env.run(run))
+    print(f"Activity returned {bill!r}")
+
+    with urllib.request.urlopen(f"http://{address}/metrics", timeout=5) as response:
+        lines = [l for l in response.read().decode("utf-8").splitlines() if l.startswith("app_activity_")]
+
+    expected = f'activity_type="{ACTIVITY_CALCULATE_BILL}"'
+    executions = [l for l in lines if l.startswith("app_activity_executions") and expected in l]
+    errors = []
+    if not executions:
+        errors.append(f"❌ app_activity_executions{{{expected}}} was not recorded")
+    elif not all('domain="pizza"' in l for l in executions):
+        errors.append(f"❌ Wrong domain label: {executions}")
+    if not any(l.startswith("app_activity_duration") and 'domain="pizza"' in l for l in lines):
+        errors.append('❌ app_activity_duration{domain="pizza"} was not recorded')
+
+    for line in executions:
+        print(f"  {line}")
+    if errors:
+        print("\n".join(errors))
+        sys.exit(1)
+    print("✅ Activity metrics carry the domain label")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+本地桩服务：模拟外部支付与配送 HTTP API（集成测试与压测用）
+
+实现 HttpPaymentGateway / HttpDeliveryService 调用的全部端点，HTTP/1.1 keep-alive：
+
+  POST /v1/charges, /v1/charges/batch, /v1/refunds
+  POST /v1/deliveries, GET /v1/deliveries/<order_id>
+  GET  /stats      请求数、已建立的连接数（用于确认连接池复用）、按状态码统计
+
+可注入延迟、失败与拒付：--latency-ms/--jitter-ms 模拟网络与处理延迟，
+--error-rate 按比例返回 503（验证重试），--decline-rate 按比例拒付（402）。
+同一 Idempotency-Key 的重复请求返回首次的结果；批量扣款按每一项的 idempotency_key 去重
+（与单笔扣款的 Idempotency-Key 共用同一命名空间）。
+
+    python -m scripts.stub_provider --port 8099 --latency-ms 50
+    ENV=PROD PAYMENT_API_URL=http://127.0.0.1:8099 DELIVERY_API_URL=http://127.0.0.1:8099 python -m app.infrastructure.workflows.worker
+"""
+
+import argparse
+import asyncio
+import json
+import random
+from collections import Counter
+from typing import Dict, Optional, Tuple
+
+REASONS = {200: "OK", 201: "Created", 400: "Bad Request", 402: "Payment Required", 404: "Not Found", 503: "Service Unavailable"}
+
+
+class StubProvider:
+    """支付 + 配送桩服务"""
+
+    def __init__(
+        self,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        error_rate: float = 0.0,
+        decline_rate: float = 0.0,
+        seed: Optional[int] = None,
+    ):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.decline_rate = decline_rate
+        self.rng = random.Random(seed)
+        self.connections = 0
+        self.requests = 0
+        self.statuses: Counter = Counter()
+        self.deliveries: Dict[str, dict] = {}
+        self._idempotent: Dict[str, Tuple[int, dict]] = {}
+        self._server: Optional[asyncio.base_events.Server] = None
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8099) -> int:
+        """启动服务，返回实际监听的端口（port=0 时由系统分配）"""
+        self._server = await asyncio.start_server(self._serve, host, port)
+        return self._server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    def stats(self) -> dict:
+        return {"connections": self.connections, "requests": self.requests, "statuses": dict(self.statuses)}
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """一个连接上按顺序处理多个请求（keep-alive），直到客户端关闭"""
+        self.connections += 1
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                request_line, *header_lines = head.decode("latin-1").split("\r\n")
+                method, path, _ = request_line.split(" ", 2)
+                headers = {}
+                for line in header_lines:
+                    if ":" in line:
+                        name, value = line.split(":", 1)
+                        headers[name.strip().lower()] = value.strip()
+                raw = await reader.readexactly(int(headers.get("content-length", "0")))
+                body = json.loads(raw) if raw else {}
+
+                status, payload = await self._handle(method, path, body, headers.get("idempotency-key"))
+                self.requests += 1
+                self.statuses[status] += 1
+                data = json.dumps(payload).encode("utf-8")
+                writer.write(
+                    f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\nContent-Type: application/json\r\n"
+                    f"Content-Length: {len(data)}\r\n\r\n".encode("ascii") + data
+                )
+                await writer.drain()
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def _handle(self, method: str, path: str, body: dict, idempotency_key: Optional[str]) -> Tuple[int, dict]:
+        if self.latency_ms or self.jitter_ms:
+            await asyncio.sleep(max(0.0, self.latency_ms + self.rng.uniform(-self.jitter_ms, self.jitter_ms)) / 1000)
+        if method == "GET" and path == "/stats":
+            return 200, self.stats()
+        if idempotency_key and idempotency_key in self._idempotent:
+            return self._idempotent[idempotency_key]
+        if self.rng.random() < self.error_rate:
+            return 503, {"error": "injected failure"}
+
+        result = self._route(method, path, body)
+        if idempotency_key and result[0] < 500:
+            self._idempotent[idempotency_key] = result
+        return result
+
+    def _route(self, method: str, path: str, body: dict) -> Tuple[int, dict]:
+        if method == "POST" and path in ("/v1/charges", "/v1/refunds"):
+            if self.rng.random() < self.decline_rate:
+                return 402, {"order_id": body["order_id"], "status": "declined"}
+            return 200, {"order_id": body["order_id"], "status": "succeeded"}
+        if method == "POST" and path == "/v1/charges/batch":
+            return 200, {"results": [self._batch_charge(charge) for charge in body["charges"]]}
+        if method == "POST" and path == "/v1/deliveries":
+            address = body["address"]
+            delivery = {
+                "delivery_id": f"dlv-{body['order_id']}",
+                "order_id": body["order_id"],
+                "address": f"{address['street']}, {address['city']}, {address['zip_code']}",
+                "status": "SCHEDULED",
+                "eta": "30 minutes",
+            }
+            self.deliveries[body["order_id"]] = delivery
+            return 201, delivery
+        if method == "GET" and path.startswith("/v1/deliveries/"):
+            delivery = self.deliveries.get(path.rsplit("/", 1)[1])
+            if delivery is None:
+                return 404, {"error": "unknown delivery"}
+            return 200, {**delivery, "status": "IN_TRANSIT"}
+        return 404, {"error": f"no route for {method} {path}"}
+
+    def _batch_charge(self, charge: dict) -> dict:
+        """批量扣款中的一项：已处理过的 idempotency_key 返回首次的结果"""
+        key = charge.get("idempotency_key")
+        if key and key in self._idempotent:
+            return {"order_id": charge["order_id"], "status": self._idempotent[key][1]["status"]}
+        declined = self.rng.random() < self.decline_rate
+        result = {"order_id": charge["order_id"], "status": "declined" if declined else "succeeded"}
+        if key:
+            self._idempotent[key] = (402 if declined else 200, result)
+        return result
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8099)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="每个请求的固定延迟")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="延迟的随机抖动（±）")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="返回 503 的比例")
+    parser.add_argument("--decline-rate", type=float, default=0.0, help="扣款/退款被拒付的比例")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    provider = StubProvider(args.latency_ms, args.jitter_ms, args.error_rate, args.decline_rate, args.seed)
+    port = await provider.start(args.host, args.port)
+    print(f"[StubProvider] Listening on http://{args.host}:{port} (stats: /stats)")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await provider.stop()
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
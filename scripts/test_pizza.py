@@ -2,8 +2,7 @@ import asyncio
 import os
 import time
 from temporalio.client import Client
-from temporalio.converter import DataConverter
-from app.infrastructure.workflows.converter import PydanticDataConverter
+from app.infrastructure.workflows.converter import create_data_converter
 from app.domains.pizza import TASK_QUEUE
 # 从新的 workflows 目录导入 workflow
 from app.workflows.pizza_workflow import PizzaOrderWorkflow
@@ -14,10 +13,10 @@ async def main():
     temporal_host = os.getenv("TEMPORAL_HOST", "localhost:7233")
     print(f"Connecting to Temporal: {temporal_host}")
     
-    # Must use PydanticDataConverter
+    # Must use the same DataConverter as the worker
     client = await Client.connect(
         temporal_host,
-        data_converter=DataConverter(payload_converter_class=PydanticDataConverter),
+        data_converter=create_data_converter(),
     )
 
     # Construct the complex object